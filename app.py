@@ -14,6 +14,12 @@ from utils.resume_parser import ResumeParser
 from utils.ats_scorer import ATSScorer
 from utils.pdf_generator import PDFReportGenerator
 from utils.text_processor import TextProcessor
+from utils.job_library import JobLibrary, DEFAULT_JOB_LIBRARY_DIR
+from utils.result_cache import ResultCache
+from utils.incremental import AnalysisCache, IncrementalAnalyzer
+from utils.session_store import SessionResultStore
+from utils.result_writer import ResultWriter
+from utils.results_store import ResultsStore, DEFAULT_RESULTS_PATH
 import base64
 import os
 import time
@@ -532,12 +538,66 @@ st.markdown("""
 # ============================================================
 if 'analysis_complete' not in st.session_state:
     st.session_state.analysis_complete = False
-if 'results' not in st.session_state:
-    st.session_state.results = None
-if 'resume_filename' not in st.session_state:
-    st.session_state.resume_filename = None
-if 'jd_text' not in st.session_state:  # CHANGED: Use different name
-    st.session_state.jd_text = None
+# Results, JD and recommendations live in the shared session store; the session only keeps a handle
+if 'analysis_handle' not in st.session_state:
+    st.session_state.analysis_handle = None
+if 'incremental' not in st.session_state:
+    st.session_state.incremental = None
+
+# ============================================================
+# SHARED MODELS - loaded once per server process
+# ============================================================
+@st.cache_resource
+def load_models():
+    """Load the parser and scorer once for all sessions"""
+    # Identical analyses (refreshes, re-uploads, several recruiters) are served from the result cache
+    result_cache = ResultCache(disk_path=os.environ.get('ATS_RESULT_CACHE'))
+    return ResumeParser(), ATSScorer(result_cache=result_cache)
+
+@st.cache_resource
+def load_analysis_cache():
+    """Parse, embedding and component results reused by re-analyses, shared by all sessions"""
+    return AnalysisCache()
+
+@st.cache_resource
+def load_job_library():
+    """Load the precompiled job library, if one has been built"""
+    if not os.path.exists(os.path.join(DEFAULT_JOB_LIBRARY_DIR, 'jobs.json')):
+        return None
+    try:
+        return JobLibrary.load(load_models()[1], DEFAULT_JOB_LIBRARY_DIR)
+    except ValueError as e:
+        # Built with another semantic model or mode: its similarities would be meaningless here
+        st.error(f"⚠️ {e}")
+        return None
+
+@st.cache_resource
+def load_result_writer():
+    """Parquet export of every analysis for offline analytics, enabled by ATS_RESULT_EXPORT"""
+    export_dir = os.environ.get('ATS_RESULT_EXPORT')
+    if not export_dir:
+        return None
+    # A server runs for days: finalize files every ATS_RESULT_EXPORT_MINUTES or 10k rows and at each new day,
+    # so analysts see recent analyses and a crash loses little
+    minutes = float(os.environ.get('ATS_RESULT_EXPORT_MINUTES', '15'))
+    writer = ResultWriter(export_dir, max_file_rows=10000, max_file_seconds=minutes * 60)
+    return writer.start_background_roll(interval=60).close_at_exit()
+
+@st.cache_resource
+def load_results_store():
+    """Every analysis is recorded here (in the background) to drive the sidebar metrics"""
+    return ResultsStore(os.environ.get('ATS_RESULTS_DB', DEFAULT_RESULTS_PATH)).close_at_exit()
+
+@st.cache_resource
+def load_session_store():
+    """Analysis results of all sessions, capped at ATS_SESSION_STORE_MB"""
+    max_bytes = int(os.environ.get('ATS_SESSION_STORE_MB', '64')) * 1024 * 1024
+    return SessionResultStore(max_bytes=max_bytes, result_cache=load_models()[1].result_cache)
+
+@st.cache_data(ttl=60)
+def load_quick_stats():
+    """Sidebar metrics from the daily rollup, refreshed at most once a minute across all sessions"""
+    return load_results_store().summary(days=7)
 
 # ============================================================
 # CHART FUNCTIONS
@@ -698,11 +758,27 @@ def main():
         
         st.markdown('<p class="sidebar-header">⚡ Quick Stats</p>', unsafe_allow_html=True)
         
+        stats = load_quick_stats()
+        analyses_delta = None
+        if stats['previous_analyses']:
+            analyses_delta = f"{(stats['recent_analyses'] / stats['previous_analyses'] - 1) * 100:+.0f}%"
+        success_delta = None
+        if stats['recent_success_rate'] is not None and stats['previous_success_rate'] is not None:
+            success_delta = f"{stats['recent_success_rate'] - stats['previous_success_rate']:+.0f}%"
+        
         col1, col2 = st.columns(2)
         with col1:
-            st.metric("Analyses", "1,234+", "+12%")
+            st.metric("Analyses", f"{stats['analyses']:,}", analyses_delta,
+                      help="All analyses; change is the last 7 days against the 7 before")
         with col2:
-            st.metric("Success Rate", "89%", "+5%")
+            success_rate = stats['success_rate']
+            st.metric("Success Rate", f"{success_rate:.0f}%" if success_rate is not None else "–", success_delta,
+                      help="Share of analyses scoring 60% or more")
+        
+        store_stats = load_session_store().stats()
+        st.caption(f"🗃️ Session results: {store_stats['entries']} held, "
+                   f"{store_stats['bytes'] / 2**20:.1f} of {store_stats['max_bytes'] / 2**20:.0f} MB, "
+                   f"{store_stats['evictions']} evicted, {store_stats['rebuilds']} rebuilt")
     
     # ===== MAIN CONTENT =====
     st.markdown('<p class="section-header">📤 Upload Your Resume & Job Description</p>', unsafe_allow_html=True)
@@ -741,12 +817,27 @@ def main():
         </div>
         """, unsafe_allow_html=True)
         
-        # FIXED: Removed the key parameter to avoid session state conflict
-        job_description = st.text_area(
-            "Paste the complete job description",
-            height=280,
-            placeholder="Copy and paste the job description here...\n\nInclude:\n• Job requirements\n• Required skills\n• Qualifications\n• Responsibilities"
+        match_mode = st.radio(
+            "Compare against",
+            ["Pasted job description", "Job library"],
+            horizontal=True
         )
+        
+        job_library = None
+        job_description = ""
+        if match_mode == "Job library":
+            job_library = load_job_library()
+            if job_library:
+                st.info(f"📚 Your resume will be matched against **{len(job_library)}** stored job postings")
+            else:
+                st.warning("⚠️ No job library found. Build one with: `python -m utils.job_library <jobs_dir>`")
+        else:
+            # FIXED: Removed the key parameter to avoid session state conflict
+            job_description = st.text_area(
+                "Paste the complete job description",
+                height=280,
+                placeholder="Copy and paste the job description here...\n\nInclude:\n• Job requirements\n• Required skills\n• Qualifications\n• Responsibilities"
+            )
     
     # ===== ANALYZE BUTTON =====
     st.markdown("<br>", unsafe_allow_html=True)
@@ -761,7 +852,7 @@ def main():
     
     # ===== ANALYSIS LOGIC =====
     if analyze_button:
-        if uploaded_file and job_description:
+        if uploaded_file and (job_description or job_library):
             
             progress_placeholder = st.empty()
             status_placeholder = st.empty()
@@ -792,26 +883,55 @@ def main():
             status_placeholder.empty()
             
             try:
-                parser = ResumeParser()
-                scorer = ATSScorer()
+                parser, scorer = load_models()
                 text_processor = TextProcessor()
+                # Re-runs after small edits reuse the unchanged sections' parse output and embeddings
+                if st.session_state.incremental is None:
+                    st.session_state.incremental = IncrementalAnalyzer(parser, scorer, load_analysis_cache())
+                analyzer = st.session_state.incremental
                 
-                uploaded_file.seek(0)
-                resume_text = parser.extract_text(uploaded_file)
-                resume_data = parser.parse_resume(resume_text)
+                started = time.perf_counter()
+                resume_text = analyzer.extract_text(uploaded_file.getvalue(), uploaded_file.name)
+                extracted = time.perf_counter()
+                resume_data = analyzer.parse(resume_text)
+                parsed = time.perf_counter()
+                
+                # Job library: score every stored posting in one pass, then analyse the best fit in full
+                recommendations = None
+                if job_library:
+                    recommendations = job_library.recommend(resume_text, resume_data, top_k=10)
+                    job_description = job_library.get_job(recommendations[0]['id'])['text']
                 
                 cleaned_resume = text_processor.clean_text(resume_text)
                 cleaned_jd = text_processor.clean_text(job_description)
                 
-                results = scorer.calculate_ats_score(cleaned_resume, cleaned_jd, resume_data)
+                results = analyzer.score(cleaned_resume, cleaned_jd, resume_data)
+                
+                load_results_store().record(results, resume_text, job_description,
+                                            duration_ms=(time.perf_counter() - started) * 1000)
+                result_writer = load_result_writer()
+                if result_writer is not None:
+                    result_writer.write(results, resume_id=uploaded_file.name, job_description=job_description,
+                                        timings={'extract_ms': (extracted - started) * 1000,
+                                                 'parse_ms': (parsed - extracted) * 1000,
+                                                 'score_ms': (time.perf_counter() - parsed) * 1000})
                 
-                # FIXED: Store results properly
-                st.session_state.results = results
+                # Store results server-side; an evicted result is rebuilt from the result cache by its key
+                session_store = load_session_store()
+                session_store.discard(st.session_state.analysis_handle)
+                st.session_state.analysis_handle = session_store.put(
+                    {'results': results, 'resume_filename': uploaded_file.name,
+                     'jd_text': job_description, 'recommendations': recommendations},
+                    cache_key=scorer.result_key(cleaned_resume, cleaned_jd, resume_data))
                 st.session_state.analysis_complete = True
-                st.session_state.resume_filename = uploaded_file.name
-                st.session_state.jd_text = job_description  # FIXED: Use different variable name
                 
                 st.success("✅ Analysis completed successfully!")
+                report = analyzer.last_report
+                if report.get('cached'):
+                    st.caption("♻️ Same resume and job description as an earlier analysis: results reused")
+                elif report.get('reused'):
+                    st.caption(f"♻️ Re-analysis: changed sections {', '.join(report['changed_sections']) or 'none'}; "
+                               f"recomputed {', '.join(report['recomputed']) or 'nothing'}")
                 
             except Exception as e:
                 st.error(f"❌ An error occurred during analysis: {str(e)}")
@@ -820,11 +940,34 @@ def main():
             st.error("⚠️ Please upload a resume and provide a job description to continue")
     
     # ===== DISPLAY RESULTS =====
-    if st.session_state.analysis_complete and st.session_state.results:
-        results = st.session_state.results
+    analysis = None
+    if st.session_state.analysis_complete:
+        analysis = load_session_store().get(st.session_state.analysis_handle)
+        if analysis is None:
+            st.info("⌛ These results have expired. Please analyze your resume again.")
+            st.session_state.analysis_complete = False
+    
+    if analysis:
+        results = analysis['results']
+        recommendations = analysis.get('recommendations')
         
         st.markdown("---")
         
+        # ===== JOB RECOMMENDATIONS =====
+        if recommendations:
+            st.markdown('<p class="section-header">🎯 Best-Fitting Job Postings</p>', unsafe_allow_html=True)
+            
+            recommendations_df = pd.DataFrame([{
+                'Job': rec['title'],
+                'Overall': rec['overall_score'],
+                'Keywords': rec['keyword_match_score'],
+                'Semantic': rec['semantic_similarity'],
+                'Skills': rec['skills_score'],
+                'Missing Skills': ', '.join(rec['missing_skills'])
+            } for rec in recommendations])
+            st.dataframe(recommendations_df, use_container_width=True, hide_index=True)
+            st.caption(f"Detailed analysis below is for the best match: **{recommendations[0]['title']}**")
+        
         # ===== OVERALL SCORE SECTION =====
         st.markdown('<p class="section-header">📊 Analysis Results</p>', unsafe_allow_html=True)
         
@@ -1037,8 +1180,8 @@ def main():
                         pdf_gen = PDFReportGenerator()
                         pdf_buffer = pdf_gen.generate_report(
                             results,
-                            st.session_state.resume_filename,
-                            st.session_state.jd_text  # FIXED: Use correct variable
+                            analysis.get('resume_filename', 'resume'),
+                            analysis.get('jd_text', '')
                         )
                         
                         b64 = base64.b64encode(pdf_buffer.getvalue()).decode()
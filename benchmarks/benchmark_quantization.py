@@ -0,0 +1,83 @@
+import argparse
+import time
+from typing import Any, Dict, List
+
+import numpy as np
+from scipy.stats import spearmanr
+from sklearn.metrics.pairwise import cosine_similarity
+
+from benchmarks.corpus import load_reference_corpus, reference_pairs
+from utils.encoder import INFERENCE_MODES, load_sentence_encoder
+
+
+def pair_scores(model, pairs) -> List[float]:
+    """Semantic scores computed exactly as ATSScorer.calculate_semantic_similarity does"""
+    scores = []
+    for resume, jd in pairs:
+        similarity = cosine_similarity(model.encode([resume]), model.encode([jd]))[0][0]
+        scores.append(float(similarity) * 100)
+    return scores
+
+
+def benchmark_mode(mode: str, num_threads: int, texts: List[str], pairs, repeats: int) -> Dict[str, Any]:
+    """Measure pair latency, batch throughput and scores for one inference mode"""
+    model = load_sentence_encoder(mode, num_threads)
+    model.encode(texts[:2])  # warm-up
+
+    latencies = []
+    for _ in range(repeats):
+        for resume, jd in pairs:
+            start = time.perf_counter()
+            cosine_similarity(model.encode([resume]), model.encode([jd]))
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    for _ in range(repeats):
+        model.encode(texts, batch_size=32)
+    throughput = len(texts) * repeats / (time.perf_counter() - start)
+
+    return {
+        'mode': mode,
+        'p50_ms': float(np.percentile(latencies, 50)),
+        'p95_ms': float(np.percentile(latencies, 95)),
+        'texts_per_sec': throughput,
+        'scores': pair_scores(model, pairs),
+    }
+
+
+def score_drift(baseline: List[float], scores: List[float]) -> Dict[str, float]:
+    """Compare a mode's semantic scores with the float32 baseline"""
+    diff = np.abs(np.array(scores) - np.array(baseline))
+    return {
+        'mean_abs_drift': float(diff.mean()),
+        'max_abs_drift': float(diff.max()),
+        'spearman': float(spearmanr(baseline, scores).correlation),
+    }
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Benchmark encoder inference modes against float32")
+    arg_parser.add_argument('--threads', type=int, default=None, help="Intra-op thread count")
+    arg_parser.add_argument('--repeats', type=int, default=3)
+    args = arg_parser.parse_args()
+
+    resumes, job_descriptions = load_reference_corpus()
+    texts = resumes + job_descriptions
+    pairs = reference_pairs()
+
+    results = [benchmark_mode(mode, args.threads, texts, pairs, args.repeats) for mode in INFERENCE_MODES]
+    baseline = results[0]
+
+    print(f"{len(pairs)} resume/JD pairs, {len(texts)} texts, threads={args.threads or 'default'}")
+    print(f"{'mode':<8} {'p50 ms':>8} {'p95 ms':>8} {'texts/s':>9} {'speedup':>8} "
+          f"{'mean drift':>11} {'max drift':>10} {'spearman':>9}")
+    for result in results:
+        drift = score_drift(baseline['scores'], result['scores'])
+        speedup = baseline['p50_ms'] / result['p50_ms']
+        print(f"{result['mode']:<8} {result['p50_ms']:>8.1f} {result['p95_ms']:>8.1f} "
+              f"{result['texts_per_sec']:>9.1f} {speedup:>7.2f}x "
+              f"{drift['mean_abs_drift']:>11.3f} {drift['max_abs_drift']:>10.3f} {drift['spearman']:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+import argparse
+import os
+import tempfile
+import time
+from typing import Any, Dict, List
+
+import numpy as np
+from scipy.stats import spearmanr
+
+from benchmarks.corpus import load_reference_corpus
+from utils.ats_scorer import ATSScorer, SCORING_MODES
+from utils.lsa_model import LSAModel
+from utils.resume_parser import ResumeParser
+from utils.text_processor import TextProcessor
+
+
+def score_corpus(scorer: ATSScorer, resumes: List[Dict], job_descriptions: List[str]) -> Dict[str, Any]:
+    """Score every resume against every JD; the timed semantic score is the one the overall score uses"""
+    overall = np.zeros((len(job_descriptions), len(resumes)))
+    semantic = np.zeros_like(overall)
+    semantic_time = 0.0
+    start = time.perf_counter()
+    for j, jd in enumerate(job_descriptions):
+        for r, resume in enumerate(resumes):
+            t = time.perf_counter()
+            semantic[j, r] = scorer.calculate_semantic_similarity(resume['cleaned'], jd)
+            semantic_time += time.perf_counter() - t
+            result = scorer.calculate_ats_score(resume['cleaned'], jd, resume['data'], semantic_score=float(semantic[j, r]))
+            overall[j, r] = result['overall_score']
+    pairs = overall.size
+    return {
+        'overall': overall,
+        'semantic': semantic,
+        'ms_per_pair': (time.perf_counter() - start) / pairs * 1000,
+        'semantic_ms_per_pair': semantic_time / pairs * 1000,
+    }
+
+
+def compare(baseline: Dict[str, Any], result: Dict[str, Any]) -> Dict[str, float]:
+    """Accuracy of a mode relative to the full-mode scores"""
+    top1 = np.mean(baseline['overall'].argmax(axis=1) == result['overall'].argmax(axis=1))
+    return {
+        'overall_mae': float(np.abs(baseline['overall'] - result['overall']).mean()),
+        'semantic_mae': float(np.abs(baseline['semantic'] - result['semantic']).mean()),
+        'spearman': float(np.mean([spearmanr(b, r).correlation
+                                   for b, r in zip(baseline['overall'], result['overall'])])),
+        'top1_agreement': float(top1),
+    }
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Compare cost and accuracy of the scoring modes")
+    arg_parser.add_argument('--lsa-model', default=None,
+                            help="Fitted LSA model for 'fast' mode (default: fit on the reference corpus)")
+    args = arg_parser.parse_args()
+
+    resume_texts, job_descriptions = load_reference_corpus()
+    parser = ResumeParser()
+    processor = TextProcessor()
+    resumes = [{'cleaned': processor.clean_text(text), 'data': parser.parse_resume(text)} for text in resume_texts]
+    job_descriptions = [processor.clean_text(jd) for jd in job_descriptions]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        lsa_path = args.lsa_model
+        if lsa_path is None:
+            # Fit on the same cleaned text the scorer encodes, on both sides
+            lsa_path = os.path.join(tmp, 'lsa_model.joblib')
+            LSAModel().fit([resume['cleaned'] for resume in resumes] + job_descriptions).save(lsa_path)
+
+        results = {}
+        for mode in ('full', 'balanced', 'fast'):
+            scorer = ATSScorer(mode=mode, lsa_model_path=lsa_path)
+            results[mode] = score_corpus(scorer, resumes, job_descriptions)
+
+    baseline = results['full']
+    print(f"{len(resumes)} resumes x {len(job_descriptions)} job descriptions")
+    print(f"{'mode':<9} {'declared':>9} {'measured':>9} {'ms/pair':>8} {'overall MAE':>12} "
+          f"{'semantic MAE':>13} {'spearman':>9} {'top-1':>6}")
+    for mode, result in results.items():
+        accuracy = compare(baseline, result)
+        measured = result['semantic_ms_per_pair'] / baseline['semantic_ms_per_pair']
+        print(f"{mode:<9} {SCORING_MODES[mode]['relative_cost']:>9.2f} {measured:>9.2f} "
+              f"{result['ms_per_pair']:>8.1f} {accuracy['overall_mae']:>12.2f} {accuracy['semantic_mae']:>13.2f} "
+              f"{accuracy['spearman']:>9.3f} {accuracy['top1_agreement']:>6.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,18 @@
+import json
+import os
+from typing import List, Tuple
+
+CORPUS_PATH = os.path.join(os.path.dirname(__file__), 'reference_corpus.json')
+
+
+def load_reference_corpus(path: str = CORPUS_PATH) -> Tuple[List[str], List[str]]:
+    """Load the reference resumes and job descriptions used by the benchmarks"""
+    with open(path, encoding='utf-8') as f:
+        corpus = json.load(f)
+    return corpus['resumes'], corpus['job_descriptions']
+
+
+def reference_pairs(path: str = CORPUS_PATH) -> List[Tuple[str, str]]:
+    """Every (resume, job description) combination in the reference corpus"""
+    resumes, job_descriptions = load_reference_corpus(path)
+    return [(resume, jd) for jd in job_descriptions for resume in resumes]
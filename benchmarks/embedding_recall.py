@@ -0,0 +1,67 @@
+import argparse
+import time
+
+import numpy as np
+
+from benchmarks.corpus import load_reference_corpus
+from utils.ats_scorer import ATSScorer
+from utils.embedding_store import EmbeddingCodec, bytes_per_vector, compressed_similarity, recall_at_k
+from utils.lsa_model import load_corpus
+
+CONFIGURATIONS = [
+    ('float32', None),
+    ('float16', None),
+    ('int8', None),
+    ('float32', 128),
+    ('float16', 128),
+    ('int8', 128),
+    ('int8', 64),
+]
+
+
+def encode(scorer: ATSScorer, texts) -> np.ndarray:
+    """Unit-normalised float32 embeddings, as stored in the resume index"""
+    embeddings = np.asarray(scorer.semantic_model.encode(texts, batch_size=64), dtype=np.float32)
+    return embeddings / np.maximum(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Recall@k and storage of compressed embeddings vs float32")
+    arg_parser.add_argument('--corpus', nargs='*', default=None,
+                            help="Resume .txt files/dirs to index (default: reference corpus, one line per document)")
+    arg_parser.add_argument('--k', type=int, default=10)
+    args = arg_parser.parse_args()
+
+    resumes, job_descriptions = load_reference_corpus()
+    if args.corpus:
+        documents = load_corpus(args.corpus)
+    else:
+        # The reference corpus is small, so every non-trivial line stands in for a document
+        documents = [line for text in resumes + job_descriptions for line in text.splitlines() if len(line) > 20]
+
+    scorer = ATSScorer()
+    embeddings = encode(scorer, documents)
+    queries = encode(scorer, job_descriptions)
+    reference = queries @ embeddings.T
+
+    print(f"{len(documents)} documents, {len(queries)} queries, k={args.k}")
+    print(f"{'storage':<16} {'bytes/vec':>10} {'ratio':>6} {'recall@k':>9} {'mean |err|':>11} {'ms/query':>9}")
+    for dtype, pca_dim in CONFIGURATIONS:
+        if pca_dim and pca_dim >= min(embeddings.shape):
+            continue
+        codec = EmbeddingCodec(dtype, pca_dim).fit(embeddings)
+        stored = codec.compress(embeddings)
+        projected_queries = codec.project(queries)
+
+        start = time.perf_counter()
+        approximate = compressed_similarity(stored, projected_queries).T
+        elapsed = (time.perf_counter() - start) / len(queries) * 1000
+
+        size = bytes_per_vector(stored)
+        print(f"{codec.describe():<16} {size:>10.0f} {embeddings.nbytes / len(embeddings) / size:>5.1f}x "
+              f"{recall_at_k(reference, approximate, args.k):>9.3f} "
+              f"{np.abs(reference - approximate).mean() * 100:>11.3f} {elapsed:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
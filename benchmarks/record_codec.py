@@ -0,0 +1,81 @@
+import argparse
+import gc
+import json
+import pickle
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+from benchmarks.corpus import reference_pairs
+from utils.ats_scorer import ATSScorer
+from utils.records import ParsedResume, ScoreResult, dumps_many, loads_many
+from utils.resume_parser import ResumeParser
+
+
+def sample_records(count: int) -> List[Dict[str, Any]]:
+    """count distinct (parsed resume, result) dicts built from real reference corpus analyses"""
+    parser = ResumeParser()
+    scorer = ATSScorer()
+    base = []
+    for resume, jd in reference_pairs():
+        resume_data = parser.parse_resume(resume)
+        base.append({'parsed': resume_data, 'result': scorer.calculate_ats_score(resume, jd, resume_data)})
+    # A JSON round trip gives every record its own objects, as if loaded from a results file
+    samples = []
+    for i in range(count):
+        record = json.loads(json.dumps(base[i % len(base)], default=float))
+        record['parsed']['text'] += f'\n#{i}'
+        samples.append(record)
+    return samples
+
+
+def retained_bytes(build: Callable[[], Any]) -> int:
+    gc.collect()
+    tracemalloc.start()
+    value = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del value
+    return size
+
+
+def timed(fn: Callable[[], Any]) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def benchmark(name: str, dicts: List[Dict[str, Any]], record_type) -> None:
+    records = [record_type.from_dict(d) for d in dicts]
+    assert all(record.to_dict() == d for record, d in zip(records, dicts))
+    pickled = pickle.dumps(dicts, protocol=pickle.HIGHEST_PROTOCOL)
+    json_text = json.dumps(dicts, ensure_ascii=False)
+    binary = dumps_many(records)
+    assert loads_many(record_type, binary) == records
+
+    rows = [
+        ('dict + pickle', retained_bytes(lambda: pickle.loads(pickled)), len(pickled),
+         timed(lambda: pickle.dumps(dicts, protocol=pickle.HIGHEST_PROTOCOL)), timed(lambda: pickle.loads(pickled))),
+        ('dict + json', retained_bytes(lambda: json.loads(json_text)), len(json_text.encode('utf-8')),
+         timed(lambda: json.dumps(dicts, ensure_ascii=False)), timed(lambda: json.loads(json_text))),
+        (f'{record_type.__name__} + binary', retained_bytes(lambda: loads_many(record_type, binary)), len(binary),
+         timed(lambda: dumps_many(records)), timed(lambda: loads_many(record_type, binary))),
+    ]
+    print(f"\n{name}: {len(dicts)} records")
+    print(f"{'format':<26} {'memory MB':>10} {'size MB':>9} {'dump s':>8} {'load s':>8}")
+    for label, memory, size, dump_seconds, load_seconds in rows:
+        print(f"{label:<26} {memory / 2**20:>10.1f} {size / 2**20:>9.1f} {dump_seconds:>8.2f} {load_seconds:>8.2f}")
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Memory and serialization cost of result records vs dicts")
+    arg_parser.add_argument('--count', type=int, default=100000)
+    args = arg_parser.parse_args()
+
+    samples = sample_records(args.count)
+    benchmark('parse_resume output', [sample['parsed'] for sample in samples], ParsedResume)
+    benchmark('calculate_ats_score output', [sample['result'] for sample in samples], ScoreResult)
+
+
+if __name__ == "__main__":
+    main()
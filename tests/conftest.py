@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Tests import the app's modules as `utils.x`, the same way app.py and the CLIs do
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
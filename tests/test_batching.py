@@ -0,0 +1,66 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+import numpy as np
+import pytest
+
+from utils import batching
+from utils.batching import MicroBatcher
+
+
+def slow_encode(texts):
+    time.sleep(0.02)
+    return np.array([[len(text)] for text in texts], dtype=np.float32)
+
+
+def close_within(batcher, seconds=5.0):
+    closer = threading.Thread(target=batcher.close, daemon=True)
+    closer.start()
+    closer.join(seconds)
+    return not closer.is_alive()
+
+
+def test_concurrent_requests_share_batches():
+    batcher = MicroBatcher(slow_encode, max_batch_size=64, max_wait_ms=50)
+    futures = [batcher.submit(['a' * i, 'b']) for i in range(1, 9)]
+    assert [future.result(5)[:, 0].tolist() for future in futures] == [[i, 1] for i in range(1, 9)]
+    assert batcher.batches_run < len(futures)
+    assert close_within(batcher)
+
+
+def test_close_drains_a_full_bounded_queue():
+    batcher = MicroBatcher(slow_encode, max_batch_size=1, max_wait_ms=1, max_queue_size=2)
+    futures = [batcher.submit(['x' * i]) for i in range(1, 3)]
+    # No room for a sentinel: close must still stop the thread, after finishing the queued work
+    assert close_within(batcher)
+    assert [future.result(0)[0, 0] for future in futures] == [1, 2]
+
+
+class RacingQueue(queue.Queue):
+    """Bounded queue in which a blocked submitter takes the slot freed by close()'s wake-up at once"""
+
+    def __init__(self, maxsize=0):
+        super().__init__(maxsize)
+        self.late = Future()
+
+    def get(self, block=True, timeout=None):
+        item = super().get(block, timeout)
+        if item is None and not self.late.done() and not self.late.running():
+            self.put_nowait((['late request'], self.late))
+        return item
+
+
+def test_close_while_collecting_a_batch_from_a_full_bounded_queue(monkeypatch):
+    monkeypatch.setattr(batching.queue, 'Queue', RacingQueue)
+    batcher = MicroBatcher(slow_encode, max_batch_size=64, max_wait_ms=300, max_queue_size=1)
+    first = batcher.submit(['first'])
+    # The batcher thread is now waiting for more requests to join the first one
+    time.sleep(0.05)
+    assert close_within(batcher)
+    assert first.result(0)[0, 0] == 5
+    # The request that got in during shutdown was still encoded
+    assert batcher.requests.late.result(0)[0, 0] == len('late request')
+    with pytest.raises(RuntimeError):
+        batcher.submit(['too late'])
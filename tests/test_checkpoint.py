@@ -0,0 +1,57 @@
+from utils.checkpoint import BulkCheckpoint, run_key
+
+JOBS = {'backend.txt': 'Python developer with Django and PostgreSQL'}
+
+
+def documents(**contents):
+    return [(doc_id, doc_id, data) for doc_id, data in contents.items()]
+
+
+def scored(doc_id):
+    return [{'resume': doc_id, 'job': 'backend.txt', 'overall_score': 70.0}]
+
+
+def failed(doc_id):
+    return [{'resume': doc_id, 'error': 'No text could be extracted'}]
+
+
+def run(path, docs, outcome):
+    """One bulk run: record every pending document with outcome(doc_id); returns the ids processed"""
+    checkpoint = BulkCheckpoint(path, run_key(JOBS, 'scorer'))
+    processed = []
+    for doc_id, _, _ in checkpoint.pending(docs):
+        checkpoint.record(doc_id, outcome(doc_id))
+        processed.append(doc_id)
+    rows = list(checkpoint.iter_rows())
+    checkpoint.close()
+    return processed, rows
+
+
+def test_resume_skips_scored_documents_and_rescores_changed_ones(tmp_path):
+    path = str(tmp_path / 'run.checkpoint')
+    assert run(path, documents(a=b'one', b=b'two'), scored)[0] == ['a', 'b']
+
+    processed, rows = run(path, documents(a=b'one', b=b'two (edited)', c=b'three'), scored)
+    assert processed == ['b', 'c']
+    assert sorted(row['resume'] for row in rows) == ['a', 'b', 'c']
+
+
+def test_failed_documents_are_retried(tmp_path):
+    path = str(tmp_path / 'run.checkpoint')
+    processed, rows = run(path, documents(a=b'one', b=b'corrupt'),
+                          lambda doc_id: failed(doc_id) if doc_id == 'b' else scored(doc_id))
+    assert processed == ['a', 'b']
+    assert [row for row in rows if 'error' in row] == failed('b')
+
+    processed, rows = run(path, documents(a=b'one', b=b'corrupt'), scored)
+    assert processed == ['b']
+    assert not any('error' in row for row in rows)
+
+
+def test_other_run_key_starts_over(tmp_path):
+    path = str(tmp_path / 'run.checkpoint')
+    run(path, documents(a=b'one'), scored)
+    checkpoint = BulkCheckpoint(path, run_key(JOBS, 'another scorer'))
+    assert [doc_id for doc_id, _, _ in checkpoint.pending(documents(a=b'one'))] == ['a']
+    checkpoint.close()
+
@@ -0,0 +1,142 @@
+import zlib
+
+import numpy as np
+import pytest
+from scipy import sparse
+
+from utils.corpus_index import CorpusIndex
+from utils.embedding_store import EmbeddingCodec, compressed_similarity
+
+DIMENSIONS = 64
+
+
+def bag_of_words(texts):
+    """Hashed, L2-normalised word counts: deterministic stand-in for sentence embeddings"""
+    vectors = np.zeros((len(texts), DIMENSIONS), dtype=np.float32)
+    for row, text in enumerate(texts):
+        for word in text.split():
+            vectors[row, zlib.crc32(word.encode()) % DIMENSIONS] += 1
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+class FakeMatrixScorer:
+    """The three MatrixScorer calls CorpusIndex makes, scoring on embeddings only"""
+
+    def prepare_candidates(self, texts, skill_texts=None):
+        embeddings = bag_of_words(texts)
+        return {'embeddings': embeddings, 'keywords': sparse.csr_matrix(embeddings),
+                'skills': np.zeros((len(texts), 1), dtype=np.float32)}
+
+    prepare_jobs = prepare_candidates
+
+    def score_block(self, candidates, jobs):
+        similarity = compressed_similarity(candidates, jobs['embeddings']) * 100
+        return {'overall': similarity, 'semantic_similarity': similarity}
+
+
+@pytest.fixture
+def index_dir(tmp_path):
+    return str(tmp_path / 'index')
+
+
+def open_index(directory, **kwargs):
+    return CorpusIndex(FakeMatrixScorer(), directory=directory, **kwargs)
+
+
+def test_update_survives_reopen(index_dir):
+    index = open_index(index_dir)
+    index.upsert([{'id': 'a', 'text': 'python machine learning'},
+                  {'id': 'b', 'text': 'java spring backend'}])
+    index.upsert([{'id': 'a', 'text': 'rust systems programming'}])
+
+    reopened = open_index(index_dir)
+    assert len(reopened) == 2
+    assert reopened.stats()['deleted_rows'] == 1
+
+    results = reopened.search('python machine learning', top_k=10)
+    assert sorted(r['id'] for r in results) == ['a', 'b']
+    # The old version of 'a' would have scored 100 against its own text
+    assert next(r for r in results if r['id'] == 'a')['overall'] < 100
+    assert reopened.search('rust systems programming', top_k=1)[0] == {
+        'id': 'a', 'overall': 100.0, 'semantic_similarity': 100.0}
+
+
+def test_delete_survives_reopen(index_dir):
+    index = open_index(index_dir)
+    index.upsert([{'id': 'a', 'text': 'python'}, {'id': 'b', 'text': 'java'}])
+    index.delete(['a'])
+
+    reopened = open_index(index_dir)
+    assert [r['id'] for r in reopened.search('python', top_k=10)] == ['b']
+
+
+def test_compaction_drops_tombstones_and_reopens(index_dir):
+    index = open_index(index_dir, max_segments=2)
+    for i in range(4):
+        index.upsert([{'id': f'doc{i}', 'text': f'skill{i} common'}])
+    index.upsert([{'id': 'doc0', 'text': 'replaced text'}])
+    index.delete(['doc1'])
+    assert index.needs_compaction()
+
+    assert index.compact()
+    assert index.stats() == {'live_documents': 3, 'deleted_rows': 0, 'segments': 1,
+                             'rows_per_segment': [3]}
+
+    reopened = open_index(index_dir)
+    assert reopened.stats() == index.stats()
+    assert reopened.search('replaced text', top_k=1)[0]['id'] == 'doc0'
+    assert sorted(r['id'] for r in reopened.search('common', top_k=10)) == ['doc0', 'doc2', 'doc3']
+
+
+class Crash(Exception):
+    pass
+
+
+def crash(*args):
+    raise Crash
+
+
+def test_crash_before_the_manifest_keeps_the_old_version(index_dir):
+    index = open_index(index_dir)
+    index.upsert([{'id': 'a', 'text': 'old version'}])
+    # The new segment is on disk but the process dies before the manifest lists it
+    index._save_manifest = crash
+    with pytest.raises(Crash):
+        index.upsert([{'id': 'a', 'text': 'new version'}])
+
+    reopened = open_index(index_dir)
+    assert len(reopened) == 1
+    results = reopened.search('old version', top_k=10)
+    assert [result['id'] for result in results] == ['a'] and results[0]['overall'] == pytest.approx(100)
+
+
+def test_newest_segment_wins_when_tombstones_were_not_written(index_dir):
+    index = open_index(index_dir)
+    index.upsert([{'id': 'a', 'text': 'old version'}])
+    # The manifest lists the new segment but the process dies before the old row is tombstoned
+    index.segments[0].save_tombstones = crash
+    with pytest.raises(Crash):
+        index.upsert([{'id': 'a', 'text': 'new version'}])
+
+    reopened = open_index(index_dir)
+    assert len(reopened) == 1
+    results = reopened.search('old version', top_k=10)
+    assert len(results) == 1 and results[0]['overall'] < 100
+
+
+def test_reopening_with_another_codec_is_refused(index_dir):
+    codec = EmbeddingCodec('int8')
+    open_index(index_dir, codec=codec).upsert([{'id': 'a', 'text': 'python'}])
+
+    assert open_index(index_dir, codec=EmbeddingCodec('int8')).codec.dtype == 'int8'
+    assert open_index(index_dir).codec.dtype == 'int8'
+    with pytest.raises(ValueError, match="int8"):
+        open_index(index_dir, codec=EmbeddingCodec('float16'))
+
+
+def test_uncompressed_index_refuses_a_compressing_codec(index_dir):
+    open_index(index_dir).upsert([{'id': 'a', 'text': 'python'}])
+    open_index(index_dir, codec=EmbeddingCodec('float32'))
+    with pytest.raises(ValueError, match="float32"):
+        open_index(index_dir, codec=EmbeddingCodec('float16'))
@@ -0,0 +1,30 @@
+import numpy as np
+import pytest
+
+from utils.embedding_store import EmbeddingCodec, compressed_similarity
+
+
+@pytest.fixture
+def embeddings():
+    vectors = np.random.default_rng(0).normal(size=(1000, 32)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+@pytest.mark.parametrize('dtype', ['float32', 'float16', 'int8'])
+def test_chunked_similarity_matches_unchunked(embeddings, dtype):
+    stored = EmbeddingCodec(dtype).compress(embeddings)
+    queries = embeddings[:3]
+    whole = compressed_similarity(stored, queries, chunk_rows=len(embeddings))
+    chunked = compressed_similarity(stored, queries, chunk_rows=64)
+    np.testing.assert_allclose(chunked, whole, rtol=1e-6, atol=1e-6)
+    np.testing.assert_allclose(chunked, embeddings @ queries.T, atol=0.02)
+    np.testing.assert_allclose(compressed_similarity(stored, queries, 100, 300, chunk_rows=64), whole[100:300],
+                               rtol=1e-6, atol=1e-6)
+
+
+def test_same_as_compares_the_fitted_projection(embeddings):
+    codec = EmbeddingCodec('int8', pca_dim=8).fit(embeddings)
+    assert codec.same_as(EmbeddingCodec('int8', pca_dim=8).fit(embeddings))
+    assert not codec.same_as(EmbeddingCodec('int8', pca_dim=8).fit(embeddings[:500]))
+    assert not codec.same_as(EmbeddingCodec('float16', pca_dim=8).fit(embeddings))
+    assert not codec.same_as(None)
@@ -0,0 +1,43 @@
+import numpy as np
+
+from utils.incremental import AnalysisCache, IncrementalAnalyzer
+
+
+class FakeEncoder:
+    def __init__(self, value):
+        self.value = value
+        self.calls = 0
+
+    def encode(self, texts):
+        self.calls += 1
+        return np.full((len(texts), 4), self.value, dtype=np.float32)
+
+
+class FakeScorer:
+    """The two ATSScorer attributes the embedding cache reads"""
+
+    def __init__(self, fingerprint, value):
+        self._fingerprint = fingerprint
+        self.semantic_model = FakeEncoder(value)
+
+    def fingerprint(self):
+        return self._fingerprint
+
+
+def embed(analyzer, text):
+    analyzer.last_report = {'embedded': 0}
+    return analyzer._embed(text)[0]
+
+
+def test_shared_embedding_cache_is_keyed_by_scorer():
+    cache = AnalysisCache()
+    full = IncrementalAnalyzer(None, FakeScorer('full', 1.0), cache)
+    fast = IncrementalAnalyzer(None, FakeScorer('fast', 2.0), cache)
+    another_full = IncrementalAnalyzer(None, FakeScorer('full', 3.0), cache)
+
+    assert embed(full, 'python developer') == 1.0
+    # Another mode encodes the same text itself instead of reading the full-mode vector
+    assert embed(fast, 'python developer') == 2.0
+    # Same configuration in another session: the vector is reused
+    assert embed(another_full, 'python developer') == 1.0
+    assert another_full.scorer.semantic_model.calls == 0
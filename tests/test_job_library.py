@@ -0,0 +1,96 @@
+import zlib
+
+import numpy as np
+import pytest
+
+from utils.ats_scorer import SCORE_WEIGHTS
+from utils.job_library import JobLibrary
+
+JOBS = [
+    {'id': 'backend', 'title': 'Backend engineer', 'text': 'Python Django PostgreSQL REST APIs'},
+    {'id': 'data', 'title': 'Data scientist', 'text': 'Python pandas machine learning statistics'},
+    {'id': 'frontend', 'title': 'Frontend engineer', 'text': 'JavaScript React CSS HTML'},
+]
+RESUME = 'Python developer building Django REST APIs on PostgreSQL'
+RESUME_DATA = {'experience': [], 'education': [], 'skills': ['python', 'django']}
+
+
+class HashedEncoder:
+    """Hashed, L2-normalised word counts: deterministic stand-in for sentence embeddings"""
+
+    def __init__(self, dimensions=64):
+        self.dimensions = dimensions
+
+    def encode(self, texts, batch_size=None):
+        vectors = np.zeros((len(texts), self.dimensions), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for word in text.split():
+                vectors[row, zlib.crc32(word.encode()) % self.dimensions] += 1
+        return vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+
+
+class FakeScorer:
+    """The ATSScorer attributes JobLibrary reads, with JD-independent components fixed"""
+
+    def __init__(self, weights=None, inference_mode='float32', dimensions=64):
+        self.weights = dict(weights or SCORE_WEIGHTS)
+        self.stop_words = {'on', 'and'}
+        self.keyword_engine = None
+        self.semantic_model = HashedEncoder(dimensions)
+        self.semantic_config = {'backend': 'encoder', 'model': 'hashed', 'inference_mode': inference_mode,
+                                'num_threads': None}
+
+    def evaluate_experience(self, experience):
+        return 40.0
+
+    def evaluate_education(self, education):
+        return 60.0
+
+    def evaluate_format(self, resume_data):
+        return 80.0
+
+    def fingerprint(self):
+        return repr((sorted(self.weights.items()), self.embedding_fingerprint()))
+
+    def embedding_fingerprint(self):
+        return repr((self.semantic_config['model'], self.semantic_config['inference_mode'],
+                     self.semantic_model.dimensions))
+
+
+def overall(recommendation, weights):
+    return sum(recommendation[key] * weights[name] for name, key in (
+        ('keyword', 'keyword_match_score'), ('semantic', 'semantic_similarity'), ('skills', 'skills_score'),
+        ('experience', 'experience_score'), ('education', 'education_score'), ('format', 'format_score')))
+
+
+def test_recommendations_use_the_scorer_weights():
+    weights = {'keyword': 0.0, 'semantic': 0.0, 'skills': 0.0, 'experience': 1.0, 'education': 0.0, 'format': 0.0}
+    recommendations = JobLibrary(FakeScorer(weights), JOBS).recommend(RESUME, RESUME_DATA, top_k=3)
+    # Only experience counts, and it does not depend on the job
+    assert [r['overall_score'] for r in recommendations] == [40.0] * 3
+
+    default = JobLibrary(FakeScorer(), JOBS).recommend(RESUME, RESUME_DATA, top_k=3)
+    assert default[0]['id'] == 'backend'
+    for recommendation in default:
+        assert recommendation['overall_score'] == pytest.approx(overall(recommendation, SCORE_WEIGHTS), abs=0.02)
+
+
+def test_matrix_scorer_ranks_with_the_scorer_weights():
+    weights = dict(SCORE_WEIGHTS, keyword=0.0, semantic=0.0, skills=1.0)
+    library = JobLibrary(FakeScorer(weights), JOBS)
+    assert library.matrix_scorer.weights == {'keyword': 0.0, 'semantic': 0.0, 'skills': 1.0}
+
+
+def test_saved_library_loads_into_a_scorer_that_encodes_the_same(tmp_path):
+    JobLibrary(FakeScorer(), JOBS).save(str(tmp_path))
+    # Weights may differ: only the stored vectors have to match
+    library = JobLibrary.load(FakeScorer(dict(SCORE_WEIGHTS, format=0.0, keyword=0.35)), str(tmp_path))
+    assert [job['id'] for job in library.jobs] == [job['id'] for job in JOBS]
+    assert library.recommend(RESUME, RESUME_DATA, top_k=1)[0]['id'] == 'backend'
+
+
+@pytest.mark.parametrize('scorer', [FakeScorer(inference_mode='int8'), FakeScorer(dimensions=32)])
+def test_saved_library_refuses_another_semantic_model(tmp_path, scorer):
+    JobLibrary(FakeScorer(), JOBS).save(str(tmp_path))
+    with pytest.raises(ValueError, match='rebuild'):
+        JobLibrary.load(scorer, str(tmp_path))
@@ -0,0 +1,70 @@
+import time
+
+from utils.job_queue import JobQueue
+
+JOB = {'resume_text': 'Python developer', 'job_description': 'Python developer with Django'}
+
+
+def make_queue(tmp_path, **kwargs):
+    return JobQueue(str(tmp_path / 'jobs.db'), **kwargs)
+
+
+def test_expired_lease_is_handed_to_another_worker(tmp_path):
+    queue = make_queue(tmp_path, lease_seconds=0.05)
+    [job_id] = queue.enqueue([JOB])
+
+    [job] = queue.lease('worker-a')
+    assert (job['id'], job['attempt']) == (job_id, 1)
+    assert queue.lease('worker-b') == []
+
+    time.sleep(0.1)
+    [job] = queue.lease('worker-b')
+    assert (job['id'], job['attempt']) == (job_id, 2)
+
+    # The first worker's lease is gone, so its late ack must not overwrite the new owner's
+    assert not queue.ack(job_id, 'worker-a', {'overall_score': 1.0})
+    assert queue.ack(job_id, 'worker-b', {'overall_score': 2.0})
+    assert queue.get(job_id)['result'] == {'overall_score': 2.0}
+
+
+def test_lease_expiring_on_the_last_attempt_fails_the_job(tmp_path):
+    queue = make_queue(tmp_path, lease_seconds=0.05, max_attempts=2)
+    [job_id] = queue.enqueue([JOB])
+    for _ in range(2):
+        assert len(queue.lease('worker')) == 1
+        time.sleep(0.1)
+
+    assert queue.lease('worker') == []
+    job = queue.get(job_id)
+    assert (job['status'], job['attempts'], job['error']) == ('failed', 2, 'Lease expired')
+
+
+def test_failed_job_is_retried_after_backoff_until_max_attempts(tmp_path):
+    queue = make_queue(tmp_path, max_attempts=3, retry_delay=0.05)
+    [job_id] = queue.enqueue([JOB])
+
+    [job] = queue.lease('worker')
+    assert queue.fail(job_id, 'worker', 'ValueError: boom')
+    assert queue.get(job_id)['status'] == 'queued'
+    # Not available again until the backoff has passed
+    assert queue.lease('worker') == []
+    time.sleep(0.1)
+    assert queue.lease('worker')[0]['attempt'] == 2
+
+    assert queue.fail(job_id, 'worker', 'ValueError: boom')
+    # The second retry waits twice as long
+    time.sleep(0.06)
+    assert queue.lease('worker') == []
+    time.sleep(0.06)
+    assert queue.lease('worker')[0]['attempt'] == 3
+
+    assert queue.fail(job_id, 'worker', 'ValueError: boom')
+    job = queue.get(job_id)
+    assert (job['status'], job['attempts'], job['error']) == ('failed', 3, 'ValueError: boom')
+    assert queue.stats() == {'queued': 0, 'leased': 0, 'done': 0, 'failed': 1}
+
+
+def test_queue_survives_reopen(tmp_path):
+    ids = make_queue(tmp_path).enqueue([JOB, JOB])
+    queue = make_queue(tmp_path)
+    assert [job['id'] for job in queue.lease('worker', batch_size=5)] == ids
@@ -0,0 +1,56 @@
+import pytest
+
+from utils.records import ParsedResume, ScoreResult, dumps_many, loads_many
+
+PARSED = {
+    'text': 'José Müller\nSenior engineer — Python, Go\n',
+    'emails': ['jose@example.com'],
+    'phones': [],
+    'urls': ['https://github.com/jose'],
+    'skills': ['python', 'go', 'c++'],
+    'education': ['MSc Informatik, TU München'],
+    'experience': ['2018-2024 ACME GmbH'],
+    'entities': {'persons': ['José Müller'], 'organizations': ['ACME GmbH'], 'locations': [], 'dates': ['2018']},
+    'sections': {'experience': '2018-2024 ACME GmbH', 'education': '', 'skills': 'Python, Go 🐍'},
+}
+
+SCORE = {
+    'overall_score': 72.25, 'keyword_match_score': 64.0, 'semantic_similarity': 81.125, 'skills_score': 50.0,
+    'experience_score': 100.0, 'education_score': 0.0, 'format_score': 90.0,
+    'issues': ['Missing contact phone'], 'suggestions': [], 'missing_keywords': ['kubernetes', 'aws'],
+    'matched_skills': ['python'], 'sections_found': ['experience', 'skills'],
+}
+
+
+def test_parsed_resume_round_trips_through_bytes():
+    record = ParsedResume.from_dict(PARSED)
+    decoded = ParsedResume.from_bytes(record.to_bytes())
+    assert decoded == record
+    assert decoded.to_dict() == PARSED
+    # Section order is part of the parse output
+    assert list(decoded.to_dict()['sections']) == list(PARSED['sections'])
+
+
+def test_score_result_round_trips_through_bytes():
+    decoded = ScoreResult.from_bytes(ScoreResult.from_dict(SCORE).to_bytes())
+    assert decoded.to_dict() == SCORE
+
+
+def test_empty_strings_and_lists_round_trip():
+    empty = {**PARSED, 'text': '', 'skills': [], 'sections': {}}
+    assert ParsedResume.from_bytes(ParsedResume.from_dict(empty).to_bytes()).to_dict() == empty
+
+
+def test_many_records_round_trip():
+    records = [ScoreResult.from_dict({**SCORE, 'overall_score': float(i)}) for i in range(5)]
+    assert loads_many(ScoreResult, dumps_many(records)) == records
+    assert loads_many(ScoreResult, b'') == []
+
+
+def test_unexpected_keys_are_rejected():
+    with pytest.raises(ValueError):
+        ScoreResult.from_dict({**SCORE, 'extra': 1})
+    with pytest.raises(ValueError):
+        ParsedResume.from_dict({key: value for key, value in PARSED.items() if key != 'urls'})
+    with pytest.raises(ValueError):
+        ParsedResume.from_dict({**PARSED, 'entities': {'persons': []}})
@@ -0,0 +1,74 @@
+import time
+
+from utils.result_cache import ResultCache
+
+RESUME_DATA = {'skills': ['python', 'django'], 'experience': ['5 years']}
+RESULT = {'overall_score': 81.5, 'missing_keywords': ['kubernetes'], 'matched_skills': ['python']}
+
+
+def key(resume='python django developer', jd='python developer', resume_data=RESUME_DATA, fingerprint='v1'):
+    return ResultCache.key(resume, jd, resume_data, fingerprint)
+
+
+def test_key_changes_with_every_input():
+    base = key()
+    assert key() == base
+    assert key(resume='python flask developer') != base
+    assert key(jd='java developer') != base
+    assert key(resume_data={**RESUME_DATA, 'skills': ['python']}) != base
+    # A different scorer configuration must never reuse an old score
+    assert key(fingerprint='v2') != base
+
+
+def test_expired_entries_are_misses(tmp_path):
+    cache = ResultCache(ttl_seconds=0.05, disk_path=str(tmp_path / 'results.db'))
+    cache.put(key(), RESULT)
+    assert cache.get(key()) == RESULT
+    time.sleep(0.1)
+    assert cache.get(key()) is None
+    # Not served from the disk tier either
+    assert ResultCache(disk_path=str(tmp_path / 'results.db')).get(key()) is None
+
+
+def test_disk_tier_is_shared_across_instances(tmp_path):
+    ResultCache(disk_path=str(tmp_path / 'results.db')).put(key(), RESULT)
+    cache = ResultCache(disk_path=str(tmp_path / 'results.db'))
+    assert cache.get(key()) == RESULT
+    assert cache.get(key()) == RESULT
+    assert (cache.disk_hits, cache.hits) == (1, 1)
+
+
+def test_retain_version_drops_other_scorer_versions(tmp_path):
+    cache = ResultCache(disk_path=str(tmp_path / 'results.db'))
+    cache.put(key(fingerprint='v1'), RESULT, scorer_version='v1')
+    cache.put(key(fingerprint='v2'), RESULT, scorer_version='v2')
+    cache.retain_version('v2')
+
+    reopened = ResultCache(disk_path=str(tmp_path / 'results.db'))
+    assert reopened.get(key(fingerprint='v1')) is None
+    assert reopened.get(key(fingerprint='v2')) == RESULT
+
+
+def test_clear_empties_both_tiers(tmp_path):
+    cache = ResultCache(disk_path=str(tmp_path / 'results.db'))
+    cache.put(key(), RESULT)
+    cache.clear()
+    assert cache.get(key()) is None
+    assert ResultCache(disk_path=str(tmp_path / 'results.db')).get(key()) is None
+
+
+def test_callers_cannot_mutate_cached_results():
+    cache = ResultCache()
+    result = {**RESULT, 'missing_keywords': list(RESULT['missing_keywords'])}
+    cache.put(key(), result)
+    result['missing_keywords'].append('docker')
+    cache.get(key())['missing_keywords'].append('aws')
+    assert cache.get(key()) == RESULT
+
+
+def test_memory_tier_is_bounded():
+    cache = ResultCache(max_entries=2)
+    for fingerprint in ('a', 'b', 'c'):
+        cache.put(key(fingerprint=fingerprint), RESULT)
+    assert cache.get(key(fingerprint='a')) is None
+    assert cache.get(key(fingerprint='c')) == RESULT
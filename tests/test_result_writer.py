@@ -0,0 +1,62 @@
+import glob
+import json
+import os
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+pa = pytest.importorskip('pyarrow')
+import pyarrow.dataset  # noqa: E402
+
+from utils.result_writer import ResultWriter, export_jsonl  # noqa: E402
+
+RESULT = {'overall_score': 62.5, 'keyword_match_score': 50.0, 'semantic_similarity': 70.0, 'skills_score': 80.0,
+          'experience_score': 50.0, 'education_score': 90.0, 'format_score': 100.0,
+          'matched_skills': ['python'], 'missing_keywords': ['kafka'], 'sections_found': ['skills'],
+          'issues': [], 'suggestions': []}
+
+
+def finalized_rows(root):
+    return pa.dataset.dataset(root, partitioning='hive').count_rows() if glob.glob(f'{root}/*/*') else 0
+
+
+def test_file_is_finalized_after_max_file_rows(tmp_path):
+    root = str(tmp_path)
+    writer = ResultWriter(root, max_file_rows=5)
+    for _ in range(12):
+        writer.write(RESULT)
+    assert writer.files_finalized == 2
+    assert finalized_rows(root) == 10
+    writer.close()
+    assert finalized_rows(root) == 12
+
+
+def test_roll_finalizes_old_files_and_past_days(tmp_path):
+    root = str(tmp_path)
+    writer = ResultWriter(root, max_file_seconds=0.05)
+    writer.write(RESULT, analyzed_at=datetime.now(timezone.utc) - timedelta(days=1))
+    writer.roll()
+    assert finalized_rows(root) == 1
+
+    writer.write(RESULT)
+    writer.roll()
+    assert finalized_rows(root) == 1
+    time.sleep(0.1)
+    writer.roll()
+    assert finalized_rows(root) == 2
+    assert len(os.listdir(root)) == 2
+
+
+def test_bulk_export_keeps_jd_hash_and_timings(tmp_path):
+    rows = [{'resume': 'a.pdf', 'error': 'No text could be extracted'},
+            {'resume': 'b.pdf', 'job': 'backend', 'jd_hash': '0123456789abcdef', **RESULT,
+             'extract_ms': 1.5, 'parse_ms': 20.0, 'score_ms': 3.25}]
+    results = tmp_path / 'bulk.jsonl'
+    results.write_text(''.join(json.dumps(row) + '\n' for row in rows), encoding='utf-8')
+    root = str(tmp_path / 'export')
+    with ResultWriter(root) as writer:
+        assert export_jsonl(str(results), writer) == 1
+    row = pa.dataset.dataset(root, partitioning='hive').to_table().to_pylist()[0]
+    assert (row['resume_id'], row['job_id'], row['jd_hash']) == ('b.pdf', 'backend', '0123456789abcdef')
+    assert (row['extract_ms'], row['parse_ms'], row['score_ms']) == (1.5, 20.0, 3.25)
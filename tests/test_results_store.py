@@ -0,0 +1,74 @@
+import time
+
+import pytest
+
+from utils.result_writer import jd_hash
+from utils.results_store import ResultsStore
+
+DAY = 24 * 3600
+JD = 'Python developer with Django and PostgreSQL'
+
+
+def result(score):
+    return {'overall_score': score, 'keyword_match_score': 50.0, 'semantic_similarity': 70.0, 'skills_score': 40.0,
+            'experience_score': 100.0, 'education_score': 100.0, 'format_score': 90.0}
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ResultsStore(str(tmp_path / 'results.db'))
+    yield store
+    store.close()
+
+
+def test_daily_rollup_and_summary(store):
+    now = time.time()
+    # Two analyses today, one three days ago, and one in the previous week
+    for score, age in ((85.0, 0), (35.0, 0), (65.0, 3), (20.0, 10)):
+        store.record(result(score), 'resume', JD, analyzed_at=now - age * DAY)
+    store.flush()
+
+    days = dict((day, (analyses, successes)) for day, analyses, successes in store._connection().execute(
+        'SELECT day, analyses, successes FROM daily_stats'))
+    assert sorted(days.values()) == [(1, 0), (1, 1), (2, 1)]
+
+    summary = store.summary(days=7)
+    assert summary['analyses'] == 4
+    assert summary['success_rate'] == pytest.approx(50.0)
+    assert summary['average_score'] == pytest.approx(51.25)
+    assert (summary['recent_analyses'], summary['previous_analyses']) == (3, 1)
+    assert summary['recent_success_rate'] == pytest.approx(200 / 3)
+    assert summary['previous_success_rate'] == 0.0
+
+
+def test_empty_summary(store):
+    summary = store.summary()
+    assert summary['analyses'] == 0
+    assert summary['success_rate'] is None and summary['average_score'] is None
+
+
+def test_band_counts_and_job_lookup(store):
+    now = time.time()
+    for score in (10.0, 45.0, 59.9, 60.0, 80.0, 99.0):
+        store.record(result(score), 'resume', JD, analyzed_at=now)
+    store.record(result(90.0), 'resume', 'Java developer', analyzed_at=now - DAY)
+    store.flush()
+
+    assert store.band_counts() == {0: 1, 1: 2, 2: 1, 3: 3}
+    assert store.band_counts(jd_hash=jd_hash(JD)) == {0: 1, 1: 2, 2: 1, 3: 2}
+    assert store.band_counts(since=now - 60) == {0: 1, 1: 2, 2: 1, 3: 2}
+    rows = store.recent_for_job(JD, limit=2)
+    assert len(rows) == 2 and all(row['jd_hash'] == jd_hash(JD) for row in rows)
+
+
+def test_close_flushes_queued_records(tmp_path):
+    path = str(tmp_path / 'results.db')
+    store = ResultsStore(path)
+    for score in range(500):
+        store.record(result(float(score % 100)), 'resume', JD)
+    store.close()
+
+    reopened = ResultsStore(path)
+    assert reopened.summary()['analyses'] == 500
+    assert sum(reopened.band_counts().values()) == 500
+    reopened.close()
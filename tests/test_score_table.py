@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+
+from utils.ats_scorer import ATSScorer
+from utils.score_table import COMPONENTS, WEIGHT_PROFILES, ScoreTable, weight_vector
+
+RESUME_DATA = {'text': 'resume', 'emails': ['a@example.com'], 'phones': [], 'skills': ['python'],
+               'experience': ['5 years'], 'education': ['BSc'], 'sections': {'experience': '5 years'}}
+
+
+class ComponentScorer(ATSScorer):
+    """calculate_ats_score over fixed component scores, without loading any model"""
+
+    def __init__(self, components, weights):
+        self.components = components
+        self.weights = dict(weights)
+        self.result_cache = None
+
+    def score_components(self, resume_text, job_description, resume_data, semantic_score=None):
+        return self.components[resume_text, job_description]
+
+    def find_missing_keywords(self, resume_text, job_description):
+        return []
+
+
+@pytest.fixture
+def components():
+    rng = np.random.default_rng(3)
+    return {(f'resume{r}', f'job{j}'): dict(zip(COMPONENTS, map(float, rng.uniform(0, 100, len(COMPONENTS)))))
+            for r in range(15) for j in range(3)}
+
+
+def build_table(components):
+    scorer = ComponentScorer(components, WEIGHT_PROFILES['default'])
+    table = ScoreTable()
+    for resume, job in components:
+        table.append(resume, job, scorer.calculate_ats_score(resume, job, RESUME_DATA))
+    return table
+
+
+@pytest.mark.parametrize('profile', sorted(WEIGHT_PROFILES))
+def test_rerank_orders_like_calculate_ats_score(components, profile):
+    table = build_table(components)
+    scorer = ComponentScorer(components, WEIGHT_PROFILES[profile])
+    expected = sorted(((scorer.calculate_ats_score(resume, job, RESUME_DATA)['overall_score'], resume, job)
+                       for resume, job in components), key=lambda row: -row[0])
+
+    ranking = table.rerank(WEIGHT_PROFILES[profile])
+    assert [(row['resume'], row['job']) for row in ranking] == [(resume, job) for _, resume, job in expected]
+    assert [row['overall_score'] for row in ranking] == pytest.approx([score for score, _, _ in expected], abs=0.02)
+
+    top = table.rerank(WEIGHT_PROFILES[profile], top_k=5, job_id='job1')
+    assert [row['resume'] for row in top] == [resume for _, resume, job in expected if job == 'job1'][:5]
+
+
+@pytest.mark.parametrize('weights', [
+    {name: weight for name, weight in WEIGHT_PROFILES['default'].items() if name != 'format'},
+    dict(WEIGHT_PROFILES['default'], seniority=0.1),
+    dict(WEIGHT_PROFILES['default'], keyword=-0.1),
+    dict(WEIGHT_PROFILES['default'], skills=float('nan')),
+])
+def test_invalid_weights_are_rejected(components, weights):
+    with pytest.raises(ValueError):
+        weight_vector(weights)
+    with pytest.raises(ValueError):
+        build_table(components).rerank(weights)
+    # Checked before any model is loaded
+    with pytest.raises(ValueError):
+        ATSScorer(weights=weights)
+
+
+def test_save_load_round_trip(tmp_path, components):
+    table = build_table(components)
+    table.extend([{'resume': 'broken.pdf', 'job': 'job0', 'error': 'No text could be extracted'}])
+    path = str(tmp_path / 'scores.npz')
+    table.save(path)
+
+    loaded = ScoreTable.load(path)
+    assert len(loaded) == len(components)
+    weights = WEIGHT_PROFILES['skills_first']
+    assert loaded.rerank(weights) == table.rerank(weights)
+    first = loaded.rerank(weights, top_k=1)[0]
+    assert first['skills'] == pytest.approx(round(components[first['resume'], first['job']]['skills'], 2))
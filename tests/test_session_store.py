@@ -0,0 +1,62 @@
+from utils.result_cache import ResultCache
+from utils.session_store import SessionResultStore
+
+
+def payload(i, jd_size=400):
+    return {'results': {'overall_score': float(i), 'missing_keywords': ['python'] * 20},
+            'jd_text': f'jd {i} ' + 'x' * jd_size, 'resume_filename': f'resume{i}.pdf',
+            'recommendations': [{'id': f'job{i}', 'overall_score': 50.0}]}
+
+
+def test_evicted_payload_is_rebuilt_with_every_field(tmp_path):
+    cache = ResultCache(disk_path=str(tmp_path / 'cache.db'))
+    store = SessionResultStore(max_bytes=2000, result_cache=cache)
+    handles = []
+    for i in range(10):
+        cache.put(f'key{i}', payload(i)['results'])
+        # Payloads without a cache key are spilled whole
+        handles.append(store.put(payload(i), cache_key=f'key{i}' if i % 2 else None))
+    assert store.stats()['evictions'] > 0
+
+    for i in (0, 1):
+        assert store.get(handles[i]) == payload(i)
+    assert store.stats()['rebuilds'] == 2
+
+
+def test_caps_apply_without_a_disk_tier():
+    store = SessionResultStore(max_bytes=100_000, max_entries=3, result_cache=ResultCache())
+    handles = [store.put(payload(i)) for i in range(5)]
+    assert store.stats()['entries'] == 3 and store.stats()['evictions'] == 2
+    # Evicted entries cannot be rebuilt, so their sessions see expired results
+    assert [store.get(h) for h in handles] == [None, None] + [payload(i) for i in range(2, 5)]
+
+    store = SessionResultStore(max_bytes=2000, result_cache=ResultCache())
+    for i in range(10):
+        store.put(payload(i))
+    assert store.stats()['bytes'] <= 2000
+
+
+def test_spills_survive_a_new_scorer_version_and_skip_the_result_lru(tmp_path):
+    cache = ResultCache(disk_path=str(tmp_path / 'cache.db'))
+    store = SessionResultStore(max_entries=1, result_cache=cache)
+    cache.put('key0', payload(0)['results'], scorer_version='v1')
+    handle = store.put(payload(0), cache_key='key0')
+    store.put(payload(1))
+    # Building a scorer prunes the result cache to its version; session spills are not results
+    cache.retain_version('v1')
+    assert cache.stats()['entries'] == 1
+
+    restarted = ResultCache(disk_path=str(tmp_path / 'cache.db'))
+    store = SessionResultStore(max_entries=1, result_cache=restarted)
+    assert store.get(handle) == payload(0)
+    # Only the results came through the result cache, under their own key
+    assert restarted.stats()['entries'] == 1 and restarted.get('key0') == payload(0)['results']
+
+
+def test_expired_payload_is_not_rebuilt(tmp_path):
+    cache = ResultCache(disk_path=str(tmp_path / 'cache.db'))
+    store = SessionResultStore(max_bytes=100, ttl_seconds=-1, result_cache=cache)
+    cache.put('key', payload(0)['results'])
+    handle = store.put(payload(0), cache_key='key')
+    assert store.get(handle) is None
+    assert store.stats()['misses'] == 1
@@ -0,0 +1,109 @@
+import socket
+import time
+import zlib
+
+import numpy as np
+import pytest
+
+from utils.ats_scorer import SCORE_WEIGHTS
+from utils.corpus_index import CorpusIndex
+from utils.embedding_store import EmbeddingCodec, load_codec
+from utils.keyword_engine import KeywordEngine
+from utils.matrix_scorer import MatrixScorer
+from utils.sharded_index import ShardCoordinator, build_shards, start_local_workers
+
+AUTHKEY = b'test shard secret'
+SKILLS = ['python', 'java', 'sql', 'docker', 'kubernetes', 'react', 'aws', 'spark', 'django', 'linux']
+JOB_DESCRIPTION = 'Senior Python engineer: Django, SQL and Docker on AWS, some Kubernetes'
+
+
+class HashedEncoder:
+    """Hashed, L2-normalised word counts: deterministic stand-in for sentence embeddings"""
+
+    def encode(self, texts, batch_size=None):
+        vectors = np.zeros((len(texts), 64), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for word in text.split():
+                vectors[row, zlib.crc32(word.encode()) % 64] += 1
+        return vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+
+
+class FakeScorer:
+    """The ATSScorer attributes MatrixScorer reads on the coordinator side"""
+    weights = dict(SCORE_WEIGHTS)
+    keyword_engine = None
+    semantic_model = HashedEncoder()
+
+
+def resumes():
+    rng = np.random.default_rng(7)
+    return [{'id': f'resume{i:02d}',
+             'text': f'Engineer {i} with ' + ', '.join(rng.choice(SKILLS, size=rng.integers(1, 6), replace=False))}
+            for i in range(40)]
+
+
+def free_port_range(count):
+    """A base port whose next count ports are free right now"""
+    for _ in range(50):
+        with socket.socket() as probe:
+            probe.bind(('127.0.0.1', 0))
+            base = probe.getsockname()[1]
+        if base + count < 65536 and all(_is_free(base + offset) for offset in range(count)):
+            return base
+    pytest.skip("No free local port range")
+
+
+def _is_free(port):
+    with socket.socket() as probe:
+        try:
+            probe.bind(('127.0.0.1', port))
+            return True
+        except OSError:
+            return False
+
+
+@pytest.mark.parametrize('codec', [None, 'int8'])
+def test_coordinator_matches_the_unsharded_index(tmp_path, codec):
+    documents = resumes()
+    keyword_engine = KeywordEngine().fit([document['text'].lower() for document in documents])
+    index = CorpusIndex(MatrixScorer(FakeScorer(), keyword_engine), str(tmp_path / 'index'),
+                        codec=EmbeddingCodec(codec) if codec else None)
+    index.upsert(documents[:25])
+    index.upsert(documents[25:])
+    # Replaced and deleted documents must not come back from the shards
+    index.upsert([{'id': 'resume03', 'text': 'Python Django SQL Docker AWS Kubernetes engineer'}])
+    index.delete(['resume05'])
+    expected = index.search(JOB_DESCRIPTION, top_k=10)
+
+    shard_dirs = build_shards(index, keyword_engine, 3, str(tmp_path / 'shards'))
+    processes, addresses = start_local_workers(shard_dirs, base_port=free_port_range(len(shard_dirs)),
+                                               authkey=AUTHKEY)
+    try:
+        coordinator = ShardCoordinator(MatrixScorer(FakeScorer(), keyword_engine), addresses, authkey=AUTHKEY,
+                                       codec=load_codec(shard_dirs[0]))
+        deadline = time.monotonic() + 30
+        while True:
+            try:
+                stats = coordinator.stats()
+                break
+            except OSError:
+                if time.monotonic() > deadline:
+                    raise
+                time.sleep(0.1)
+        assert sum(shard['live_documents'] for shard in stats) == len(index)
+
+        response = coordinator.search(JOB_DESCRIPTION, top_k=10)
+        assert response['failed_shards'] == [] and response['shards_answered'] == 3
+        assert response['results'] == expected
+        assert expected[0]['id'] == 'resume03'
+        assert 'resume05' not in [hit['id'] for hit in coordinator.search(JOB_DESCRIPTION, top_k=50)['results']]
+    finally:
+        for process in processes:
+            process.terminate()
+            process.join(5)
+
+
+def test_workers_need_a_secret(monkeypatch):
+    monkeypatch.delenv('ATS_SHARD_AUTHKEY', raising=False)
+    with pytest.raises(ValueError, match='ATS_SHARD_AUTHKEY'):
+        start_local_workers(['unused'])
@@ -0,0 +1,60 @@
+import os
+
+from utils.text_store import INDEX_DTYPE, ResumeTextStore
+
+
+def parsed(text, skills):
+    return {'text': text, 'skills': skills}
+
+
+def fill(directory):
+    store = ResumeTextStore(directory)
+    store.append('a.pdf', 'Python developer', parsed('Python developer', ['python']))
+    store.append_many([('b.pdf', 'Java developer', parsed('Java developer', ['java'])),
+                       ('c.pdf', 'Go developer', None)])
+    store.close()
+
+
+def test_records_survive_reopen(tmp_path):
+    fill(str(tmp_path))
+    store = ResumeTextStore(str(tmp_path))
+    assert len(store) == 3
+    assert store.get(0) == {'id': 'a.pdf', 'text': 'Python developer', 'parsed': parsed('Python developer', ['python'])}
+    assert store.get_by_id('c.pdf')['text'] == 'Go developer'
+    assert store.get_by_id('missing.pdf') is None
+
+
+def test_reappended_id_supersedes_the_older_record(tmp_path):
+    fill(str(tmp_path))
+    store = ResumeTextStore(str(tmp_path))
+    store.append('a.pdf', 'Python and Rust developer')
+    store.close()
+
+    store = ResumeTextStore(str(tmp_path))
+    assert store.get_by_id('a.pdf')['text'] == 'Python and Rust developer'
+    assert [record['id'] for record in store.iter_records()] == ['b.pdf', 'c.pdf', 'a.pdf']
+    assert len(list(store.iter_records(latest_only=False))) == 4
+
+
+def test_torn_appends_are_dropped_on_reopen(tmp_path):
+    fill(str(tmp_path))
+    data_path = os.path.join(str(tmp_path), 'records.dat')
+    index_path = os.path.join(str(tmp_path), 'records.idx')
+    data_size = os.path.getsize(data_path)
+    # A crash mid-append: data written without its index entry, and half an index entry
+    with open(data_path, 'ab') as f:
+        f.write(b'{"id": "d.pdf", "text": "Rust dev')
+    with open(index_path, 'ab') as f:
+        f.write(b'\0' * (INDEX_DTYPE.itemsize // 2))
+
+    store = ResumeTextStore(str(tmp_path))
+    assert len(store) == 3
+    assert os.path.getsize(data_path) == data_size
+    assert os.path.getsize(index_path) == 3 * INDEX_DTYPE.itemsize
+
+    # The store stays appendable after recovery
+    store.append('d.pdf', 'Rust developer')
+    store.close()
+    store = ResumeTextStore(str(tmp_path))
+    assert [record['id'] for record in store.iter_records()] == ['a.pdf', 'b.pdf', 'c.pdf', 'd.pdf']
+    assert store.get_by_id('b.pdf')['parsed'] == parsed('Java developer', ['java'])
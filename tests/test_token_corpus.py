@@ -0,0 +1,90 @@
+import numpy as np
+import pytest
+
+from utils.ats_scorer import ATSScorer
+from utils.token_corpus import TokenCorpus, Vocabulary
+
+STOP_WORDS = {'a', 'an', 'and', 'the', 'with', 'of', 'in', 'on', 'for', 'to', 'we', 'you', 'are', 'is'}
+RESUMES = [
+    ('alice', 'Python developer with Django and PostgreSQL experience. Built REST APIs in Python.'),
+    ('bob', 'Java engineer: Spring Boot, Kafka and microservices on Kubernetes.'),
+    ('carol', 'Data scientist. Python, pandas, statistics and machine learning with scikit-learn.'),
+    ('dave', ''),
+]
+LATER_RESUMES = [
+    ('erin', 'Platform engineer running Kubernetes and Terraform on AWS; Python automation.'),
+    ('frank', 'Frontend developer: React, TypeScript, accessibility and design systems.'),
+]
+JOB_DESCRIPTIONS = [
+    'We are hiring a Python developer. The Python developer builds Django services on PostgreSQL and '
+    'Kubernetes. Kubernetes experience and Terraform experience are a plus; Terraform on AWS.',
+    'Data scientist with Python and machine learning; machine learning models in production, statistics.',
+    'The the and of',
+]
+
+
+class KeywordScorer(ATSScorer):
+    """ATSScorer's keyword functions without a keyword model, and without loading any other model"""
+
+    def __init__(self):
+        self.stop_words = STOP_WORDS
+        self.keyword_engine = None
+
+
+def build(documents):
+    return TokenCorpus(Vocabulary(STOP_WORDS)).add_many(documents)
+
+
+def assert_matches_scorer(corpus, documents):
+    scorer = KeywordScorer()
+    for job_description in JOB_DESCRIPTIONS:
+        scores = corpus.keyword_match(job_description)
+        missing = corpus.missing_keywords(job_description)
+        for row, (_, text) in enumerate(documents):
+            assert scores[row] == pytest.approx(scorer.calculate_keyword_match(text, job_description))
+            assert missing[row] == scorer.find_missing_keywords(text, job_description)
+
+
+def test_keyword_functions_match_the_scorer():
+    corpus = build(RESUMES)
+    assert_matches_scorer(corpus, RESUMES)
+
+    rows = np.array([2, 0])
+    job_description = JOB_DESCRIPTIONS[0]
+    assert corpus.keyword_match(job_description, rows).tolist() == corpus.keyword_match(job_description)[rows].tolist()
+    assert corpus.missing_keywords(job_description, rows) == [corpus.missing_keywords(job_description)[i]
+                                                             for i in rows]
+
+
+def test_vocabulary_growing_between_adds():
+    corpus = build(RESUMES)
+    # Queried once, so the term-frequency matrix is built at the smaller vocabulary size
+    width = corpus.term_frequencies.shape[1]
+    corpus.add_many(LATER_RESUMES)
+    assert len(corpus.vocabulary) > width
+    assert corpus.term_frequencies.shape == (len(RESUMES) + len(LATER_RESUMES), len(corpus.vocabulary))
+    assert_matches_scorer(corpus, RESUMES + LATER_RESUMES)
+
+    # Growing the vocabulary without adding documents only widens the matrix
+    corpus.vocabulary.encode(['unseen'])
+    assert corpus.term_frequencies.shape[1] == len(corpus.vocabulary)
+    assert corpus.document_frequency()[corpus.vocabulary.ids['unseen']] == 0
+
+
+def test_save_load_round_trip(tmp_path):
+    corpus = build(RESUMES + LATER_RESUMES)
+    path = str(tmp_path / 'corpus.npz')
+    corpus.save(path)
+
+    loaded = TokenCorpus.load(path)
+    assert loaded.doc_ids == corpus.doc_ids
+    assert loaded.vocabulary.tokens == corpus.vocabulary.tokens
+    assert loaded.vocabulary.stop_words == corpus.vocabulary.stop_words
+    assert all(np.array_equal(loaded.document(row), corpus.document(row)) for row in range(len(corpus)))
+    assert (loaded.term_frequencies != corpus.term_frequencies).nnz == 0
+    np.testing.assert_allclose(loaded.idf(), corpus.idf())
+    assert_matches_scorer(loaded, RESUMES + LATER_RESUMES)
+
+    # A loaded corpus keeps growing with stable ids
+    loaded.add('grace', 'Rust systems programmer')
+    assert loaded.vocabulary.decode(loaded.document(len(loaded) - 1)) == ['rust', 'systems', 'programmer']
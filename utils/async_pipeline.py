@@ -0,0 +1,127 @@
+import asyncio
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from utils.ats_scorer import ATSScorer
+from utils.batching import MicroBatcher
+from utils.bulk_pipeline import _init_worker, extract_and_parse, output_rows
+from utils.result_writer import jd_hash
+from utils.text_processor import TextProcessor
+
+
+class AsyncAnalyzer:
+    def __init__(self, scorer: ATSScorer, workers: Optional[int] = None, max_concurrency: int = 16,
+                 max_batch_size: int = 32, max_wait_ms: float = 10.0):
+        self.scorer = scorer
+        self.text_processor = TextProcessor()
+        # Extraction and spaCy are CPU-bound and hold the GIL, so they run in worker processes
+        self.pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker)
+        # Inference runs on the batcher's thread; concurrent analyses share encoder calls
+        self.batcher = MicroBatcher(lambda texts: scorer.semantic_model.encode(texts, batch_size=max_batch_size),
+                                    max_batch_size=max_batch_size, max_wait_ms=max_wait_ms)
+        self.max_concurrency = max_concurrency
+        self._jd_embeddings: Dict[str, np.ndarray] = {}
+
+    async def read_file(self, path: str) -> bytes:
+        """Read a file without blocking the event loop"""
+        def read():
+            with open(path, 'rb') as f:
+                return f.read()
+        return await asyncio.to_thread(read)
+
+    async def parse(self, doc_id: str, name: str, data: bytes) -> Dict[str, Any]:
+        """{'id', 'text', 'parsed'} or {'id', 'error'} for one file, extracted in the process pool"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.pool, extract_and_parse, doc_id, name, data)
+
+    async def encode(self, texts: List[str]) -> np.ndarray:
+        """Unit-normalised embeddings; cancelling the caller drops the request from its batch"""
+        embeddings = np.asarray(await asyncio.wrap_future(self.batcher.submit(texts)), dtype=np.float32)
+        return embeddings / np.maximum(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12)
+
+    async def _job_embeddings(self, job_texts: List[str]) -> np.ndarray:
+        missing = [text for text in dict.fromkeys(job_texts) if text not in self._jd_embeddings]
+        if missing:
+            if len(self._jd_embeddings) > 1024:
+                self._jd_embeddings.clear()
+            self._jd_embeddings.update(zip(missing, await self.encode(missing)))
+        return np.vstack([self._jd_embeddings[text] for text in job_texts])
+
+    async def score(self, text: str, parsed: Dict[str, Any], job_descriptions: List[str]) -> List[Dict[str, Any]]:
+        """calculate_ats_score of one parsed resume against each JD, with one shared encoder call"""
+        resume_text = self.text_processor.clean_text(text)
+        job_texts = [self.text_processor.clean_text(jd) for jd in job_descriptions]
+        resume_embedding, job_embeddings = await asyncio.gather(self.encode([resume_text]),
+                                                                self._job_embeddings(job_texts))
+        similarity = job_embeddings @ resume_embedding[0] * 100
+
+        def assemble():
+            return [self.scorer.calculate_ats_score(resume_text, job_text, parsed, semantic_score=float(score))
+                    for job_text, score in zip(job_texts, similarity)]
+        return await asyncio.to_thread(assemble)
+
+    async def analyze(self, name: str, data: bytes, job_description: str) -> Dict[str, Any]:
+        """Full analysis of one uploaded file, e.g. from a web handler; raises ValueError if unreadable"""
+        doc = await self.parse(name, name, data)
+        if 'error' in doc:
+            raise ValueError(doc['error'])
+        result = (await self.score(doc['text'], doc['parsed'], [job_description]))[0]
+        return {**result, 'resume_data': doc['parsed']}
+
+    async def analyze_stream(self, documents: Iterable[Tuple[str, str, bytes]],
+                             job_descriptions: Dict[str, str]) -> AsyncIterator[Tuple[str, List[Dict[str, Any]]]]:
+        """Yield (doc id, rows) as documents finish, with at most max_concurrency in flight"""
+        job_ids, job_texts = list(job_descriptions), list(job_descriptions.values())
+        jd_hashes = [jd_hash(jd) for jd in job_texts]
+
+        async def process(doc_id: str, name: str, data: bytes) -> Tuple[str, List[Dict[str, Any]]]:
+            doc = await self.parse(doc_id, name, data)
+            if 'error' in doc:
+                return doc_id, [{'resume': doc_id, 'error': doc['error']}]
+            started = time.perf_counter()
+            results = await self.score(doc['text'], doc['parsed'], job_texts)
+            score_ms = (time.perf_counter() - started) * 1000 / len(results)
+            return doc_id, output_rows(doc, job_ids, jd_hashes, results, score_ms)
+
+        iterator = iter(documents)
+        running = set()
+        exhausted = False
+        try:
+            while running or not exhausted:
+                while not exhausted and len(running) < self.max_concurrency:
+                    # The source may read from disk, so pull from it off the event loop
+                    item = await asyncio.to_thread(next, iterator, None)
+                    if item is None:
+                        exhausted = True
+                    else:
+                        running.add(asyncio.create_task(process(*item)))
+                if not running:
+                    break
+                done, running = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield task.result()
+        finally:
+            # Consumer stopped early or was cancelled: abandon whatever is still in flight
+            for task in running:
+                task.cancel()
+            await asyncio.gather(*running, return_exceptions=True)
+
+    def close(self):
+        self.batcher.close()
+        self.pool.shutdown(cancel_futures=True)
+
+
+async def run_bulk(analyzer: AsyncAnalyzer, documents: Iterable[Tuple[str, str, bytes]],
+                   job_descriptions: Dict[str, str], sink) -> Dict[str, Any]:
+    """Async counterpart of BulkPipeline.run for the bulk CLI; sink gets (doc id, rows)"""
+    start = time.perf_counter()
+    counters = {'written': 0, 'failed': 0}
+    async for doc_id, rows in analyzer.analyze_stream(documents, job_descriptions):
+        counters['failed' if 'error' in rows[0] else 'written'] += 1
+        sink(doc_id, rows)
+    elapsed = time.perf_counter() - start
+    return {**counters, 'seconds': round(elapsed, 2),
+            'documents_per_second': round(counters['written'] / max(elapsed, 1e-9), 2)}
@@ -1,13 +1,20 @@
-from sentence_transformers import SentenceTransformer
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 import numpy as np
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Tuple
+import hashlib
+import json
+import os
 import re
 from collections import Counter
 import nltk
 from nltk.corpus import stopwords
 from nltk.tokenize import word_tokenize
+from utils.encoder import MODEL_NAME, load_sentence_encoder
+from utils.inference_server import connect_if_available
+from utils.keyword_engine import KeywordEngine
+from utils.lsa_model import LSAModel
+from utils.result_cache import ResultCache
 
 # Download NLTK data if not already present
 try:
@@ -20,32 +27,177 @@ try:
 except LookupError:
     nltk.download('stopwords')
 
+# Weight of each component in the overall score
+SCORE_WEIGHTS = {
+    'keyword': 0.25,
+    'semantic': 0.20,
+    'skills': 0.25,
+    'experience': 0.15,
+    'education': 0.10,
+    'format': 0.05,
+}
+
+# Key of each component's score in the calculate_ats_score result
+RESULT_KEYS = {
+    'keyword': 'keyword_match_score',
+    'semantic': 'semantic_similarity',
+    'skills': 'skills_score',
+    'experience': 'experience_score',
+    'education': 'education_score',
+    'format': 'format_score',
+}
+
+# Bump whenever scoring logic changes so stored results computed by older code are not reused
+SCORER_VERSION = '1.0'
+
+# Named scoring modes; relative_cost is the expected semantic-scoring cost per pair versus 'full'
+# (see benchmarks/compare_modes.py for measured costs and accuracy)
+SCORING_MODES = {
+    'fast': {
+        'semantic_backend': 'lsa',
+        'inference_mode': None,
+        'relative_cost': 0.02,
+        'description': 'TF-IDF + truncated SVD (LSA) similarity fitted on our corpus, no transformer',
+    },
+    'balanced': {
+        'semantic_backend': 'encoder',
+        'inference_mode': 'int8',
+        'relative_cost': 0.5,
+        'description': 'MiniLM with int8 dynamically quantized linear layers',
+    },
+    'full': {
+        'semantic_backend': 'encoder',
+        'inference_mode': 'float32',
+        'relative_cost': 1.0,
+        'description': 'MiniLM in float32',
+    },
+}
+
 class ATSScorer:
-    def __init__(self):
-        # Load sentence transformer model for semantic similarity
-        self.semantic_model = SentenceTransformer('all-MiniLM-L6-v2')
+    def __init__(self, mode: str = 'full', inference_socket: Optional[str] = None,
+                 inference_mode: Optional[str] = None, num_threads: Optional[int] = None,
+                 lsa_model_path: Optional[str] = None, keyword_model_path: Optional[str] = None,
+                 result_cache: Optional[ResultCache] = None, weights: Optional[Dict[str, float]] = None):
+        if mode not in SCORING_MODES:
+            raise ValueError(f"Unknown scoring mode '{mode}', expected one of {list(SCORING_MODES)}")
+        if weights is not None and set(weights) != set(SCORE_WEIGHTS):
+            raise ValueError(f"Weights must cover exactly {list(SCORE_WEIGHTS)}")
+        if weights is not None and not all(0 <= weight < float('inf') for weight in weights.values()):
+            raise ValueError(f"Weights must be finite and non-negative, got {weights}")
+        # Component weights of the overall score (SCORE_WEIGHTS unless overridden)
+        self.weights = dict(weights or SCORE_WEIGHTS)
+        self.mode = mode
+        mode_config = SCORING_MODES[mode]
+
+        if mode_config['semantic_backend'] == 'lsa':
+            # Corpus-fitted LSA model exposes the same encode() as the sentence transformer
+            self.semantic_model = LSAModel.load(lsa_model_path)
+            self.semantic_config = {'backend': 'lsa', 'lsa': self.semantic_model.fingerprint()}
+        else:
+            inference_mode = inference_mode or mode_config['inference_mode']
+            # Route encoding through the shared inference server when one is running the same model and mode
+            socket_path = inference_socket or os.environ.get('ATS_INFERENCE_SOCKET')
+            self.semantic_model = connect_if_available(socket_path, inference_mode)
+            if self.semantic_model is not None:
+                self.semantic_config = {'backend': 'server', **self.semantic_model.server_info}
+            else:
+                # Load sentence transformer model for semantic similarity ('int8' for quantized CPU inference)
+                self.semantic_model = load_sentence_encoder(inference_mode, num_threads)
+                self.semantic_config = {'backend': 'encoder', 'model': MODEL_NAME, 'inference_mode': inference_mode,
+                                        'num_threads': num_threads}
         self.tfidf_vectorizer = TfidfVectorizer(max_features=100, stop_words='english')
         self.stop_words = set(stopwords.words('english'))
-        
-    def calculate_ats_score(self, resume_text: str, job_description: str, resume_data: Dict) -> Dict[str, Any]:
+
+        # Optional corpus-fitted IDF keyword model; without it keywords are matched by raw overlap
+        keyword_model_path = keyword_model_path or os.environ.get('ATS_KEYWORD_MODEL')
+        self.keyword_engine = KeywordEngine.load(keyword_model_path) if keyword_model_path else None
+        # (resume, JD, (match score, missing terms)) of the last pair the engine scored, so the keyword
+        # score and the missing keywords of one analysis come from a single engine pass
+        self._last_keyword_analysis = None
+
+        # Optional memoization of full results; the key covers the fingerprint, so results
+        # from another scorer version, weighting or keyword model are never returned
+        self.result_cache = result_cache
+        self._fingerprint = None
+        if result_cache is not None:
+            result_cache.retain_version(SCORER_VERSION)
+
+    def fingerprint(self) -> str:
+        """Hash of everything that determines a score: scorer version, weights, mode, the semantic model
+        actually in use (LSA components, or encoder model, inference mode and threads) and keyword model"""
+        if self._fingerprint is None:
+            config = {'version': SCORER_VERSION, 'weights': self.weights, 'mode': self.mode,
+                      'semantic': self.semantic_config}
+            if self.keyword_engine is not None:
+                config['keyword_idf'] = hashlib.sha256(self.keyword_engine.idf.tobytes()).hexdigest()
+            self._fingerprint = hashlib.sha256(json.dumps(config, sort_keys=True).encode('utf-8')).hexdigest()
+        return self._fingerprint
+
+    def embedding_fingerprint(self) -> str:
+        """Hash of what determines semantic_model.encode output: the LSA model, or encoder model and inference mode"""
+        config = {key: value for key, value in self.semantic_config.items() if key not in ('backend', 'num_threads')}
+        return hashlib.sha256(json.dumps(config, sort_keys=True).encode('utf-8')).hexdigest()
+
+    def result_key(self, resume_text: str, job_description: str, resume_data: Dict) -> str:
+        """Result cache key of this exact analysis under this scorer's configuration"""
+        return ResultCache.key(resume_text, job_description, resume_data, self.fingerprint())
+
+    def cached_result(self, resume_text: str, job_description: str, resume_data: Dict) -> Optional[Dict[str, Any]]:
+        """Stored result for this exact analysis, if a result cache is attached and holds one"""
+        if self.result_cache is None:
+            return None
+        return self.result_cache.get(self.result_key(resume_text, job_description, resume_data))
+
+    def calculate_ats_score(self, resume_text: str, job_description: str, resume_data: Dict,
+                            semantic_score: Optional[float] = None) -> Dict[str, Any]:
         """Calculate comprehensive ATS score"""
-        
-        # Calculate different score components
-        keyword_score = self.calculate_keyword_match(resume_text, job_description)
-        semantic_score = self.calculate_semantic_similarity(resume_text, job_description)
-        skills_score = self.calculate_skills_match(resume_data.get('skills', []), job_description)
-        experience_score = self.evaluate_experience(resume_data.get('experience', []))
-        education_score = self.evaluate_education(resume_data.get('education', []))
-        format_score = self.evaluate_format(resume_data)
-        
+        cache_key = None
+        if self.result_cache is not None:
+            cache_key = self.result_key(resume_text, job_description, resume_data)
+            cached = self.result_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        components = self.score_components(resume_text, job_description, resume_data, semantic_score)
+        missing_keywords = self.find_missing_keywords(resume_text, job_description)
+        result = self.assemble_result(components, resume_data, job_description, missing_keywords)
+        if cache_key is not None:
+            self.result_cache.put(cache_key, result, SCORER_VERSION)
+        return result
+
+    def score_components(self, resume_text: str, job_description: str, resume_data: Dict,
+                         semantic_score: Optional[float] = None) -> Dict[str, float]:
+        """Raw 0-100 score of every SCORE_WEIGHTS component"""
+        if semantic_score is None:
+            # Batch callers pass a similarity computed from one shared encoder call instead
+            semantic_score = self.calculate_semantic_similarity(resume_text, job_description)
+        return {
+            'keyword': self.calculate_keyword_match(resume_text, job_description),
+            'semantic': semantic_score,
+            'skills': self.calculate_skills_match(resume_data.get('skills', []), job_description),
+            'experience': self.evaluate_experience(resume_data.get('experience', [])),
+            'education': self.evaluate_education(resume_data.get('education', [])),
+            'format': self.evaluate_format(resume_data),
+        }
+
+    def assemble_result(self, components: Dict[str, float], resume_data: Dict, job_description: str,
+                        missing_keywords: List[str]) -> Dict[str, Any]:
+        """Weighted overall score, issues and suggestions from already computed components"""
+        keyword_score = components['keyword']
+        semantic_score = components['semantic']
+        skills_score = components['skills']
+        experience_score = components['experience']
+        education_score = components['education']
+        format_score = components['format']
+
         # Calculate overall score (weighted average)
         overall_score = (
-            keyword_score * 0.25 +
-            semantic_score * 0.20 +
-            skills_score * 0.25 +
-            experience_score * 0.15 +
-            education_score * 0.10 +
-            format_score * 0.05
+            keyword_score * self.weights['keyword'] +
+            semantic_score * self.weights['semantic'] +
+            skills_score * self.weights['skills'] +
+            experience_score * self.weights['experience'] +
+            education_score * self.weights['education'] +
+            format_score * self.weights['format']
         )
         
         # Identify issues and suggestions
@@ -59,9 +211,6 @@ class ATSScorer:
             education_score, format_score, resume_data, job_description
         )
         
-        # Find missing keywords
-        missing_keywords = self.find_missing_keywords(resume_text, job_description)
-        
         return {
             'overall_score': round(overall_score, 2),
             'keyword_match_score': round(keyword_score, 2),
@@ -77,8 +226,21 @@ class ATSScorer:
             'sections_found': list(resume_data.get('sections', {}).keys())
         }
     
+    def _keyword_analysis(self, resume: str, job_desc: str) -> Tuple[float, List[str]]:
+        """KeywordEngine score and missing terms of one pair: JD weights and resume vector computed once"""
+        last = self._last_keyword_analysis
+        if last is not None and last[0] == resume and last[1] == job_desc:
+            return last[2]
+        analysis = self.keyword_engine.score_text(resume, job_desc)
+        # One tuple assignment, so threads sharing the scorer never see a half-updated entry
+        self._last_keyword_analysis = (resume, job_desc, analysis)
+        return analysis
+
     def calculate_keyword_match(self, resume: str, job_desc: str) -> float:
         """Calculate keyword matching score using TF-IDF"""
+        if self.keyword_engine is not None:
+            return self._keyword_analysis(resume, job_desc)[0]
+        
         try:
             # Tokenize and process texts
             resume_tokens = word_tokenize(resume.lower())
@@ -330,6 +492,9 @@ class ATSScorer:
     
     def find_missing_keywords(self, resume: str, job_desc: str) -> List[str]:
         """Find important keywords missing from resume"""
+        if self.keyword_engine is not None:
+            return list(self._keyword_analysis(resume, job_desc)[1])
+        
         # Extract important words from job description
         jd_tokens = word_tokenize(job_desc.lower())
         resume_tokens = set(word_tokenize(resume.lower()))
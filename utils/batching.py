@@ -0,0 +1,109 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, List, Optional
+
+import numpy as np
+
+
+class MicroBatcher:
+    def __init__(self, encode_fn: Callable[[List[str]], np.ndarray], max_batch_size: int = 64,
+                 max_wait_ms: float = 5.0, max_queue_size: int = 0):
+        # encode_fn takes a list of texts and returns one embedding row per text
+        self.encode_fn = encode_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.requests = queue.Queue(maxsize=max_queue_size)
+        self.batches_run = 0
+        self.texts_encoded = 0
+        self._closed = False
+        # Shutdown is an event rather than a queued sentinel, since a bounded queue may have no room for one
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, texts: List[str], block: bool = True) -> Future:
+        """Queue texts for encoding; raises queue.Full when non-blocking and at capacity"""
+        if self._closed:
+            raise RuntimeError("MicroBatcher is closed")
+        future = Future()
+        if not texts:
+            future.set_result(np.zeros((0, 0), dtype=np.float32))
+            return future
+        self.requests.put((list(texts), future), block=block)
+        return future
+
+    def encode(self, texts: List[str], timeout: Optional[float] = None) -> np.ndarray:
+        """Encode texts, sharing the model call with any concurrent requests"""
+        return self.submit(texts).result(timeout)
+
+    def queue_depth(self) -> int:
+        """Number of requests waiting for the next batch"""
+        return self.requests.qsize()
+
+    def close(self):
+        """Stop the batching thread after draining queued requests"""
+        self._closed = True
+        self._stop.set()
+        try:
+            # Wakes the thread if it is waiting on an empty queue; a full queue needs no wake-up
+            self.requests.put_nowait(None)
+        except queue.Full:
+            pass
+        self._thread.join()
+        # Anything a blocked submit() slipped in after the thread stopped will never be encoded
+        while True:
+            try:
+                item = self.requests.get_nowait()
+            except queue.Empty:
+                break
+            if item is not None and item[1].set_running_or_notify_cancel():
+                item[1].set_exception(RuntimeError("MicroBatcher is closed"))
+
+    def _collect(self, first) -> list:
+        """Gather requests until the batch is full or the wait window closes"""
+        batch = [first]
+        size = len(first[0])
+        deadline = time.monotonic() + self.max_wait
+        while size < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self.requests.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is None:
+                # Wake-up from close(); the run loop checks for shutdown after this batch
+                break
+            batch.append(item)
+            size += len(item[0])
+        return batch
+
+    def _run(self):
+        while not (self._stop.is_set() and self.requests.empty()):
+            first = self.requests.get()
+            if first is None:
+                continue
+            batch = self._collect(first)
+
+            # Drop requests whose caller has already given up
+            batch = [(texts, future) for texts, future in batch if future.set_running_or_notify_cancel()]
+            if not batch:
+                continue
+
+            all_texts = [text for texts, _ in batch for text in texts]
+            try:
+                embeddings = np.asarray(self.encode_fn(all_texts))
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+
+            self.batches_run += 1
+            self.texts_encoded += len(all_texts)
+            offset = 0
+            for texts, future in batch:
+                future.set_result(embeddings[offset:offset + len(texts)])
+                offset += len(texts)
@@ -0,0 +1,316 @@
+import argparse
+import asyncio
+import io
+import json
+import os
+import queue
+import sys
+import threading
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from utils.ats_scorer import ATSScorer
+from utils.checkpoint import BulkCheckpoint, run_key
+from utils.result_writer import jd_hash
+from utils.score_table import ScoreTable
+from utils.text_processor import TextProcessor
+from utils.text_store import ResumeTextStore
+
+SUPPORTED_EXTENSIONS = ('.pdf', '.docx', '.txt')
+
+_parser = None
+
+
+def iter_documents(path: str) -> Iterator[Tuple[str, str, bytes]]:
+    """Yield (doc id, file name, raw bytes) for each resume in a directory or zip, one file at a time"""
+    if zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as archive:
+            for info in archive.infolist():
+                if not info.is_dir() and info.filename.lower().endswith(SUPPORTED_EXTENSIONS):
+                    yield info.filename, os.path.basename(info.filename), archive.read(info)
+        return
+    for root, dirs, files in os.walk(path):
+        dirs.sort()
+        for name in sorted(files):
+            if name.lower().endswith(SUPPORTED_EXTENSIONS):
+                file_path = os.path.join(root, name)
+                with open(file_path, 'rb') as f:
+                    yield os.path.relpath(file_path, path), name, f.read()
+
+
+def _init_worker():
+    # Each extraction process loads spaCy once
+    global _parser
+    from utils.resume_parser import ResumeParser
+    _parser = ResumeParser()
+
+
+def extract_and_parse(doc_id: str, name: str, data: bytes) -> Dict[str, Any]:
+    """Extract text and parse_resume output for one file; runs in a worker process"""
+    try:
+        started = time.perf_counter()
+        file = io.BytesIO(data)
+        file.name = name
+        text = _parser.extract_text(file)
+        if not text.strip():
+            return {'id': doc_id, 'error': 'No text could be extracted'}
+        extracted = time.perf_counter()
+        parsed = _parser.parse_resume(text)
+        return {'id': doc_id, 'text': text, 'parsed': parsed, 'extract_ms': (extracted - started) * 1000,
+                'parse_ms': (time.perf_counter() - extracted) * 1000}
+    except Exception as e:
+        return {'id': doc_id, 'error': f'{type(e).__name__}: {e}'}
+
+
+def output_rows(doc: Dict[str, Any], job_ids: List[str], jd_hashes: List[str], results: List[Dict[str, Any]],
+                score_ms: float) -> List[Dict[str, Any]]:
+    """Output rows of one scored document, one per job, with the JD hash and stage timings the app exports"""
+    timings = {'extract_ms': doc.get('extract_ms'), 'parse_ms': doc.get('parse_ms'), 'score_ms': score_ms}
+    return [{'resume': doc['id'], 'job': job_id, 'jd_hash': job_hash, **result, **timings}
+            for job_id, job_hash, result in zip(job_ids, jd_hashes, results)]
+
+
+class BulkPipeline:
+    def __init__(self, scorer: ATSScorer, job_descriptions: Dict[str, str], workers: Optional[int] = None,
+                 batch_size: int = 32, queue_size: int = 256, max_wait_ms: float = 50.0,
+                 text_store: Optional[ResumeTextStore] = None):
+        self.scorer = scorer
+        self.text_processor = TextProcessor()
+        self.job_ids = list(job_descriptions)
+        self.jd_hashes = [jd_hash(jd) for jd in job_descriptions.values()]
+        self.job_texts = [self.text_processor.clean_text(jd) for jd in job_descriptions.values()]
+        self.workers = workers or os.cpu_count() or 1
+        self.batch_size = batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.text_store = text_store
+        # Every stage boundary is bounded, so memory does not grow with the input size
+        self._in_flight = threading.BoundedSemaphore(queue_size)
+        self._parsed = queue.Queue(maxsize=queue_size)
+        self._results = queue.Queue(maxsize=queue_size)
+        self._job_embeddings = None
+        self.counters = {'read': 0, 'parsed': 0, 'scored': 0, 'written': 0, 'failed': 0}
+        self._errors = []
+
+    def queue_depths(self) -> Dict[str, int]:
+        return {'parsed': self._parsed.qsize(), 'results': self._results.qsize()}
+
+    def run(self, documents: Iterator[Tuple[str, str, bytes]], sink: Callable[[str, List[Dict[str, Any]]], None],
+            progress: Optional[Callable[['BulkPipeline', float], None]] = None,
+            progress_interval: float = 1.0) -> Dict[str, Any]:
+        """Extract -> parse -> score every document; sink gets each doc id with its rows, one per job"""
+        start = time.perf_counter()
+        self._job_embeddings = self._encode(self.job_texts)
+        stages = [
+            threading.Thread(target=self._guard, args=(self._score_stage,), name="bulk-score", daemon=True),
+            threading.Thread(target=self._guard, args=(self._write_stage, sink), name="bulk-write", daemon=True),
+        ]
+        for stage in stages:
+            stage.start()
+
+        reporter_done = threading.Event()
+        if progress is not None:
+            def report():
+                while not reporter_done.wait(progress_interval):
+                    progress(self, time.perf_counter() - start)
+            threading.Thread(target=report, name="bulk-progress", daemon=True).start()
+
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker) as pool:
+            for doc_id, name, data in documents:
+                if self._errors:
+                    break
+                # Blocks while queue_size documents are already being extracted or waiting to be scored
+                self._in_flight.acquire()
+                self.counters['read'] += 1
+                pool.submit(extract_and_parse, doc_id, name, data).add_done_callback(self._parsed.put)
+        self._parsed.put(None)
+        for stage in stages:
+            stage.join()
+        reporter_done.set()
+        if self._errors:
+            raise self._errors[0]
+
+        elapsed = time.perf_counter() - start
+        if progress is not None:
+            progress(self, elapsed)
+        return {**self.counters, 'seconds': round(elapsed, 2),
+                'documents_per_second': round(self.counters['written'] / max(elapsed, 1e-9), 2)}
+
+    def _guard(self, stage: Callable, *args):
+        try:
+            stage(*args)
+        except BaseException as e:
+            # Surface the failure to run() and keep draining so no other stage blocks forever
+            self._errors.append(e)
+            if stage == self._score_stage:
+                while self._parsed.get() is not None:
+                    self._in_flight.release()
+                self._results.put(None)
+            else:
+                while self._results.get() is not None:
+                    pass
+
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        embeddings = np.asarray(self.scorer.semantic_model.encode(texts, batch_size=self.batch_size), dtype=np.float32)
+        return embeddings / np.maximum(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12)
+
+    def _next_batch(self) -> Tuple[List[Dict[str, Any]], bool]:
+        """Up to batch_size parsed documents; waits at most max_wait for a batch to fill"""
+        batch, finished = [], False
+        deadline = None
+        while len(batch) < self.batch_size:
+            timeout = None if deadline is None else max(deadline - time.monotonic(), 0)
+            try:
+                future = self._parsed.get(timeout=timeout)
+            except queue.Empty:
+                break
+            if future is None:
+                finished = True
+                break
+            self._in_flight.release()
+            batch.append(future.result())
+            deadline = deadline or time.monotonic() + self.max_wait
+        return batch, finished
+
+    def _score_stage(self):
+        finished = False
+        while not finished:
+            batch, finished = self._next_batch()
+            self.counters['parsed'] += len(batch)
+            failed = [doc for doc in batch if 'error' in doc]
+            docs = [doc for doc in batch if 'error' not in doc]
+            for doc in failed:
+                self._results.put((doc, [], 0.0))
+            if not docs:
+                continue
+
+            started = time.perf_counter()
+            cleaned = [self.text_processor.clean_text(doc['text']) for doc in docs]
+            # One encoder call per batch; similarity to every job in one product
+            similarity = self._encode(cleaned) @ self._job_embeddings.T * 100
+            # Each document is charged an equal share of the batch's cleaning and encoding
+            shared_ms = (time.perf_counter() - started) * 1000 / len(docs)
+            for doc, resume_text, row in zip(docs, cleaned, similarity):
+                started = time.perf_counter()
+                rows = [self.scorer.calculate_ats_score(resume_text, job_text, doc['parsed'], semantic_score=float(score))
+                        for job_text, score in zip(self.job_texts, row)]
+                # score_ms is per analysis (resume x job), as in the app's export
+                score_ms = (shared_ms + (time.perf_counter() - started) * 1000) / len(rows)
+                self._results.put((doc, rows, score_ms))
+            self.counters['scored'] += len(docs)
+        self._results.put(None)
+
+    def _write_stage(self, sink: Callable[[str, List[Dict[str, Any]]], None]):
+        while True:
+            item = self._results.get()
+            if item is None:
+                return
+            doc, results, score_ms = item
+            if 'error' in doc:
+                self.counters['failed'] += 1
+                sink(doc['id'], [{'resume': doc['id'], 'error': doc['error']}])
+                continue
+            if self.text_store is not None:
+                self.text_store.append(doc['id'], doc['text'], doc['parsed'])
+            sink(doc['id'], output_rows(doc, self.job_ids, self.jd_hashes, results, score_ms))
+            self.counters['written'] += 1
+
+
+def print_progress(pipeline: BulkPipeline, elapsed: float):
+    counters = pipeline.counters
+    depths = pipeline.queue_depths()
+    rate = counters['written'] / max(elapsed, 1e-9)
+    sys.stderr.write(f"\r{counters['written']:>7} scored  {counters['failed']:>5} failed  {rate:>7.1f} docs/s  "
+                     f"queues: parsed={depths['parsed']:<4} results={depths['results']:<4} {elapsed:>7.1f}s")
+    sys.stderr.flush()
+
+
+def read_job_descriptions(paths: List[str]) -> Dict[str, str]:
+    """Job descriptions keyed by file name; directories contribute every .txt file inside"""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(os.path.join(path, name) for name in sorted(os.listdir(path)) if name.endswith('.txt'))
+        else:
+            files.append(path)
+    job_descriptions = {}
+    for file_path in files:
+        with open(file_path, encoding='utf-8', errors='ignore') as f:
+            job_descriptions[os.path.basename(file_path)] = f.read()
+    return job_descriptions
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Screen a directory or zip of resumes against job descriptions")
+    arg_parser.add_argument('resumes', help="Directory or .zip of PDF/DOCX/TXT resumes")
+    arg_parser.add_argument('--jd', nargs='+', required=True, help="Job description .txt files or directories")
+    arg_parser.add_argument('--output', default='bulk_results.jsonl')
+    arg_parser.add_argument('--mode', default='full', help="Scoring mode: fast, balanced or full")
+    arg_parser.add_argument('--keyword-model', default=None)
+    arg_parser.add_argument('--workers', type=int, default=None, help="Extraction processes (default: CPU count)")
+    arg_parser.add_argument('--batch-size', type=int, default=32)
+    arg_parser.add_argument('--queue-size', type=int, default=256)
+    arg_parser.add_argument('--text-store', default=None, help="Also append extracted text to this ResumeTextStore")
+    arg_parser.add_argument('--engine', choices=('threads', 'async'), default='threads',
+                            help="Staged thread pipeline, or the asyncio analyzer (no --text-store support)")
+    arg_parser.add_argument('--checkpoint', default=None,
+                            help="SQLite checkpoint for resuming an interrupted run (default: <output>.checkpoint)")
+    arg_parser.add_argument('--score-table', default=None,
+                            help="Also write component scores to this .npz for python -m utils.score_table")
+    arg_parser.add_argument('--export', default=None,
+                            help="Also export results to this partitioned Parquet dataset directory (needs pyarrow)")
+    args = arg_parser.parse_args()
+
+    job_descriptions = read_job_descriptions(args.jd)
+    if not job_descriptions:
+        arg_parser.error("No job descriptions found")
+    if args.engine == 'async' and args.text_store:
+        arg_parser.error("--text-store needs the threads engine")
+    scorer = ATSScorer(mode=args.mode, keyword_model_path=args.keyword_model)
+    text_store = ResumeTextStore(args.text_store) if args.text_store else None
+    pipeline = BulkPipeline(scorer, job_descriptions, workers=args.workers, batch_size=args.batch_size,
+                            queue_size=args.queue_size, text_store=text_store)
+
+    # Finished documents are checkpointed as they complete; a rerun with the same inputs,
+    # JDs and scorer configuration skips them and only scores what is left
+    checkpoint = BulkCheckpoint(args.checkpoint or args.output + '.checkpoint',
+                                run_key(job_descriptions, scorer.fingerprint()))
+    try:
+        documents = checkpoint.pending(iter_documents(args.resumes))
+        if args.engine == 'async':
+            from utils.async_pipeline import AsyncAnalyzer, run_bulk
+            analyzer = AsyncAnalyzer(scorer, workers=args.workers, max_concurrency=args.queue_size,
+                                     max_batch_size=args.batch_size)
+            try:
+                summary = asyncio.run(run_bulk(analyzer, documents, job_descriptions, checkpoint.record))
+            finally:
+                analyzer.close()
+        else:
+            summary = pipeline.run(documents, checkpoint.record, progress=print_progress)
+        with open(args.output, 'w', encoding='utf-8') as out:
+            for row in checkpoint.iter_rows():
+                out.write(json.dumps(row, ensure_ascii=False) + '\n')
+        if args.score_table:
+            table = ScoreTable()
+            table.extend(checkpoint.iter_rows())
+            table.save(args.score_table)
+        if args.export:
+            from utils.result_writer import ResultWriter, export_jsonl
+            with ResultWriter(args.export) as writer:
+                export_jsonl(args.output, writer)
+    finally:
+        checkpoint.close()
+        if text_store is not None:
+            text_store.close()
+
+    sys.stderr.write('\n')
+    print(f"Scored {summary['written']} resumes x {len(job_descriptions)} jobs ({summary['failed']} failed, "
+          f"{checkpoint.skipped} already done) in {summary['seconds']}s, "
+          f"{summary['documents_per_second']} docs/s -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
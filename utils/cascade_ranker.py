@@ -0,0 +1,133 @@
+import time
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from sklearn.feature_extraction.text import CountVectorizer
+
+from utils.ats_scorer import ATSScorer
+from utils.resume_parser import ResumeParser, skill_presence_matrix
+from utils.text_processor import TextProcessor
+
+# Relative weights of the components available before the full analysis (same ratios as calculate_ats_score)
+KEYWORD_WEIGHT = 0.25
+SKILLS_WEIGHT = 0.25
+SEMANTIC_WEIGHT = 0.20
+
+
+class CascadeRanker:
+    def __init__(self, scorer: ATSScorer, parser: Optional[ResumeParser] = None,
+                 text_processor: Optional[TextProcessor] = None, semantic_fraction: float = 0.2,
+                 min_semantic_candidates: int = 50, shortlist_size: int = 10):
+        self.scorer = scorer
+        self.parser = parser
+        self.text_processor = text_processor or TextProcessor()
+        # Stage sizes: share of the pool that reaches semantic scoring, and the final shortlist
+        self.semantic_fraction = semantic_fraction
+        self.min_semantic_candidates = min_semantic_candidates
+        self.shortlist_size = shortlist_size
+
+    def rank(self, candidates: List[Dict[str, str]], job_description: str) -> Dict[str, Any]:
+        """Rank candidates ({'id', 'text'}) against one JD through the three-stage cascade"""
+        stages = []
+        start = time.perf_counter()
+        cleaned_jd = self.text_processor.clean_text(job_description)
+
+        # Stage 1: keyword and skill overlap for the whole pool
+        t = time.perf_counter()
+        keyword_scores = self.keyword_prefilter([c['text'] for c in candidates], job_description)
+        skill_scores = self.skill_prefilter([c['text'] for c in candidates], job_description)
+        prefilter_scores = (keyword_scores * KEYWORD_WEIGHT + skill_scores * SKILLS_WEIGHT) / (
+            KEYWORD_WEIGHT + SKILLS_WEIGHT)
+        keep = max(self.min_semantic_candidates, int(np.ceil(len(candidates) * self.semantic_fraction)))
+        survivors = _top_indices(prefilter_scores, keep)
+        stages.append(_stage('prefilter', t, len(candidates), len(survivors)))
+
+        # Stage 2: one batched encoder call for the survivors
+        t = time.perf_counter()
+        cleaned = [self.text_processor.clean_text(candidates[i]['text']) for i in survivors]
+        semantic_scores = self.semantic_scores(cleaned, cleaned_jd)
+        stage2_scores = (
+            keyword_scores[survivors] * KEYWORD_WEIGHT +
+            skill_scores[survivors] * SKILLS_WEIGHT +
+            semantic_scores * SEMANTIC_WEIGHT
+        ) / (KEYWORD_WEIGHT + SKILLS_WEIGHT + SEMANTIC_WEIGHT)
+        order = _top_indices(stage2_scores, self.shortlist_size)
+        stages.append(_stage('semantic', t, len(survivors), len(order)))
+
+        # Stage 3: full analysis (spaCy parse, issues, suggestions, missing keywords) for the shortlist
+        t = time.perf_counter()
+        if self.parser is None:
+            self.parser = ResumeParser()
+        ranking = []
+        for position in order:
+            candidate = candidates[survivors[position]]
+            resume_data = self.parser.parse_resume(candidate['text'])
+            # Stage 2 already embedded these exact texts; reuse its similarity instead of encoding again
+            result = self.scorer.calculate_ats_score(cleaned[position], cleaned_jd, resume_data,
+                                                     semantic_score=float(semantic_scores[position]))
+            ranking.append({
+                'id': candidate['id'],
+                'overall_score': result['overall_score'],
+                'prefilter_score': round(float(prefilter_scores[survivors[position]]), 2),
+                'semantic_stage_score': round(float(stage2_scores[position]), 2),
+                'result': result,
+            })
+        ranking.sort(key=lambda r: r['overall_score'], reverse=True)
+        stages.append(_stage('full_analysis', t, len(order), len(ranking)))
+
+        return {
+            'ranking': ranking,
+            'stages': stages,
+            'total_seconds': round(time.perf_counter() - start, 4),
+        }
+
+    def keyword_prefilter(self, texts: List[str], job_description: str) -> np.ndarray:
+        """Share of the JD's distinct keywords present in each text, as one sparse product"""
+        engine = self.scorer.keyword_engine
+        if engine is not None:
+            # IDF-weighted match from the corpus-fitted model
+            return engine.score(job_description, engine.transform(texts))[0]
+
+        vectorizer = CountVectorizer(binary=True, stop_words=[w for w in self.scorer.stop_words if w.isalnum()],
+                                     token_pattern=r'(?u)\b[a-zA-Z0-9]+\b')
+        try:
+            vectorizer.fit([job_description])
+        except ValueError:
+            # JD has no usable keywords
+            return np.zeros(len(texts))
+        matrix = vectorizer.transform(texts)
+        return np.asarray(matrix.sum(axis=1)).ravel() / len(vectorizer.vocabulary_) * 100
+
+    def skill_prefilter(self, texts: List[str], job_description: str) -> np.ndarray:
+        """Share of the JD's known skills that each text mentions"""
+        jd_skills = skill_presence_matrix([job_description])[0]
+        if not jd_skills.any():
+            return np.zeros(len(texts))
+        matrix = skill_presence_matrix(texts)
+        return matrix[:, jd_skills].sum(axis=1) / jd_skills.sum() * 100
+
+    def semantic_scores(self, texts: List[str], job_description: str) -> np.ndarray:
+        """Cosine similarity of each text to the JD from a single batched encode"""
+        if not texts:
+            return np.zeros(0)
+        embeddings = np.asarray(self.scorer.semantic_model.encode(texts + [job_description], batch_size=32))
+        embeddings = embeddings / np.maximum(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12)
+        return embeddings[:-1] @ embeddings[-1] * 100
+
+
+def _top_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k highest scores, best first"""
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.zeros(0, dtype=int)
+    top = np.argpartition(-scores, k - 1)[:k]
+    return top[np.argsort(-scores[top], kind='stable')]
+
+
+def _stage(name: str, started: float, candidates_in: int, candidates_out: int) -> Dict[str, Any]:
+    return {
+        'stage': name,
+        'seconds': round(time.perf_counter() - started, 4),
+        'candidates_in': candidates_in,
+        'candidates_out': candidates_out,
+    }
@@ -0,0 +1,88 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Tuple
+
+# A failed document keeps its error row in the output but is tried again on the next run
+DONE, FAILED = 'done', 'failed'
+
+
+def run_key(job_descriptions: Dict[str, str], scorer_fingerprint: str) -> str:
+    """Identity of a bulk run: the exact JDs plus everything that determines the scores"""
+    jd_hashes = sorted((job_id, hashlib.sha256(text.encode('utf-8')).hexdigest())
+                       for job_id, text in job_descriptions.items())
+    payload = json.dumps({'jobs': jd_hashes, 'scorer': scorer_fingerprint}, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def _status(rows: List[Dict[str, Any]]) -> str:
+    return FAILED if any('error' in row for row in rows) else DONE
+
+
+class BulkCheckpoint:
+    def __init__(self, path: str, key: str, commit_every: int = 64):
+        # Results are committed every commit_every documents; anything uncommitted is simply redone
+        self.path = path
+        self.key = key
+        self.commit_every = commit_every
+        self.skipped = 0
+        self._uncommitted = 0
+        self._pending_hashes: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute('CREATE TABLE IF NOT EXISTS runs (run_key TEXT PRIMARY KEY, created_at REAL)')
+        self._conn.execute('CREATE TABLE IF NOT EXISTS documents ('
+                           'run_key TEXT, doc_id TEXT, doc_hash TEXT, rows TEXT, completed_at REAL, status TEXT, '
+                           'PRIMARY KEY (run_key, doc_id))')
+        self._conn.execute('INSERT OR IGNORE INTO runs VALUES (?, ?)', (key, time.time()))
+        self._conn.commit()
+
+    def completed(self) -> Dict[str, str]:
+        """doc id -> content hash of every document already scored in this run (failed ones excluded)"""
+        with self._lock:
+            return dict(self._conn.execute('SELECT doc_id, doc_hash FROM documents WHERE run_key = ? AND status = ?',
+                                           (self.key, DONE)))
+
+    def pending(self, documents: Iterator[Tuple[str, str, bytes]]) -> Iterator[Tuple[str, str, bytes]]:
+        """Pass through only documents that are new or whose content changed since they were scored"""
+        done = self.completed()
+        for doc_id, name, data in documents:
+            doc_hash = hashlib.sha256(data).hexdigest()
+            if done.get(doc_id) == doc_hash:
+                self.skipped += 1
+                continue
+            self._pending_hashes[doc_id] = doc_hash
+            yield doc_id, name, data
+
+    def record(self, doc_id: str, rows: List[Dict[str, Any]]):
+        """Store the output rows of one finished document; error rows mark it failed, to be retried"""
+        doc_hash = self._pending_hashes.pop(doc_id)
+        with self._lock:
+            self._conn.execute('INSERT OR REPLACE INTO documents VALUES (?, ?, ?, ?, ?, ?)',
+                               (self.key, doc_id, doc_hash, json.dumps(rows, ensure_ascii=False), time.time(),
+                                _status(rows)))
+            self._uncommitted += 1
+            if self._uncommitted >= self.commit_every:
+                self._commit()
+
+    def _commit(self):
+        self._conn.commit()
+        self._uncommitted = 0
+
+    def iter_rows(self) -> Iterator[Dict[str, Any]]:
+        """Every output row of the run, in completion order"""
+        with self._lock:
+            self._commit()
+        cursor = self._conn.cursor()
+        cursor.execute('SELECT rows FROM documents WHERE run_key = ? ORDER BY completed_at, doc_id', (self.key,))
+        for (rows,) in cursor:
+            yield from json.loads(rows)
+
+    def close(self):
+        with self._lock:
+            self._commit()
+            self._conn.close()
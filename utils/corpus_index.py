@@ -0,0 +1,312 @@
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from scipy import sparse
+
+from utils.embedding_store import CODEC_FILE_NAME, EmbeddingCodec, load_codec
+from utils.matrix_scorer import MatrixScorer
+from utils.text_processor import TextProcessor
+
+MANIFEST_NAME = 'manifest.json'
+# Row-aligned dense arrays a segment may hold besides the sparse keyword matrix
+DENSE_KEYS = ('embeddings', 'embedding_scales', 'skills')
+
+
+class Segment:
+    def __init__(self, segment_id: int, doc_ids: List[str], data: Dict[str, Any],
+                 deleted: Optional[np.ndarray] = None):
+        # Vectors are immutable once written; only the tombstone bitmap changes
+        self.segment_id = segment_id
+        self.doc_ids = list(doc_ids)
+        self.data = data  # {'embeddings', 'keywords', 'skills'} as produced by MatrixScorer.prepare_candidates
+        self.deleted = np.zeros(len(doc_ids), dtype=bool) if deleted is None else deleted
+
+    def __len__(self):
+        return len(self.doc_ids)
+
+    @property
+    def live_count(self) -> int:
+        return int(len(self.doc_ids) - self.deleted.sum())
+
+    def file_name(self) -> str:
+        return f'segment_{self.segment_id:06d}.npz'
+
+    def save(self, directory: str):
+        """Write the segment vectors (once) and its current tombstones"""
+        path = os.path.join(directory, self.file_name())
+        if not os.path.exists(path):
+            keywords = self.data['keywords'].tocsr()
+            tmp_path = path + '.tmp.npz'
+            dense = {key: self.data[key] for key in DENSE_KEYS if key in self.data}
+            np.savez(tmp_path, doc_ids=np.array(self.doc_ids, dtype=str),
+                     keyword_data=keywords.data, keyword_indices=keywords.indices,
+                     keyword_indptr=keywords.indptr, keyword_shape=np.array(keywords.shape), **dense)
+            os.replace(tmp_path, path)
+        self.save_tombstones(directory)
+
+    def save_tombstones(self, directory: str):
+        path = os.path.join(directory, self.file_name().replace('.npz', '.deleted.npy'))
+        tmp_path = path + '.tmp.npy'
+        np.save(tmp_path, self.deleted)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, directory: str, segment_id: int) -> 'Segment':
+        segment = cls(segment_id, [], {})
+        with np.load(os.path.join(directory, segment.file_name())) as f:
+            keywords = sparse.csr_matrix((f['keyword_data'], f['keyword_indices'], f['keyword_indptr']),
+                                         shape=tuple(f['keyword_shape']))
+            segment.doc_ids = f['doc_ids'].tolist()
+            segment.data = {key: f[key] for key in DENSE_KEYS if key in f.files}
+            segment.data['keywords'] = keywords
+        tombstones = os.path.join(directory, segment.file_name().replace('.npz', '.deleted.npy'))
+        segment.deleted = np.load(tombstones) if os.path.exists(tombstones) else np.zeros(len(segment), dtype=bool)
+        return segment
+
+    def remove_files(self, directory: str):
+        for name in (self.file_name(), self.file_name().replace('.npz', '.deleted.npy')):
+            path = os.path.join(directory, name)
+            if os.path.exists(path):
+                os.remove(path)
+
+
+class CorpusIndex:
+    def __init__(self, matrix_scorer: MatrixScorer, directory: Optional[str] = None,
+                 max_segments: int = 8, max_deleted_ratio: float = 0.3,
+                 codec: Optional[EmbeddingCodec] = None):
+        self.matrix_scorer = matrix_scorer
+        self.text_processor = TextProcessor()
+        self.directory = directory
+        # Optional float16/int8/PCA compression of stored embeddings; an index keeps the codec it was built with
+        self.codec = codec or load_codec(directory)
+        if self.codec is not None and self.codec.needs_fit:
+            raise ValueError("Fit the EmbeddingCodec PCA on corpus embeddings before building an index with it")
+        # Compaction triggers: too many segments, or a segment with too many tombstones
+        self.max_segments = max_segments
+        self.max_deleted_ratio = max_deleted_ratio
+        self.segments: Dict[int, Segment] = {}
+        self.locations: Dict[str, Tuple[int, int]] = {}  # doc id -> (segment id, row) of its live version
+        self.next_segment_id = 0
+        self._lock = threading.RLock()
+        self._compaction_lock = threading.Lock()
+        self._compactor = None
+        self._stop_compactor = threading.Event()
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+            if codec is not None:
+                self._check_codec(codec)
+                codec.save(os.path.join(directory, CODEC_FILE_NAME))
+            self._load()
+
+    def __len__(self):
+        return len(self.locations)
+
+    def _check_codec(self, codec: EmbeddingCodec):
+        # Stored segments were written with the saved codec (or uncompressed, if there is none);
+        # vectors in another format or PCA space would be scored as garbage
+        saved = load_codec(self.directory)
+        if saved is None and os.path.exists(os.path.join(self.directory, MANIFEST_NAME)):
+            saved = EmbeddingCodec()
+        if saved is not None and not codec.same_as(saved):
+            raise ValueError(f"Index at {self.directory} was built with embedding codec '{saved.describe()}', "
+                             f"not '{codec.describe()}'; open it without a codec or rebuild it")
+
+    def upsert(self, documents: List[Dict[str, str]]):
+        """Add new documents ({'id', 'text'}) or replace existing ones, as one new segment"""
+        if not documents:
+            return
+        # Keep only the last version of any id repeated within the batch
+        latest = {doc['id']: doc['text'] for doc in documents}
+        doc_ids = list(latest)
+        texts = list(latest.values())
+
+        # Encoding happens outside the lock so queries keep running
+        cleaned = [self.text_processor.clean_text(text) for text in texts]
+        data = self.matrix_scorer.prepare_candidates(cleaned, skill_texts=texts)
+        if self.codec is not None:
+            data.update(self.codec.compress(data['embeddings']))
+
+        with self._lock:
+            segment = Segment(self.next_segment_id, doc_ids, data)
+            self.next_segment_id += 1
+            touched = self._tombstone(doc_ids)
+            self.segments[segment.segment_id] = segment
+            for row, doc_id in enumerate(doc_ids):
+                self.locations[doc_id] = (segment.segment_id, row)
+            if self.directory:
+                # The new segment is made visible before the old versions are tombstoned: a crash in
+                # between leaves both live, and _load keeps the newest, rather than neither
+                segment.save(self.directory)
+                self._save_manifest()
+                for segment_id in touched:
+                    self.segments[segment_id].save_tombstones(self.directory)
+
+    def delete(self, doc_ids: List[str]):
+        """Tombstone documents; their rows are filtered at query time until compaction"""
+        with self._lock:
+            touched = self._tombstone(doc_ids)
+            for doc_id in doc_ids:
+                self.locations.pop(doc_id, None)
+            if self.directory:
+                for segment_id in touched:
+                    self.segments[segment_id].save_tombstones(self.directory)
+
+    def _tombstone(self, doc_ids: List[str]) -> set:
+        touched = set()
+        for doc_id in doc_ids:
+            location = self.locations.get(doc_id)
+            if location:
+                segment_id, row = location
+                self.segments[segment_id].deleted[row] = True
+                touched.add(segment_id)
+        return touched
+
+    def prepare_query(self, job_description: str) -> Dict[str, Any]:
+        """Embed and vectorise a JD once so it can be searched against any index or shard"""
+        jobs = self.matrix_scorer.prepare_jobs([self.text_processor.clean_text(job_description)],
+                                               skill_texts=[job_description])
+        if self.codec is not None:
+            # Queries stay float32 but share the stored vectors' PCA space
+            jobs['embeddings'] = self.codec.project(jobs['embeddings'])
+        return jobs
+
+    def search(self, job_description: str, top_k: int = 10) -> List[Dict[str, Any]]:
+        """Top-k live documents for a JD, merged across segments"""
+        return self.search_prepared(self.prepare_query(job_description), top_k)
+
+    def search_prepared(self, jobs: Dict[str, Any], top_k: int = 10) -> List[Dict[str, Any]]:
+        """Top-k live documents for a query built by prepare_query()"""
+        with self._lock:
+            segments = list(self.segments.values())
+            deleted = [segment.deleted.copy() for segment in segments]
+
+        candidates = []
+        for segment, segment_deleted in zip(segments, deleted):
+            if segment.live_count == 0:
+                continue
+            components = self.matrix_scorer.score_block(segment.data, jobs)
+            overall = components['overall'][:, 0]
+            overall[segment_deleted] = -np.inf
+            k = min(top_k, len(segment))
+            for row in np.argpartition(-overall, k - 1)[:k]:
+                if np.isfinite(overall[row]):
+                    candidates.append((float(overall[row]), segment.doc_ids[row], {
+                        name: round(float(scores[row, 0]), 2) for name, scores in components.items()
+                    }))
+
+        candidates.sort(key=lambda c: (-c[0], c[1]))
+        return [{'id': doc_id, **scores} for _, doc_id, scores in candidates[:top_k]]
+
+    def stats(self) -> Dict[str, Any]:
+        """Live/deleted document counts and segment layout"""
+        with self._lock:
+            total = sum(len(s) for s in self.segments.values())
+            return {
+                'live_documents': len(self.locations),
+                'deleted_rows': total - len(self.locations),
+                'segments': len(self.segments),
+                'rows_per_segment': [len(s) for s in self.segments.values()],
+            }
+
+    def needs_compaction(self) -> bool:
+        with self._lock:
+            if len(self.segments) > self.max_segments:
+                return True
+            return any(len(s) and s.deleted.mean() > self.max_deleted_ratio for s in self.segments.values())
+
+    def compact(self, force: bool = False) -> bool:
+        """Rewrite segments into one without tombstoned rows; returns True if anything changed"""
+        with self._compaction_lock:
+            if not force and not self.needs_compaction():
+                return False
+            with self._lock:
+                sources = list(self.segments.values())
+                if not sources:
+                    return False
+                snapshot = [segment.deleted.copy() for segment in sources]
+                new_id = self.next_segment_id
+                self.next_segment_id += 1
+
+            # Build the merged segment from the rows live at snapshot time, without holding the lock
+            keep = [np.flatnonzero(~mask) for mask in snapshot]
+            doc_ids = [s.doc_ids[row] for s, rows in zip(sources, keep) for row in rows]
+            data = {key: np.concatenate([s.data[key][rows] for s, rows in zip(sources, keep)])
+                    for key in DENSE_KEYS if key in sources[0].data}
+            data['keywords'] = sparse.vstack([s.data['keywords'][rows] for s, rows in zip(sources, keep)]).tocsr()
+            merged = Segment(new_id, doc_ids, data)
+
+            with self._lock:
+                # Carry over deletes/updates that happened while merging
+                new_row = 0
+                for segment, rows in zip(sources, keep):
+                    for row in rows:
+                        doc_id = segment.doc_ids[row]
+                        if self.locations.get(doc_id) == (segment.segment_id, row):
+                            self.locations[doc_id] = (new_id, new_row)
+                        else:
+                            merged.deleted[new_row] = True
+                        new_row += 1
+                for segment in sources:
+                    del self.segments[segment.segment_id]
+                # Keep the merged segment first so later segments stay newest
+                self.segments = {new_id: merged, **self.segments}
+
+                if self.directory:
+                    merged.save(self.directory)
+                    self._save_manifest()
+                    for segment in sources:
+                        segment.remove_files(self.directory)
+            return True
+
+    def start_background_compaction(self, interval: float = 30.0):
+        """Check the compaction policy every interval seconds on a daemon thread"""
+        if self._compactor is not None:
+            return
+        self._stop_compactor.clear()
+
+        def run():
+            while not self._stop_compactor.wait(interval):
+                self.compact()
+
+        self._compactor = threading.Thread(target=run, name="index-compactor", daemon=True)
+        self._compactor.start()
+
+    def stop_background_compaction(self):
+        if self._compactor is not None:
+            self._stop_compactor.set()
+            self._compactor.join()
+            self._compactor = None
+
+    def _save_manifest(self):
+        manifest = {
+            'segments': list(self.segments),
+            'next_segment_id': self.next_segment_id,
+            'updated_at': time.time(),
+        }
+        path = os.path.join(self.directory, MANIFEST_NAME)
+        with open(path + '.tmp', 'w') as f:
+            json.dump(manifest, f)
+        os.replace(path + '.tmp', path)
+
+    def _load(self):
+        path = os.path.join(self.directory, MANIFEST_NAME)
+        if not os.path.exists(path):
+            return
+        with open(path) as f:
+            manifest = json.load(f)
+        self.next_segment_id = manifest['next_segment_id']
+        for segment_id in manifest['segments']:
+            segment = Segment.load(self.directory, segment_id)
+            self.segments[segment_id] = segment
+            for row in np.flatnonzero(~segment.deleted):
+                doc_id = segment.doc_ids[row]
+                # Segments are listed oldest first; if an older version is still live (a write interrupted
+                # between the new segment and its tombstones), the newest one wins
+                previous = self.locations.get(doc_id)
+                if previous is not None:
+                    self.segments[previous[0]].deleted[previous[1]] = True
+                self.locations[doc_id] = (segment_id, int(row))
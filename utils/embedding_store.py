@@ -0,0 +1,120 @@
+import os
+from typing import Any, Dict, Optional
+
+import joblib
+import numpy as np
+
+EMBEDDING_DTYPES = ('float32', 'float16', 'int8')
+CODEC_FILE_NAME = 'embedding_codec.joblib'
+# Rows widened to float32 at a time when scoring int8/float16 vectors
+SIMILARITY_CHUNK_ROWS = 16384
+
+
+class EmbeddingCodec:
+    def __init__(self, dtype: str = 'float32', pca_dim: Optional[int] = None):
+        if dtype not in EMBEDDING_DTYPES:
+            raise ValueError(f"Unknown embedding dtype '{dtype}', expected one of {EMBEDDING_DTYPES}")
+        self.dtype = dtype
+        self.pca_dim = pca_dim
+        self.mean = None
+        self.components = None
+
+    @property
+    def needs_fit(self) -> bool:
+        return self.pca_dim is not None and self.components is None
+
+    def fit(self, embeddings: np.ndarray, max_samples: int = 100000) -> 'EmbeddingCodec':
+        """Fit the optional PCA projection on corpus embeddings"""
+        if self.pca_dim is None:
+            return self
+        sample = np.asarray(embeddings, dtype=np.float32)
+        if len(sample) > max_samples:
+            sample = sample[np.random.default_rng(42).choice(len(sample), max_samples, replace=False)]
+        self.mean = sample.mean(axis=0)
+        _, _, vt = np.linalg.svd(sample - self.mean, full_matrices=False)
+        self.components = vt[:self.pca_dim].astype(np.float32)
+        return self
+
+    def project(self, embeddings: np.ndarray) -> np.ndarray:
+        """Apply the PCA projection (if any) and re-normalise so dot products stay cosines"""
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        if self.pca_dim is None:
+            return embeddings
+        if self.components is None:
+            raise RuntimeError("EmbeddingCodec with PCA must be fitted before use")
+        projected = (embeddings - self.mean) @ self.components.T
+        return projected / np.maximum(np.linalg.norm(projected, axis=1, keepdims=True), 1e-12)
+
+    def compress(self, embeddings: np.ndarray) -> Dict[str, np.ndarray]:
+        """Stored form of unit-normalised embeddings: {'embeddings'} plus per-row 'embedding_scales' for int8"""
+        projected = self.project(embeddings)
+        if self.dtype == 'float16':
+            return {'embeddings': projected.astype(np.float16)}
+        if self.dtype == 'int8':
+            # Symmetric per-vector scalar quantization
+            scales = np.maximum(np.abs(projected).max(axis=1), 1e-12) / 127
+            codes = np.clip(np.rint(projected / scales[:, None]), -127, 127).astype(np.int8)
+            return {'embeddings': codes, 'embedding_scales': scales.astype(np.float32)}
+        return {'embeddings': projected}
+
+    def save(self, path: str):
+        joblib.dump(self, path)
+
+    @staticmethod
+    def load(path: str) -> 'EmbeddingCodec':
+        return joblib.load(path)
+
+    def same_as(self, other: Optional['EmbeddingCodec']) -> bool:
+        """True if other stores and projects vectors exactly like this codec"""
+        if other is None or (self.dtype, self.pca_dim) != (other.dtype, other.pca_dim):
+            return False
+        return all((a is None and b is None) or (a is not None and b is not None and np.array_equal(a, b))
+                   for a, b in ((self.mean, other.mean), (self.components, other.components)))
+
+    def describe(self) -> str:
+        return f"{self.dtype}" + (f" + PCA {self.pca_dim}" if self.pca_dim else "")
+
+
+def compressed_similarity(stored: Dict[str, Any], queries: np.ndarray, start: int = 0, stop: Optional[int] = None,
+                          chunk_rows: int = SIMILARITY_CHUNK_ROWS) -> np.ndarray:
+    """Cosine similarity of stored rows [start:stop] to float32 query rows, without decompressing the store"""
+    codes = stored['embeddings'][start:stop]
+    queries = np.asarray(queries, dtype=np.float32).T
+    if codes.dtype == np.float32:
+        scores = codes @ queries
+    else:
+        # int8/float16 rows are widened chunk_rows at a time, so a query never holds a float32 copy of the store
+        scores = np.empty((len(codes), queries.shape[1]), dtype=np.float32)
+        for offset in range(0, len(codes), chunk_rows):
+            block = codes[offset:offset + chunk_rows]
+            np.matmul(block.astype(np.float32), queries, out=scores[offset:offset + len(block)])
+    scales = stored.get('embedding_scales')
+    if scales is not None:
+        scores *= scales[start:stop, None]
+    return scores
+
+
+def bytes_per_vector(stored: Dict[str, Any]) -> float:
+    """Storage cost per embedding, including quantization scales"""
+    rows = len(stored['embeddings'])
+    if not rows:
+        return 0.0
+    total = stored['embeddings'].nbytes + (stored['embedding_scales'].nbytes if 'embedding_scales' in stored else 0)
+    return total / rows
+
+
+def recall_at_k(reference_scores: np.ndarray, approximate_scores: np.ndarray, k: int) -> float:
+    """Mean share of each query's exact top-k (rows = queries) that the approximate scores also rank in their top-k"""
+    k = min(k, reference_scores.shape[1])
+    exact = np.argpartition(-reference_scores, k - 1, axis=1)[:, :k]
+    approx = np.argpartition(-approximate_scores, k - 1, axis=1)[:, :k]
+    hits = [len(np.intersect1d(e, a)) for e, a in zip(exact, approx)]
+    return float(np.mean(hits) / k)
+
+
+def load_codec(directory: Optional[str]) -> Optional[EmbeddingCodec]:
+    """Codec saved alongside an index, if any"""
+    if not directory:
+        return None
+    path = os.path.join(directory, CODEC_FILE_NAME)
+    return EmbeddingCodec.load(path) if os.path.exists(path) else None
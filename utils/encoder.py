@@ -0,0 +1,33 @@
+from typing import Optional
+
+MODEL_NAME = 'all-MiniLM-L6-v2'
+
+# float32: the stock model; int8: Linear layers dynamically quantized for CPU inference
+INFERENCE_MODES = ('float32', 'int8')
+
+
+def set_num_threads(num_threads: Optional[int]):
+    """Set torch intra-op thread count (None keeps the torch default)"""
+    if not num_threads:
+        return
+    import torch
+    torch.set_num_threads(num_threads)
+
+
+def load_sentence_encoder(inference_mode: str = 'float32', num_threads: Optional[int] = None):
+    """Load the MiniLM sentence encoder in the requested inference mode"""
+    if inference_mode not in INFERENCE_MODES:
+        raise ValueError(f"Unknown inference mode '{inference_mode}', expected one of {INFERENCE_MODES}")
+
+    from sentence_transformers import SentenceTransformer
+
+    set_num_threads(num_threads)
+    model = SentenceTransformer(MODEL_NAME, device='cpu')
+
+    if inference_mode == 'int8':
+        import torch
+        # Weights are stored as int8 and activations quantized on the fly per batch;
+        # attention/embedding layers stay in float32
+        model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+    return model
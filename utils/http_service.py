@@ -0,0 +1,227 @@
+import argparse
+import io
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+
+from utils.ats_scorer import ATSScorer
+from utils.batching import MicroBatcher
+from utils.result_cache import ResultCache
+from utils.resume_parser import ResumeParser
+from utils.text_processor import TextProcessor
+
+DEFAULT_PORT = 8080
+# The service has no authentication, so it listens on loopback unless told otherwise
+DEFAULT_HOST = '127.0.0.1'
+MAX_BODY_BYTES = 10 * 1024 * 1024
+
+
+class _ServiceHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        if urlparse(self.path).path == '/health':
+            self._send_json(200, self.server.health())
+        else:
+            self._send_json(404, {'error': f'Unknown path {self.path}'})
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        routes = {'/extract': self._extract, '/parse': self._parse, '/score': self._score}
+        if url.path not in routes:
+            self.close_connection = True
+            self._send_json(404, {'error': f'Unknown path {url.path}'})
+            return
+        # Refuse work up front, before spending time and memory on the body
+        if not self.server.admit():
+            self._reject()
+            return
+        try:
+            body = self._read_body()
+            if body is None:
+                return
+            self._send_json(200, routes[url.path](body, parse_qs(url.query)))
+        except (ValueError, KeyError, TypeError) as e:
+            self._send_json(400, {'error': str(e)})
+        except Exception as e:
+            self._send_json(500, {'error': str(e)})
+        finally:
+            self.server.release()
+
+    def _read_body(self) -> Optional[bytes]:
+        """The request body, or None after answering 400/413 for an unusable Content-Length"""
+        try:
+            length = int(self.headers.get('Content-Length') or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            self.close_connection = True
+            self._send_json(400, {'error': 'Content-Length must be a non-negative integer'})
+            return None
+        if length > MAX_BODY_BYTES:
+            self.close_connection = True
+            self._send_json(413, {'error': f'Body exceeds {MAX_BODY_BYTES} bytes'})
+            return None
+        return self.rfile.read(length)
+
+    def _extract(self, body: bytes, query: Dict[str, list]) -> Dict[str, Any]:
+        return {'text': self.server.extract_text(_filename(query), body)}
+
+    def _parse(self, body: bytes, query: Dict[str, list]) -> Dict[str, Any]:
+        # Either a raw file (?filename=resume.pdf) or JSON {"text": ...}
+        text = self.server.extract_text(_filename(query), body) if 'filename' in query else _json(body)['text']
+        return self.server.parser.parse_resume(text)
+
+    def _score(self, body: bytes, query: Dict[str, list]) -> Dict[str, Any]:
+        request = _json(body)
+        return self.server.score(request['resume_text'], request['job_description'], request.get('resume_data'))
+
+    def _reject(self):
+        # The body is left unread, so the connection cannot carry another request
+        self.close_connection = True
+        retry_after = self.server.reject()
+        self._send_json(429, {'error': 'Service overloaded', 'retry_after': retry_after},
+                        headers={'Retry-After': str(retry_after)})
+
+    def _send_json(self, status: int, payload: Dict[str, Any], headers: Optional[Dict[str, str]] = None):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+def _filename(query: Dict[str, list]) -> str:
+    if 'filename' not in query:
+        raise ValueError("Pass the original file name as ?filename=resume.pdf")
+    return query['filename'][0]
+
+
+def _json(body: bytes) -> Dict[str, Any]:
+    try:
+        return json.loads(body)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Invalid JSON body: {e}")
+
+
+class ScoringService(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int] = (DEFAULT_HOST, DEFAULT_PORT), scorer: Optional[ATSScorer] = None,
+                 parser: Optional[ResumeParser] = None, max_in_flight: int = 64,
+                 max_batch_size: int = 64, max_wait_ms: float = 5.0, retry_after: int = 1, verbose: bool = False):
+        self.scorer = scorer or ATSScorer()
+        self.parser = parser or ResumeParser()
+        self.text_processor = TextProcessor()
+        # Concurrent score requests are coalesced into batched encoder calls. An admitted request queues at
+        # most one encoder request, so admission control is what bounds the queue
+        self.batcher = MicroBatcher(
+            lambda texts: self.scorer.semantic_model.encode(texts, batch_size=max_batch_size),
+            max_batch_size=max_batch_size, max_wait_ms=max_wait_ms, max_queue_size=max_in_flight)
+        # Admission control: at most max_in_flight requests are processed at once, the rest get 429
+        self.max_in_flight = max_in_flight
+        self.in_flight = 0
+        self.rejected = 0
+        self.retry_after = retry_after
+        self.verbose = verbose
+        self._lock = threading.Lock()
+        super().__init__(address, _ServiceHandler)
+
+    def admit(self) -> bool:
+        with self._lock:
+            if self.in_flight >= self.max_in_flight:
+                return False
+            self.in_flight += 1
+            return True
+
+    def release(self):
+        with self._lock:
+            self.in_flight -= 1
+
+    def reject(self) -> int:
+        """Count a turned-away request; returns the Retry-After hint in seconds"""
+        with self._lock:
+            self.rejected += 1
+        return self.retry_after
+
+    def extract_text(self, filename: str, data: bytes) -> str:
+        file = io.BytesIO(data)
+        file.name = filename
+        text = self.parser.extract_text(file)
+        if not text.strip():
+            raise ValueError(f"No text could be extracted from {filename}")
+        return text
+
+    def score(self, resume_text: str, job_description: str,
+              resume_data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """calculate_ats_score for one pair, as the app computes it"""
+        resume_data = resume_data or self.parser.parse_resume(resume_text)
+        cleaned_resume = self.text_processor.clean_text(resume_text)
+        cleaned_jd = self.text_processor.clean_text(job_description)
+        cached = self.scorer.cached_result(cleaned_resume, cleaned_jd, resume_data)
+        if cached is not None:
+            return cached
+        embeddings = np.asarray(self.batcher.encode([cleaned_resume, cleaned_jd]), dtype=np.float32)
+        norms = np.maximum(np.linalg.norm(embeddings, axis=1), 1e-12)
+        semantic_score = float(embeddings[0] @ embeddings[1] / (norms[0] * norms[1]) * 100)
+        return self.scorer.calculate_ats_score(cleaned_resume, cleaned_jd, resume_data, semantic_score=semantic_score)
+
+    def health(self) -> Dict[str, Any]:
+        """Queue depth, load and batching statistics"""
+        batches = self.batcher.batches_run
+        return {
+            'status': 'ok',
+            'queue_depth': self.batcher.queue_depth(),
+            'in_flight': self.in_flight,
+            'max_in_flight': self.max_in_flight,
+            'rejected': self.rejected,
+            'batches': batches,
+            'avg_batch_size': round(self.batcher.texts_encoded / batches, 2) if batches else 0.0,
+        }
+
+    def server_close(self):
+        super().server_close()
+        self.batcher.close()
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="HTTP/JSON resume extraction, parsing and ATS scoring service")
+    arg_parser.add_argument('--host', default=DEFAULT_HOST,
+                            help="Address to listen on; 0.0.0.0 exposes the unauthenticated API on every interface")
+    arg_parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    arg_parser.add_argument('--mode', default='full', help="Scoring mode: fast, balanced or full")
+    arg_parser.add_argument('--max-in-flight', type=int, default=64)
+    arg_parser.add_argument('--max-batch-size', type=int, default=64)
+    arg_parser.add_argument('--max-wait-ms', type=float, default=5.0)
+    arg_parser.add_argument('--verbose', action='store_true', help="Log every request")
+    args = arg_parser.parse_args()
+
+    result_cache = ResultCache(disk_path=os.environ.get('ATS_RESULT_CACHE'))
+    service = ScoringService((args.host, args.port), ATSScorer(mode=args.mode, result_cache=result_cache),
+                             max_in_flight=args.max_in_flight, max_batch_size=args.max_batch_size,
+                             max_wait_ms=args.max_wait_ms,
+                             verbose=args.verbose)
+    print(f"Serving on http://{args.host}:{args.port}")
+    try:
+        service.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(f"Shutting down: {service.health()}")
+        service.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+import hashlib
+import io
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from utils.ats_scorer import ATSScorer, SCORER_VERSION
+from utils.resume_parser import ResumeParser
+
+
+def _hash(*parts: Any) -> str:
+    return hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+class _LRU(OrderedDict):
+    def __init__(self, max_entries: int):
+        super().__init__()
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key: str, compute: Callable[[], Any]):
+        with self._lock:
+            if key in self:
+                self.move_to_end(key)
+                return self[key], False
+        # Computed outside the lock: two sessions may both miss on a key, but neither waits on the other
+        value = compute()
+        with self._lock:
+            self[key] = value
+            if len(self) > self.max_entries:
+                self.popitem(last=False)
+        return value, True
+
+
+class AnalysisCache:
+    def __init__(self, max_entries: int = 4096, max_embeddings: int = 1024, max_files: int = 32):
+        # One per server process: every session's analyzer reads and fills the same bounded LRUs
+        self.extracted = _LRU(max_files)  # upload hash -> extracted text
+        self.entities = _LRU(max_entries)  # block hash -> spaCy entities of that block
+        self.embeddings = _LRU(max_embeddings)  # encoder input hash -> embedding
+        self.components = _LRU(max_entries)  # (component, input hash) -> score
+
+
+class IncrementalAnalyzer:
+    def __init__(self, parser: ResumeParser, scorer: ATSScorer, cache: Optional[AnalysisCache] = None):
+        # One instance per user session, holding only what its last analysis looked like; the reusable
+        # work lives in cache, which sessions share so memory does not grow with the number of sessions
+        self.parser = parser
+        self.scorer = scorer
+        cache = cache or AnalysisCache()
+        self._extracted = cache.extracted
+        self._entities = cache.entities
+        self._embeddings = cache.embeddings
+        self._components = cache.components
+        self._previous_blocks: List[str] = []
+        self._previous_jd: Optional[str] = None
+        self.last_report: Dict[str, Any] = {}
+
+    def extract_text(self, data: bytes, filename: str) -> str:
+        """Extract text, skipping the PDF/DOCX pass when the same file is uploaded again"""
+        def extract():
+            file = io.BytesIO(data)
+            file.name = filename
+            return self.parser.extract_text(file)
+        return self._extracted.get_or_compute(_hash(filename, hashlib.sha256(data).hexdigest()), extract)[0]
+
+    def parse(self, text: str) -> Dict[str, Any]:
+        """parse_resume output, running spaCy only on the sections that changed since the last call"""
+        blocks = self.parser.split_blocks(text)
+        entities = {'persons': [], 'organizations': [], 'locations': [], 'dates': []}
+        reparsed = []
+        for name, block in blocks:
+            # NER runs per section, so an edit to one section leaves the others' entities reusable
+            block_entities, computed = self._entities.get_or_compute(
+                _hash(block), lambda: self.parser.extract_entities(self.parser.nlp(block)))
+            if computed:
+                reparsed.append(name)
+            for label, values in block_entities.items():
+                entities[label].extend(values)
+
+        block_hashes = [_hash(name, block) for name, block in blocks]
+        previous = set(self._previous_blocks)
+        self.last_report = {
+            'changed_sections': [name for (name, _), h in zip(blocks, block_hashes) if h not in previous],
+            'removed_sections': len(set(self._previous_blocks) - set(block_hashes)),
+            'reparsed_sections': reparsed,
+        }
+        self._previous_blocks = block_hashes
+
+        # The remaining extractors are regex passes over the text and cost far less than NER
+        return {
+            'text': text,
+            'emails': self.parser.extract_emails(text),
+            'phones': self.parser.extract_phones(text),
+            'urls': self.parser.extract_urls(text),
+            'skills': self.parser.extract_skills(text),
+            'education': self.parser.extract_education(text),
+            'experience': self.parser.extract_experience(text),
+            'entities': entities,
+            'sections': self.parser.identify_sections(text),
+        }
+
+    def _embedding_key(self, text: str) -> str:
+        # The encoder only sees the first max_seq_length tokens, so edits past that point
+        # cannot change the embedding; key on the tokens it actually reads when we can. The cache is
+        # shared by every scorer in the process, so the key also names the model and mode that encoded it
+        model = self.scorer.semantic_model
+        tokenizer = getattr(model, 'tokenizer', None)
+        max_length = getattr(model, 'max_seq_length', None)
+        if tokenizer is not None and max_length:
+            tokens = tokenizer(text, truncation=True, max_length=max_length)['input_ids']
+            return _hash(self.scorer.fingerprint(), tokens)
+        return _hash(self.scorer.fingerprint(), text)
+
+    def _embed(self, text: str) -> np.ndarray:
+        embedding, computed = self._embeddings.get_or_compute(
+            self._embedding_key(text), lambda: np.asarray(self.scorer.semantic_model.encode([text]))[0])
+        if computed:
+            self.last_report['embedded'] += 1
+        return embedding
+
+    def score(self, resume_text: str, job_description: str, resume_data: Dict[str, Any]) -> Dict[str, Any]:
+        """calculate_ats_score, recomputing only the components whose inputs changed"""
+        scorer = self.scorer
+        self.last_report.update({'jd_changed': job_description != self._previous_jd,
+                                 'embedded': 0, 'recomputed': [], 'reused': [], 'cached': False})
+        self._previous_jd = job_description
+
+        # The exact same analysis may already be stored, by this session or any other
+        cache_key = None
+        if scorer.result_cache is not None:
+            cache_key = scorer.result_key(resume_text, job_description, resume_data)
+            cached = scorer.result_cache.get(cache_key)
+            if cached is not None:
+                self.last_report['cached'] = True
+                return cached
+
+        def semantic():
+            resume_embedding, jd_embedding = self._embed(resume_text), self._embed(job_description)
+            norms = max(float(np.linalg.norm(resume_embedding) * np.linalg.norm(jd_embedding)), 1e-12)
+            return float(resume_embedding @ jd_embedding) / norms * 100
+
+        # Each component is keyed by exactly the inputs it reads
+        computations = {
+            'keyword': ((resume_text, job_description),
+                        lambda: scorer.calculate_keyword_match(resume_text, job_description)),
+            'semantic': ((resume_text, job_description), semantic),
+            'skills': ((resume_data.get('skills', []), job_description),
+                       lambda: scorer.calculate_skills_match(resume_data.get('skills', []), job_description)),
+            'experience': ((resume_data.get('experience', []),),
+                           lambda: scorer.evaluate_experience(resume_data.get('experience', []))),
+            'education': ((resume_data.get('education', []),),
+                          lambda: scorer.evaluate_education(resume_data.get('education', []))),
+            'format': ((bool(resume_data.get('emails')), bool(resume_data.get('phones')),
+                        sorted(resume_data.get('sections', {})), len(resume_data.get('text', ''))),
+                       lambda: scorer.evaluate_format(resume_data)),
+            'missing_keywords': ((resume_text, job_description),
+                                 lambda: scorer.find_missing_keywords(resume_text, job_description)),
+        }
+        values = {}
+        for name, (inputs, compute) in computations.items():
+            values[name], computed = self._components.get_or_compute(_hash(name, scorer.fingerprint(), inputs),
+                                                                     compute)
+            self.last_report['recomputed' if computed else 'reused'].append(name)
+
+        missing_keywords = list(values.pop('missing_keywords'))
+        result = scorer.assemble_result(values, resume_data, job_description, missing_keywords)
+        # Stored like calculate_ats_score's results, so other sessions and later rebuilds can reuse it
+        if cache_key is not None:
+            scorer.result_cache.put(cache_key, result, SCORER_VERSION)
+        return result
@@ -0,0 +1,216 @@
+import argparse
+import json
+import os
+import socket
+import socketserver
+import struct
+import threading
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from utils.batching import MicroBatcher
+from utils.encoder import INFERENCE_MODES, MODEL_NAME, load_sentence_encoder
+
+DEFAULT_SOCKET_PATH = '/tmp/ats-encoder.sock'
+
+# SentenceTransformer.encode options whose effect the client reproduces; batching is the server's call,
+# so batch_size and show_progress_bar are accepted and have nothing to change
+_ACCEPTED_ENCODE_OPTIONS = {'batch_size', 'show_progress_bar', 'convert_to_numpy', 'normalize_embeddings'}
+
+_HEADER = struct.Struct('!I')
+
+
+def send_frame(sock: socket.socket, payload: bytes):
+    """Send one length-prefixed frame"""
+    sock.sendall(_HEADER.pack(len(payload)) + payload)
+
+
+def recv_frame(sock: socket.socket) -> Optional[bytes]:
+    """Receive one length-prefixed frame, or None if the peer closed the connection"""
+    header = _recv_exact(sock, _HEADER.size)
+    if header is None:
+        return None
+    (length,) = _HEADER.unpack(header)
+    return _recv_exact(sock, length)
+
+
+def _recv_exact(sock: socket.socket, size: int) -> Optional[bytes]:
+    buf = bytearray()
+    while len(buf) < size:
+        chunk = sock.recv(size - len(buf))
+        if not chunk:
+            return None
+        buf.extend(chunk)
+    return bytes(buf)
+
+
+class _EncodeHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        # Connections are persistent; serve requests until the client hangs up
+        while True:
+            frame = recv_frame(self.request)
+            if frame is None:
+                return
+            try:
+                request = json.loads(frame)
+                if request.get('op') == 'ping':
+                    header, body = {'ok': True, **self.server.info()}, b''
+                else:
+                    embeddings = self.server.batcher.encode(request['texts'])
+                    embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
+                    header, body = {'ok': True, 'shape': list(embeddings.shape)}, embeddings.tobytes()
+            except Exception as e:
+                header, body = {'ok': False, 'error': str(e)}, b''
+            send_frame(self.request, json.dumps(header).encode('utf-8'))
+            send_frame(self.request, body)
+
+
+class InferenceServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path: str = DEFAULT_SOCKET_PATH, model=None,
+                 max_batch_size: int = 64, max_wait_ms: float = 5.0, inference_mode: str = 'float32',
+                 num_threads: Optional[int] = None):
+        if model is None:
+            model = load_sentence_encoder(inference_mode, num_threads)
+        self.model = model
+        self.model_name = MODEL_NAME
+        self.inference_mode = inference_mode
+        self.num_threads = num_threads
+        self.socket_path = socket_path
+        self.batcher = MicroBatcher(self._encode, max_batch_size, max_wait_ms)
+
+        # Remove a stale socket left behind by a previous run
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        super().__init__(socket_path, _EncodeHandler)
+
+    def info(self) -> Dict[str, Any]:
+        """What clients need to know the embeddings match a local model: model, inference mode and threads"""
+        return {'model': self.model_name, 'inference_mode': self.inference_mode, 'num_threads': self.num_threads}
+
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        return self.model.encode(texts, batch_size=self.batcher.max_batch_size)
+
+    def server_close(self):
+        super().server_close()
+        self.batcher.close()
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+    def stats(self) -> Dict[str, Any]:
+        """Batching statistics since start-up"""
+        batches = self.batcher.batches_run
+        return {
+            'batches': batches,
+            'texts': self.batcher.texts_encoded,
+            'avg_batch_size': round(self.batcher.texts_encoded / batches, 2) if batches else 0.0,
+        }
+
+
+class InferenceClient:
+    def __init__(self, socket_path: str = DEFAULT_SOCKET_PATH, timeout: float = 30.0):
+        self.socket_path = socket_path
+        self.timeout = timeout
+        # Filled in by ping(): the server's model, inference mode and thread count
+        self.server_info: Dict[str, Any] = {}
+        # One connection per thread so concurrent callers land in the same server batch
+        self._local = threading.local()
+
+    def _connection(self) -> socket.socket:
+        sock = getattr(self._local, 'sock', None)
+        if sock is None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            sock.connect(self.socket_path)
+            self._local.sock = sock
+        return sock
+
+    def _reset(self):
+        sock = getattr(self._local, 'sock', None)
+        if sock is not None:
+            sock.close()
+        self._local.sock = None
+
+    def _call(self, request: Dict[str, Any]):
+        payload = json.dumps(request).encode('utf-8')
+        # Retry once on a fresh connection in case the server restarted
+        for attempt in range(2):
+            try:
+                sock = self._connection()
+                send_frame(sock, payload)
+                header = recv_frame(sock)
+                body = recv_frame(sock)
+                if header is None or body is None:
+                    raise ConnectionError("Inference server closed the connection")
+                break
+            except OSError:
+                self._reset()
+                if attempt:
+                    raise
+        header = json.loads(header)
+        if not header.get('ok'):
+            raise RuntimeError(header.get('error', 'Inference server error'))
+        return header, body
+
+    def ping(self) -> Optional[Dict[str, Any]]:
+        """The server's model, inference mode and thread count, or None if it is not reachable"""
+        try:
+            header, _ = self._call({'op': 'ping'})
+        except Exception:
+            return None
+        self.server_info = {key: header.get(key) for key in ('model', 'inference_mode', 'num_threads')}
+        return self.server_info
+
+    def encode(self, sentences, convert_to_numpy: bool = True, normalize_embeddings: bool = False,
+               **kwargs) -> np.ndarray:
+        """Drop-in replacement for SentenceTransformer.encode (numpy output only)"""
+        unsupported = set(kwargs) - _ACCEPTED_ENCODE_OPTIONS
+        if unsupported or not convert_to_numpy:
+            options = sorted(unsupported) or ['convert_to_numpy=False']
+            raise TypeError(f"InferenceClient.encode does not support {', '.join(options)}")
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        header, body = self._call({'texts': texts})
+        embeddings = np.frombuffer(body, dtype=np.float32).reshape(header['shape'])
+        if normalize_embeddings:
+            embeddings = embeddings / np.maximum(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12)
+        return embeddings[0] if single else embeddings
+
+
+def connect_if_available(socket_path: Optional[str], inference_mode: str = 'float32') -> Optional[InferenceClient]:
+    """Return a client for a running inference server serving inference_mode, or None"""
+    if not socket_path or not os.path.exists(socket_path):
+        return None
+    client = InferenceClient(socket_path)
+    info = client.ping()
+    # A server running another model or precision would give different embeddings than a local load
+    if info is None or info['model'] != MODEL_NAME or info['inference_mode'] != inference_mode:
+        return None
+    return client
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Shared sentence encoder server")
+    arg_parser.add_argument('--socket', default=DEFAULT_SOCKET_PATH)
+    arg_parser.add_argument('--max-batch-size', type=int, default=64)
+    arg_parser.add_argument('--max-wait-ms', type=float, default=5.0)
+    arg_parser.add_argument('--inference-mode', choices=INFERENCE_MODES, default='float32')
+    arg_parser.add_argument('--threads', type=int, default=None, help="Intra-op thread count")
+    args = arg_parser.parse_args()
+
+    server = InferenceServer(args.socket, max_batch_size=args.max_batch_size, max_wait_ms=args.max_wait_ms,
+                             inference_mode=args.inference_mode, num_threads=args.threads)
+    print(f"Serving {server.model_name} ({server.inference_mode}) on {args.socket}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(f"Shutting down: {server.stats()}")
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
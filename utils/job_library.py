@@ -0,0 +1,170 @@
+import argparse
+import json
+import os
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from scipy import sparse
+
+from utils.ats_scorer import ATSScorer
+from utils.keyword_engine import KeywordEngine
+from utils.matrix_scorer import MatrixScorer
+from utils.resume_parser import SKILL_PATTERNS
+from utils.text_processor import TextProcessor
+
+DEFAULT_JOB_LIBRARY_DIR = os.path.join('data', 'job_library')
+MANIFEST_NAME = 'library.json'
+
+
+class JobLibrary:
+    def __init__(self, scorer: ATSScorer, jobs: Optional[List[Dict[str, str]]] = None,
+                 keyword_engine: Optional[KeywordEngine] = None):
+        self.scorer = scorer
+        self.text_processor = TextProcessor()
+        self.jobs: List[Dict[str, str]] = []  # {'id', 'title', 'text'}
+        self.keyword_engine = keyword_engine or scorer.keyword_engine
+        self.matrix_scorer = None
+        self.prepared = None
+        if jobs:
+            self.add_jobs(jobs)
+
+    def __len__(self):
+        return len(self.jobs)
+
+    def add_jobs(self, jobs: List[Dict[str, str]]):
+        """Add postings and recompile the library"""
+        self.jobs.extend(jobs)
+        self.compile()
+
+    def compile(self, refit_keywords: bool = False):
+        """Clean, embed and vectorise every posting once"""
+        cleaned = [self.text_processor.clean_text(job['text']) for job in self.jobs]
+        if self.keyword_engine is None or refit_keywords:
+            # No corpus model available: learn IDF weights from the postings themselves
+            self.keyword_engine = KeywordEngine(self.scorer.stop_words).fit(cleaned)
+        self.matrix_scorer = MatrixScorer(self.scorer, self.keyword_engine)
+        self.prepared = self.matrix_scorer.prepare_jobs(cleaned, skill_texts=[job['text'] for job in self.jobs])
+
+    def recommend(self, resume_text: str, resume_data: Dict, top_k: int = 5) -> List[Dict[str, Any]]:
+        """Best-fitting postings for one resume with per-component scores"""
+        if not self.jobs:
+            return []
+
+        # Resume is cleaned, embedded and vectorised exactly once
+        cleaned_resume = self.text_processor.clean_text(resume_text)
+        candidate = self.matrix_scorer.prepare_candidates([cleaned_resume], skill_texts=[resume_text])
+        components = self.matrix_scorer.score_block(candidate, self.prepared)
+
+        # Experience, education and format don't depend on the JD
+        experience = self.scorer.evaluate_experience(resume_data.get('experience', []))
+        education = self.scorer.evaluate_education(resume_data.get('education', []))
+        format_score = self.scorer.evaluate_format(resume_data)
+
+        weights = self.scorer.weights
+        overall = (
+            components['keyword'][0] * weights['keyword'] +
+            components['semantic'][0] * weights['semantic'] +
+            components['skills'][0] * weights['skills'] +
+            experience * weights['experience'] +
+            education * weights['education'] +
+            format_score * weights['format']
+        )
+
+        resume_skills = candidate['skills'][0] > 0
+        recommendations = []
+        for index in np.argsort(-overall, kind='stable')[:top_k]:
+            job_skills = self.prepared['skills'][index] > 0
+            recommendations.append({
+                'id': self.jobs[index]['id'],
+                'title': self.jobs[index]['title'],
+                'overall_score': round(float(overall[index]), 2),
+                'keyword_match_score': round(float(components['keyword'][0, index]), 2),
+                'semantic_similarity': round(float(components['semantic'][0, index]), 2),
+                'skills_score': round(float(components['skills'][0, index]), 2),
+                'experience_score': round(experience, 2),
+                'education_score': round(education, 2),
+                'format_score': round(format_score, 2),
+                'matched_skills': [SKILL_PATTERNS[i] for i in np.flatnonzero(job_skills & resume_skills)],
+                'missing_skills': [SKILL_PATTERNS[i] for i in np.flatnonzero(job_skills & ~resume_skills)],
+            })
+        return recommendations
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, str]]:
+        """Look up a posting by id"""
+        return next((job for job in self.jobs if job['id'] == job_id), None)
+
+    def save(self, directory: str = DEFAULT_JOB_LIBRARY_DIR):
+        """Persist postings together with their precompiled vectors"""
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, 'jobs.json'), 'w', encoding='utf-8') as f:
+            json.dump(self.jobs, f, indent=2)
+        self.keyword_engine.save(os.path.join(directory, 'keyword_idf.joblib'))
+        np.save(os.path.join(directory, 'embeddings.npy'), self.prepared['embeddings'])
+        np.save(os.path.join(directory, 'skills.npy'), self.prepared['skills'])
+        sparse.save_npz(os.path.join(directory, 'keyword_weights.npz'), self.prepared['keyword_weights'].tocsr())
+        # What the stored embeddings were encoded with; load() refuses a scorer that encodes differently
+        manifest = {
+            'scorer_fingerprint': self.scorer.fingerprint(),
+            'embedding_fingerprint': self.scorer.embedding_fingerprint(),
+            'semantic': self.scorer.semantic_config,
+            'embedding_dim': int(self.prepared['embeddings'].shape[1]),
+        }
+        with open(os.path.join(directory, MANIFEST_NAME), 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+
+    @classmethod
+    def load(cls, scorer: ATSScorer, directory: str = DEFAULT_JOB_LIBRARY_DIR) -> 'JobLibrary':
+        """Load a saved library without re-embedding the postings; raises ValueError if scorer encodes differently"""
+        manifest_path = os.path.join(directory, MANIFEST_NAME)
+        manifest = None
+        if os.path.exists(manifest_path):
+            with open(manifest_path, encoding='utf-8') as f:
+                manifest = json.load(f)
+        # Scores may be weighted differently, but vectors from another model or mode are not comparable
+        if manifest is None or manifest['embedding_fingerprint'] != scorer.embedding_fingerprint():
+            built_with = manifest['semantic'] if manifest else 'an unknown semantic model'
+            raise ValueError(f"Job library at {directory} was built with {built_with}, not "
+                             f"{scorer.semantic_config}; rebuild it with `python -m utils.job_library`")
+        with open(os.path.join(directory, 'jobs.json'), encoding='utf-8') as f:
+            jobs = json.load(f)
+        library = cls(scorer, keyword_engine=KeywordEngine.load(os.path.join(directory, 'keyword_idf.joblib')))
+        library.jobs = jobs
+        library.matrix_scorer = MatrixScorer(scorer, library.keyword_engine)
+        skills = np.load(os.path.join(directory, 'skills.npy'))
+        library.prepared = {
+            'embeddings': np.load(os.path.join(directory, 'embeddings.npy')),
+            'keyword_weights': sparse.load_npz(os.path.join(directory, 'keyword_weights.npz')).tocsr(),
+            'skills': skills,
+            'skill_counts': (skills > 0).sum(axis=1),
+        }
+        return library
+
+
+def read_job_files(directory: str) -> List[Dict[str, str]]:
+    """Read .txt job descriptions; the first non-empty line is used as the title"""
+    jobs = []
+    for name in sorted(os.listdir(directory)):
+        if not name.endswith('.txt'):
+            continue
+        with open(os.path.join(directory, name), encoding='utf-8', errors='ignore') as f:
+            text = f.read()
+        title = next((line.strip() for line in text.splitlines() if line.strip()), name)
+        jobs.append({'id': os.path.splitext(name)[0], 'title': title, 'text': text})
+    return jobs
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Build the job description library used for recommendations")
+    arg_parser.add_argument('jobs_dir', help="Directory of job description .txt files")
+    arg_parser.add_argument('--output', default=DEFAULT_JOB_LIBRARY_DIR)
+    arg_parser.add_argument('--keyword-model', default=None, help="Corpus keyword model (default: fit on the jobs)")
+    args = arg_parser.parse_args()
+
+    scorer = ATSScorer(keyword_model_path=args.keyword_model)
+    library = JobLibrary(scorer, read_job_files(args.jobs_dir))
+    library.save(args.output)
+    print(f"Compiled {len(library)} job descriptions -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
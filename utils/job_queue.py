@@ -0,0 +1,235 @@
+import argparse
+import functools
+import io
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from utils.ats_scorer import ATSScorer
+from utils.resume_parser import ResumeParser
+from utils.text_processor import TextProcessor
+
+DEFAULT_QUEUE_PATH = os.path.join('data', 'jobs.db')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'queued',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    available_at REAL NOT NULL,
+    lease_owner TEXT,
+    lease_expires REAL,
+    result TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_ready ON jobs (status, available_at);
+"""
+
+
+class JobQueue:
+    def __init__(self, path: str = DEFAULT_QUEUE_PATH, lease_seconds: float = 300.0,
+                 max_attempts: int = 3, retry_delay: float = 10.0):
+        # A job leased but not acked within lease_seconds is handed to another worker
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        # SQLite connections must not cross threads or forks, so each thread opens its own
+        self._local = threading.local()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._connection().executescript(_SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=30.0, isolation_level=None)
+            # WAL lets workers read while one of them writes; leases are short write transactions
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    def enqueue(self, payloads: List[Dict[str, Any]]) -> List[int]:
+        """Add jobs; returns their ids"""
+        now = time.time()
+        conn = self._connection()
+        ids = []
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            for payload in payloads:
+                cursor = conn.execute('INSERT INTO jobs (payload, available_at, created_at, updated_at) '
+                                      'VALUES (?, ?, ?, ?)', (json.dumps(payload), now, now, now))
+                ids.append(cursor.lastrowid)
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        return ids
+
+    def lease(self, worker_id: str, batch_size: int = 1) -> List[Dict[str, Any]]:
+        """Claim up to batch_size ready jobs, including ones whose previous lease expired"""
+        now = time.time()
+        conn = self._connection()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            # Jobs whose lease ran out on their last allowed attempt are not retried again
+            conn.execute("UPDATE jobs SET status = 'failed', error = 'Lease expired', updated_at = ? "
+                         "WHERE status = 'leased' AND lease_expires < ? AND attempts >= ?",
+                         (now, now, self.max_attempts))
+            rows = conn.execute("SELECT id, payload, attempts FROM jobs "
+                                "WHERE (status = 'queued' AND available_at <= ?) "
+                                "OR (status = 'leased' AND lease_expires < ?) "
+                                "ORDER BY id LIMIT ?", (now, now, batch_size)).fetchall()
+            conn.executemany("UPDATE jobs SET status = 'leased', lease_owner = ?, lease_expires = ?, "
+                             "attempts = attempts + 1, updated_at = ? WHERE id = ?",
+                             [(worker_id, now + self.lease_seconds, now, job_id) for job_id, _, _ in rows])
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        return [{'id': job_id, 'payload': json.loads(payload), 'attempt': attempts + 1}
+                for job_id, payload, attempts in rows]
+
+    def ack(self, job_id: int, worker_id: str, result: Dict[str, Any]) -> bool:
+        """Mark a leased job done; False if the lease was lost to another worker meanwhile"""
+        cursor = self._connection().execute(
+            "UPDATE jobs SET status = 'done', result = ?, error = NULL, lease_owner = NULL, updated_at = ? "
+            "WHERE id = ? AND status = 'leased' AND lease_owner = ?",
+            (json.dumps(result, ensure_ascii=False), time.time(), job_id, worker_id))
+        return cursor.rowcount == 1
+
+    def fail(self, job_id: int, worker_id: str, error: str) -> bool:
+        """Release a leased job for retry with exponential backoff, or fail it after max_attempts"""
+        now = time.time()
+        cursor = self._connection().execute(
+            "UPDATE jobs SET "
+            "status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'queued' END, "
+            "available_at = ? + ? * (1 << (attempts - 1)), "
+            "error = ?, lease_owner = NULL, updated_at = ? "
+            "WHERE id = ? AND status = 'leased' AND lease_owner = ?",
+            (self.max_attempts, now, self.retry_delay, error, now, job_id, worker_id))
+        return cursor.rowcount == 1
+
+    def get(self, job_id: int) -> Optional[Dict[str, Any]]:
+        row = self._connection().execute('SELECT status, attempts, result, error FROM jobs WHERE id = ?',
+                                         (job_id,)).fetchone()
+        if row is None:
+            return None
+        status, attempts, result, error = row
+        return {'id': job_id, 'status': status, 'attempts': attempts,
+                'result': json.loads(result) if result else None, 'error': error}
+
+    def stats(self) -> Dict[str, int]:
+        """Number of jobs in each status"""
+        counts = dict(self._connection().execute('SELECT status, COUNT(*) FROM jobs GROUP BY status'))
+        return {status: counts.get(status, 0) for status in ('queued', 'leased', 'done', 'failed')}
+
+
+def score_jobs(jobs: List[Dict[str, Any]], parser: ResumeParser, scorer: ATSScorer,
+               text_processor: TextProcessor) -> List[Any]:
+    """Score a leased batch with one encoder call; returns a result dict or an Exception per job"""
+    outcomes, prepared = [], []
+    for job in jobs:
+        try:
+            payload = job['payload']
+            if 'resume_text' in payload:
+                text = payload['resume_text']
+            else:
+                with open(payload['resume_path'], 'rb') as f:
+                    file = io.BytesIO(f.read())
+                file.name = os.path.basename(payload['resume_path'])
+                text = parser.extract_text(file)
+            if not text.strip():
+                raise ValueError("No text could be extracted")
+            resume_data = payload.get('resume_data') or parser.parse_resume(text)
+            prepared.append((len(outcomes), text_processor.clean_text(text),
+                             text_processor.clean_text(payload['job_description']), resume_data))
+            outcomes.append(None)
+        except Exception as e:
+            outcomes.append(e)
+    if not prepared:
+        return outcomes
+
+    texts = [resume for _, resume, _, _ in prepared] + [jd for _, _, jd, _ in prepared]
+    embeddings = np.asarray(scorer.semantic_model.encode(texts, batch_size=64), dtype=np.float32)
+    embeddings /= np.maximum(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12)
+    similarity = np.sum(embeddings[:len(prepared)] * embeddings[len(prepared):], axis=1) * 100
+    for (position, resume, jd, resume_data), score in zip(prepared, similarity):
+        try:
+            outcomes[position] = scorer.calculate_ats_score(resume, jd, resume_data, semantic_score=float(score))
+        except Exception as e:
+            outcomes[position] = e
+    return outcomes
+
+
+def run_worker(worker_id: int, parser: ResumeParser, scorer: ATSScorer, queue_path: str = DEFAULT_QUEUE_PATH,
+               batch_size: int = 16, poll_interval: float = 1.0, lease_seconds: float = 300.0):
+    """Drain the queue forever with warm models; fits PreforkServer's worker_fn signature via functools.partial"""
+    job_queue = JobQueue(queue_path, lease_seconds=lease_seconds)
+    text_processor = TextProcessor()
+    owner = f'{os.uname().nodename}:{os.getpid()}:{worker_id}'
+    while True:
+        jobs = job_queue.lease(owner, batch_size)
+        if not jobs:
+            time.sleep(poll_interval)
+            continue
+        for job, outcome in zip(jobs, score_jobs(jobs, parser, scorer, text_processor)):
+            if isinstance(outcome, Exception):
+                job_queue.fail(job['id'], owner, f'{type(outcome).__name__}: {outcome}')
+            else:
+                job_queue.ack(job['id'], owner, outcome)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Durable SQLite screening queue and its workers")
+    arg_parser.add_argument('--db', default=DEFAULT_QUEUE_PATH)
+    commands = arg_parser.add_subparsers(dest='command', required=True)
+
+    enqueue = commands.add_parser('enqueue', help="Queue resume files against a job description")
+    enqueue.add_argument('job_description')
+    enqueue.add_argument('resumes', nargs='+', help="PDF/DOCX/TXT resume files")
+
+    work = commands.add_parser('work', help="Run pre-forked workers that drain the queue")
+    work.add_argument('--workers', type=int, default=4)
+    work.add_argument('--batch-size', type=int, default=16)
+    work.add_argument('--lease-seconds', type=float, default=300.0)
+
+    status = commands.add_parser('status', help="Show queue counts, or one job's result")
+    status.add_argument('job_id', nargs='?', type=int)
+
+    args = arg_parser.parse_args()
+    job_queue = JobQueue(args.db)
+
+    if args.command == 'enqueue':
+        with open(args.job_description, encoding='utf-8', errors='ignore') as f:
+            job_description = f.read()
+        ids = job_queue.enqueue([{'resume_path': os.path.abspath(path), 'job_description': job_description}
+                                 for path in args.resumes])
+        print(f"Queued {len(ids)} jobs ({ids[0]}-{ids[-1]})")
+    elif args.command == 'work':
+        # Workers share one warm copy of the models; start more `work` processes to scale out
+        from utils.prefork import PreforkServer
+        worker_fn = functools.partial(run_worker, queue_path=args.db, batch_size=args.batch_size,
+                                      lease_seconds=args.lease_seconds)
+        server = PreforkServer(worker_fn, args.workers)
+        server.start()
+        print(f"{args.workers} workers draining {args.db}")
+        server.serve_forever()
+    elif args.job_id is not None:
+        print(json.dumps(job_queue.get(args.job_id), indent=2, ensure_ascii=False))
+    else:
+        print(job_queue.stats())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+import argparse
+import os
+from typing import Iterable, List, Optional, Tuple
+
+import joblib
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import CountVectorizer
+
+from utils.lsa_model import load_corpus
+
+DEFAULT_KEYWORD_MODEL_PATH = os.path.join('models', 'keyword_idf.joblib')
+TOKEN_PATTERN = r'(?u)\b[a-zA-Z0-9]+\b'
+
+
+class KeywordEngine:
+    def __init__(self, stop_words: Optional[Iterable[str]] = None, min_df: int = 1, max_df: float = 1.0):
+        stop_words = sorted(w for w in (stop_words or []) if w.isalnum()) or 'english'
+        # Binary presence per document; IDF weights are kept separately so JDs can use term frequency
+        self.vectorizer = CountVectorizer(binary=True, token_pattern=TOKEN_PATTERN, stop_words=stop_words,
+                                          min_df=min_df, max_df=max_df, dtype=np.float32)
+        self.idf = None
+        self.num_documents = 0
+
+    def fit(self, corpus: List[str]) -> 'KeywordEngine':
+        """Learn the vocabulary and IDF weights from a resume/JD corpus"""
+        presence = self.vectorizer.fit_transform(corpus)
+        document_freq = np.asarray(presence.sum(axis=0)).ravel()
+        self.num_documents = presence.shape[0]
+        # Smoothed IDF, as in scikit-learn's TfidfTransformer
+        self.idf = (np.log((1 + self.num_documents) / (1 + document_freq)) + 1).astype(np.float32)
+        return self
+
+    @property
+    def vocabulary(self) -> np.ndarray:
+        return self.vectorizer.get_feature_names_out()
+
+    def transform(self, texts: List[str]) -> sparse.csr_matrix:
+        """Binary CSR term-presence matrix (documents x vocabulary)"""
+        return self.vectorizer.transform(texts).tocsr()
+
+    def jd_weights(self, job_description: str) -> np.ndarray:
+        """Dense weight per vocabulary term: sublinear JD term frequency x IDF"""
+        if self.idf is None:
+            raise RuntimeError("KeywordEngine must be fitted before scoring")
+        analyzer = self.vectorizer.build_analyzer()
+        vocabulary = self.vectorizer.vocabulary_
+        counts = np.zeros(len(self.idf), dtype=np.float32)
+        for token in analyzer(job_description):
+            index = vocabulary.get(token)
+            if index is not None:
+                counts[index] += 1
+        weights = np.zeros_like(counts)
+        present = counts > 0
+        weights[present] = (1 + np.log(counts[present])) * self.idf[present]
+        return weights
+
+    def score(self, job_description: str, resume_matrix: sparse.csr_matrix,
+              top_missing: int = 15) -> Tuple[np.ndarray, List[List[str]]]:
+        """Weighted keyword match (0-100) and top-weighted missing JD terms for every resume row"""
+        weights = self.jd_weights(job_description)
+        total = weights.sum()
+        if total == 0:
+            return np.zeros(resume_matrix.shape[0]), [[] for _ in range(resume_matrix.shape[0])]
+
+        # One sparse matrix-vector product scores every candidate
+        scores = resume_matrix @ weights / total * 100
+
+        # JD terms by descending weight; presence of just those columns decides what's missing
+        jd_terms = np.flatnonzero(weights)
+        jd_terms = jd_terms[np.argsort(-weights[jd_terms], kind='stable')]
+        present = resume_matrix[:, jd_terms].toarray() > 0
+        vocabulary = self.vocabulary
+        missing = []
+        for row in present:
+            missing.append(vocabulary[jd_terms[~row][:top_missing]].tolist())
+        return np.asarray(scores).ravel(), missing
+
+    def score_text(self, resume: str, job_description: str, top_missing: int = 15) -> Tuple[float, List[str]]:
+        """Single resume/JD convenience wrapper around score()"""
+        scores, missing = self.score(job_description, self.transform([resume]), top_missing)
+        return float(scores[0]), missing[0]
+
+    def save(self, path: str = DEFAULT_KEYWORD_MODEL_PATH):
+        """Persist vocabulary and IDF weights"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        joblib.dump(self, path)
+
+    @staticmethod
+    def load(path: Optional[str] = None) -> 'KeywordEngine':
+        """Load an engine saved with save()"""
+        path = path or DEFAULT_KEYWORD_MODEL_PATH
+        if not os.path.exists(path):
+            raise FileNotFoundError(
+                f"No keyword model at {path}; fit one with: python -m utils.keyword_engine <corpus files or dirs>"
+            )
+        return joblib.load(path)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Fit the corpus IDF keyword model")
+    arg_parser.add_argument('corpus', nargs='+', help=".txt files, directories or JSON files of resumes/JDs")
+    arg_parser.add_argument('--output', default=DEFAULT_KEYWORD_MODEL_PATH)
+    arg_parser.add_argument('--min-df', type=int, default=1)
+    args = arg_parser.parse_args()
+
+    from nltk.corpus import stopwords
+    corpus = load_corpus(args.corpus)
+    engine = KeywordEngine(stopwords.words('english'), min_df=args.min_df).fit(corpus)
+    engine.save(args.output)
+    print(f"Fitted keyword model ({len(engine.idf)} terms) on {len(corpus)} documents -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
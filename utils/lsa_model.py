@@ -0,0 +1,101 @@
+import argparse
+import hashlib
+import json
+import os
+from typing import List, Optional
+
+import joblib
+import numpy as np
+from sklearn.decomposition import TruncatedSVD
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.preprocessing import normalize
+
+DEFAULT_LSA_MODEL_PATH = os.path.join('models', 'lsa_model.joblib')
+
+
+class LSAModel:
+    def __init__(self, n_components: int = 128, max_features: int = 20000):
+        self.n_components = n_components
+        self.vectorizer = TfidfVectorizer(max_features=max_features, stop_words='english',
+                                          sublinear_tf=True, ngram_range=(1, 2), min_df=1)
+        self.svd = None
+
+    def fit(self, corpus: List[str]) -> 'LSAModel':
+        """Fit TF-IDF and the truncated SVD projection on a resume/JD corpus"""
+        tfidf = self.vectorizer.fit_transform(corpus)
+        # TruncatedSVD needs fewer components than both documents and terms
+        n_components = max(1, min(self.n_components, tfidf.shape[0] - 1, tfidf.shape[1] - 1))
+        self.svd = TruncatedSVD(n_components=n_components, random_state=42)
+        self.svd.fit(tfidf)
+        return self
+
+    def encode(self, sentences, **kwargs) -> np.ndarray:
+        """Project texts into the unit-normalised LSA space (same call shape as SentenceTransformer.encode)"""
+        if self.svd is None:
+            raise RuntimeError("LSAModel must be fitted before encoding")
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        vectors = normalize(self.svd.transform(self.vectorizer.transform(texts)))
+        vectors = vectors.astype(np.float32)
+        return vectors[0] if single else vectors
+
+    def fingerprint(self) -> str:
+        """Hash of the fitted IDF weights and SVD components, which fully determine encode()"""
+        if self.svd is None:
+            raise RuntimeError("LSAModel must be fitted before fingerprinting")
+        digest = hashlib.sha256(np.ascontiguousarray(self.svd.components_).tobytes())
+        digest.update(np.ascontiguousarray(self.vectorizer.idf_).tobytes())
+        return digest.hexdigest()
+
+    def save(self, path: str = DEFAULT_LSA_MODEL_PATH):
+        """Persist the fitted model"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        joblib.dump(self, path)
+
+    @staticmethod
+    def load(path: Optional[str] = None) -> 'LSAModel':
+        """Load a model saved with save()"""
+        path = path or DEFAULT_LSA_MODEL_PATH
+        if not os.path.exists(path):
+            raise FileNotFoundError(
+                f"No LSA model at {path}; fit one with: python -m utils.lsa_model <corpus files or dirs>"
+            )
+        return joblib.load(path)
+
+
+def load_corpus(paths: List[str]) -> List[str]:
+    """Read .txt files (or directories of them) and JSON lists/dicts of texts"""
+    texts = []
+    for path in paths:
+        if os.path.isdir(path):
+            names = sorted(os.listdir(path))
+            texts.extend(load_corpus([os.path.join(path, n) for n in names if n.endswith(('.txt', '.json'))]))
+        elif path.endswith('.json'):
+            with open(path, encoding='utf-8') as f:
+                data = json.load(f)
+            if isinstance(data, dict):
+                data = [text for values in data.values() for text in values]
+            texts.extend(data)
+        else:
+            with open(path, encoding='utf-8', errors='ignore') as f:
+                texts.append(f.read())
+    return texts
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Fit the LSA model used by the 'fast' scoring mode")
+    arg_parser.add_argument('corpus', nargs='+', help=".txt files, directories or JSON files of resumes/JDs")
+    arg_parser.add_argument('--output', default=DEFAULT_LSA_MODEL_PATH)
+    arg_parser.add_argument('--components', type=int, default=128)
+    args = arg_parser.parse_args()
+
+    corpus = load_corpus(args.corpus)
+    model = LSAModel(n_components=args.components).fit(corpus)
+    model.save(args.output)
+    print(f"Fitted LSA model ({model.svd.n_components} components) on {len(corpus)} documents -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
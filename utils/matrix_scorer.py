@@ -0,0 +1,182 @@
+import argparse
+import json
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from scipy import sparse
+
+from utils.ats_scorer import ATSScorer, SCORE_WEIGHTS
+from utils.embedding_store import compressed_similarity
+from utils.keyword_engine import KeywordEngine
+from utils.resume_parser import skill_presence_matrix
+
+# JD-dependent components; their calculate_ats_score weights are renormalised to sum to 1
+JD_COMPONENTS = ('keyword', 'semantic', 'skills')
+
+
+def component_weights(weights: Dict[str, float]) -> Dict[str, float]:
+    """The JD-dependent part of a full set of score weights"""
+    return {name: weights[name] for name in JD_COMPONENTS}
+
+
+class MatrixScorer:
+    def __init__(self, scorer: ATSScorer, keyword_engine: Optional[KeywordEngine] = None,
+                 block_size: int = 2048, weights: Optional[Dict[str, float]] = None):
+        self.scorer = scorer
+        self.keyword_engine = keyword_engine or scorer.keyword_engine
+        if self.keyword_engine is None:
+            raise ValueError("MatrixScorer needs a fitted KeywordEngine (see utils/keyword_engine.py)")
+        # Candidates are scored against all jobs block_size rows at a time to bound memory
+        self.block_size = block_size
+        # The scorer's own weights, so rankings agree with its calculate_ats_score
+        weights = weights or component_weights(scorer.weights if scorer is not None else SCORE_WEIGHTS)
+        # All-zero weights (a scorer weighting only JD-independent components) leave every pair at 0
+        total = sum(weights.values()) or 1.0
+        self.weights = {name: value / total for name, value in weights.items()}
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        """Unit-normalised float32 embeddings"""
+        embeddings = np.asarray(self.scorer.semantic_model.encode(texts, batch_size=64), dtype=np.float32)
+        return embeddings / np.maximum(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12)
+
+    def prepare_jobs(self, job_descriptions: List[str], skill_texts: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Precompute everything job-side: embeddings, keyword weights and skill bitsets"""
+        keyword_weights = sparse.csr_matrix(np.vstack([self.keyword_engine.jd_weights(jd) for jd in job_descriptions]))
+        totals = np.asarray(keyword_weights.sum(axis=1)).ravel()
+        # Skills are matched on raw text when given, since cleaning strips the '+' and '/' in 'c++' and 'ci/cd'
+        skills = skill_presence_matrix(skill_texts or job_descriptions)
+        return {
+            'embeddings': self.encode(job_descriptions),
+            # Row-normalised so a resume presence row times its transpose is the weighted match fraction
+            'keyword_weights': sparse.diags(1 / np.maximum(totals, 1e-12)) @ keyword_weights,
+            'skills': skills.astype(np.float32),
+            'skill_counts': skills.sum(axis=1),
+        }
+
+    def prepare_candidates(self, resume_texts: List[str], skill_texts: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Precompute candidate-side embeddings, keyword presence and skill bitsets"""
+        return {
+            'embeddings': self.encode(resume_texts),
+            'keywords': self.keyword_engine.transform(resume_texts),
+            'skills': skill_presence_matrix(skill_texts or resume_texts).astype(np.float32),
+        }
+
+    def score_block(self, candidates: Dict[str, Any], jobs: Dict[str, Any],
+                    start: int = 0, stop: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """Component and combined score matrices (candidates[start:stop] x jobs), each 0-100"""
+        stop = candidates['embeddings'].shape[0] if stop is None else stop
+        # Works on float32, float16 or int8 (+ scales) candidate embeddings as stored
+        semantic = compressed_similarity(candidates, jobs['embeddings'], start, stop) * 100
+        keyword = (candidates['keywords'][start:stop] @ jobs['keyword_weights'].T).toarray() * 100
+        # Skill intersection counts divided by the number of skills each job asks for
+        skill_hits = candidates['skills'][start:stop] @ jobs['skills'].T
+        skills = np.where(jobs['skill_counts'] > 0, skill_hits / np.maximum(jobs['skill_counts'], 1) * 100, 0.0)
+        overall = (keyword * self.weights['keyword'] + semantic * self.weights['semantic'] +
+                   skills * self.weights['skills'])
+        return {'overall': overall, 'keyword': keyword, 'semantic': semantic, 'skills': skills}
+
+    def match(self, resume_texts: List[str], job_descriptions: List[str], top_k: int = 10) -> Dict[str, Any]:
+        """Top-k jobs per candidate and top-k candidates per job over the full matrix"""
+        start_time = time.perf_counter()
+        jobs = self.prepare_jobs(job_descriptions)
+        candidates = self.prepare_candidates(resume_texts)
+        prepared = time.perf_counter()
+
+        num_candidates, num_jobs = len(resume_texts), len(job_descriptions)
+        k_jobs = min(top_k, num_jobs)
+        k_candidates = min(top_k, num_candidates)
+        jobs_per_candidate = np.zeros((num_candidates, k_jobs), dtype=np.int64)
+        job_scores = np.zeros((num_candidates, k_jobs), dtype=np.float32)
+        # Running best candidates per job, merged block by block
+        best_candidates = np.zeros((num_jobs, 0), dtype=np.int64)
+        best_scores = np.zeros((num_jobs, 0), dtype=np.float32)
+
+        for block_start in range(0, num_candidates, self.block_size):
+            block_stop = min(block_start + self.block_size, num_candidates)
+            overall = self.score_block(candidates, jobs, block_start, block_stop)['overall']
+
+            # Each candidate row sees every job, so its top-k is final
+            top = _top_k_rows(overall, k_jobs)
+            jobs_per_candidate[block_start:block_stop] = top
+            job_scores[block_start:block_stop] = np.take_along_axis(overall, top, axis=1)
+
+            # Merge this block's best candidates for each job with the running top-k
+            block_top = _top_k_rows(overall.T, min(k_candidates, block_stop - block_start))
+            merged_ids = np.hstack([best_candidates, block_top + block_start])
+            merged_scores = np.hstack([best_scores, np.take_along_axis(overall.T, block_top, axis=1)])
+            keep = _top_k_rows(merged_scores, min(k_candidates, merged_ids.shape[1]))
+            best_candidates = np.take_along_axis(merged_ids, keep, axis=1)
+            best_scores = np.take_along_axis(merged_scores, keep, axis=1)
+
+        return {
+            'jobs_per_candidate': jobs_per_candidate,
+            'job_scores': job_scores,
+            'candidates_per_job': best_candidates,
+            'candidate_scores': best_scores,
+            'timings': {
+                'prepare_seconds': round(prepared - start_time, 4),
+                'score_seconds': round(time.perf_counter() - prepared, 4),
+            },
+        }
+
+
+def _top_k_rows(matrix: np.ndarray, k: int) -> np.ndarray:
+    """Column indices of the k largest values in each row, best first"""
+    if k <= 0:
+        return np.zeros((matrix.shape[0], 0), dtype=np.int64)
+    if k < matrix.shape[1]:
+        top = np.argpartition(-matrix, k - 1, axis=1)[:, :k]
+    else:
+        top = np.tile(np.arange(matrix.shape[1]), (matrix.shape[0], 1))
+    order = np.argsort(-np.take_along_axis(matrix, top, axis=1), axis=1, kind='stable')
+    return np.take_along_axis(top, order, axis=1)
+
+
+def _read_text_dir(directory: str) -> Dict[str, str]:
+    """Read every .txt file in a directory keyed by file name"""
+    texts = {}
+    for name in sorted(os.listdir(directory)):
+        if name.endswith('.txt'):
+            with open(os.path.join(directory, name), encoding='utf-8', errors='ignore') as f:
+                texts[name] = f.read()
+    return texts
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Match every candidate against every open job")
+    arg_parser.add_argument('--resumes', required=True, help="Directory of extracted resume .txt files")
+    arg_parser.add_argument('--jobs', required=True, help="Directory of job description .txt files")
+    arg_parser.add_argument('--keyword-model', default=None)
+    arg_parser.add_argument('--top-k', type=int, default=10)
+    arg_parser.add_argument('--block-size', type=int, default=2048)
+    arg_parser.add_argument('--output', default='matches.json')
+    args = arg_parser.parse_args()
+
+    resumes = _read_text_dir(args.resumes)
+    jobs = _read_text_dir(args.jobs)
+    scorer = ATSScorer(keyword_model_path=args.keyword_model)
+    matrix_scorer = MatrixScorer(scorer, KeywordEngine.load(args.keyword_model), block_size=args.block_size)
+    result = matrix_scorer.match(list(resumes.values()), list(jobs.values()), args.top_k)
+
+    resume_ids, job_ids = list(resumes), list(jobs)
+    output = {
+        'jobs_per_candidate': {
+            resume_ids[i]: [{'job': job_ids[j], 'score': round(float(s), 2)} for j, s in zip(row, scores)]
+            for i, (row, scores) in enumerate(zip(result['jobs_per_candidate'], result['job_scores']))
+        },
+        'candidates_per_job': {
+            job_ids[j]: [{'candidate': resume_ids[i], 'score': round(float(s), 2)} for i, s in zip(row, scores)]
+            for j, (row, scores) in enumerate(zip(result['candidates_per_job'], result['candidate_scores']))
+        },
+        'timings': result['timings'],
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(output, f, indent=2)
+    print(f"Matched {len(resume_ids)} candidates x {len(job_ids)} jobs in "
+          f"{sum(result['timings'].values()):.2f}s -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
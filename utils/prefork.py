@@ -0,0 +1,197 @@
+import argparse
+import gc
+import os
+import signal
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+# Fast tokenizers spawn their own thread pool; it must not be running when we fork
+os.environ.setdefault('TOKENIZERS_PARALLELISM', 'false')
+
+from utils.resume_parser import ResumeParser
+from utils.ats_scorer import ATSScorer
+
+WARMUP_TEXT = (
+    "Experience\nSenior Python developer at Example Corp 2019 - 2024, improved API latency by 40%.\n"
+    "Education\nBachelor of Science in Computer Science, 2018\n"
+    "Skills\nPython, SQL, Docker, AWS, machine learning"
+)
+
+
+class PreforkServer:
+    def __init__(self, worker_fn: Callable, num_workers: int = 4, threads_per_worker: int = 1):
+        # worker_fn(worker_id, parser, scorer) runs inside each forked child
+        self.worker_fn = worker_fn
+        self.num_workers = num_workers
+        self.threads_per_worker = threads_per_worker
+        self.parser = None
+        self.scorer = None
+        self.workers: Dict[int, int] = {}  # pid -> worker id
+        self._stopping = False
+
+    def load_models(self):
+        """Load and warm all models once in the parent process"""
+        self.parser = ResumeParser()
+        self.scorer = ATSScorer()
+
+        # Run real inference so lazily allocated buffers exist before the fork
+        self.parser.nlp(WARMUP_TEXT)
+        self.scorer.semantic_model.encode([WARMUP_TEXT])
+        resume_data = self.parser.parse_resume(WARMUP_TEXT)
+        self.scorer.calculate_ats_score(WARMUP_TEXT, WARMUP_TEXT, resume_data)
+
+        # Park every object allocated so far in the permanent GC generation, otherwise
+        # the collector in each child writes to their headers and un-shares the pages
+        gc.collect()
+        if hasattr(gc, 'freeze'):
+            gc.freeze()
+
+    def start(self):
+        """Fork all workers from the warmed parent"""
+        if self.scorer is None:
+            self.load_models()
+        for worker_id in range(self.num_workers):
+            self._spawn(worker_id)
+        return list(self.workers)
+
+    def _spawn(self, worker_id: int) -> int:
+        """Fork a single worker process"""
+        pid = os.fork()
+        if pid:
+            self.workers[pid] = worker_id
+            return pid
+
+        # Child process
+        exit_code = 0
+        try:
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            self._configure_child_threads()
+            self.worker_fn(worker_id, self.parser, self.scorer)
+        except Exception as e:
+            print(f"Worker {worker_id} failed: {e}", file=sys.stderr)
+            exit_code = 1
+        finally:
+            os._exit(exit_code)
+
+    def _configure_child_threads(self):
+        """Limit intra-op threads so N workers don't oversubscribe the CPU"""
+        try:
+            import torch
+            torch.set_num_threads(self.threads_per_worker)
+        except ImportError:
+            pass
+
+    def serve_forever(self, respawn: bool = True):
+        """Wait on workers, restarting any that exit until stop() is called"""
+        signal.signal(signal.SIGTERM, lambda *_: self.stop())
+        signal.signal(signal.SIGINT, lambda *_: self.stop())
+        while self.workers:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                break
+            except InterruptedError:
+                continue
+            worker_id = self.workers.pop(pid, None)
+            if worker_id is not None and respawn and not self._stopping:
+                self._spawn(worker_id)
+
+    def stop(self):
+        """Terminate all workers"""
+        self._stopping = True
+        for pid in list(self.workers):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                self.workers.pop(pid, None)
+
+    def memory_report(self) -> Dict[str, Any]:
+        """Report parent RSS and per-worker unique/proportional memory in MB"""
+        parent = read_process_memory(os.getpid())
+        workers = []
+        for pid, worker_id in sorted(self.workers.items(), key=lambda item: item[1]):
+            usage = read_process_memory(pid)
+            if usage:
+                usage.update({'pid': pid, 'worker_id': worker_id})
+                workers.append(usage)
+
+        report = {'parent': parent, 'workers': workers}
+        if parent and workers:
+            unique_total = sum(w['uss_mb'] for w in workers)
+            report['total_mb'] = round(parent['rss_mb'] + unique_total, 1)
+            # What the same number of independently started processes would cost
+            report['unshared_estimate_mb'] = round(parent['rss_mb'] * (len(workers) + 1), 1)
+        return report
+
+
+def read_process_memory(pid: int) -> Optional[Dict[str, float]]:
+    """Read RSS, PSS and USS for a process from /proc (Linux only)"""
+    fields = {}
+    for path in (f'/proc/{pid}/smaps_rollup', f'/proc/{pid}/smaps'):
+        try:
+            with open(path) as f:
+                for line in f:
+                    parts = line.split()
+                    if len(parts) == 3 and parts[2] == 'kB':
+                        key = parts[0].rstrip(':')
+                        fields[key] = fields.get(key, 0) + int(parts[1])
+            break
+        except (FileNotFoundError, PermissionError):
+            continue
+
+    if not fields:
+        return None
+
+    uss = fields.get('Private_Clean', 0) + fields.get('Private_Dirty', 0)
+    return {
+        'rss_mb': round(fields.get('Rss', 0) / 1024, 1),
+        'pss_mb': round(fields.get('Pss', 0) / 1024, 1),
+        'uss_mb': round(uss / 1024, 1),
+        'shared_mb': round((fields.get('Shared_Clean', 0) + fields.get('Shared_Dirty', 0)) / 1024, 1),
+    }
+
+
+def _idle_worker(worker_id: int, parser: ResumeParser, scorer: ATSScorer):
+    """Demo worker: run one analysis like a real request would, then wait"""
+    resume_data = parser.parse_resume(WARMUP_TEXT)
+    scorer.calculate_ats_score(WARMUP_TEXT, WARMUP_TEXT, resume_data)
+    while True:
+        signal.pause()
+
+
+def print_memory_report(report: Dict[str, Any]):
+    """Print a memory report in a readable table"""
+    parent = report.get('parent')
+    if not parent:
+        print("Memory reporting requires /proc (Linux)")
+        return
+    print(f"Parent      RSS {parent['rss_mb']:>8.1f} MB")
+    for w in report['workers']:
+        print(f"Worker {w['worker_id']:<4} RSS {w['rss_mb']:>8.1f} MB  "
+              f"PSS {w['pss_mb']:>8.1f} MB  USS {w['uss_mb']:>8.1f} MB")
+    if 'total_mb' in report:
+        print(f"Total (parent RSS + worker USS): {report['total_mb']} MB")
+        print(f"Same workers without sharing:    ~{report['unshared_estimate_mb']} MB")
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Pre-fork model server memory demo")
+    arg_parser.add_argument('--workers', type=int, default=4)
+    arg_parser.add_argument('--threads-per-worker', type=int, default=1)
+    args = arg_parser.parse_args()
+
+    server = PreforkServer(_idle_worker, args.workers, args.threads_per_worker)
+    start = time.time()
+    server.load_models()
+    print(f"Models loaded and warmed in {time.time() - start:.1f}s")
+    server.start()
+    time.sleep(2)  # let the workers finish their first analysis
+    print_memory_report(server.memory_report())
+    print("Workers running, press Ctrl+C to stop")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+import struct
+import sys
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Tuple, Type, TypeVar
+
+R = TypeVar('R', bound='_Record')
+
+_FRAME = struct.Struct('<I')
+_SWAP = sys.byteorder != 'little'
+
+PARSED_RESUME_KEYS = ('text', 'emails', 'phones', 'urls', 'skills', 'education', 'experience', 'entities',
+                      'sections')
+ENTITY_LABELS = ('persons', 'organizations', 'locations', 'dates')
+
+
+class _Record:
+    """Base of the slotted record types: string-list fields are tuples, and the binary layout is
+
+    header (floats as f8, item count of each list field as u4, utf-8 blob size as u4),
+    character length of every string as u4, then every string concatenated into one utf-8 blob.
+    """
+    __slots__ = ()
+    _FLOATS: Tuple[str, ...] = ()
+    _STRINGS: Tuple[str, ...] = ()
+    _LISTS: Tuple[str, ...] = ()
+    # List fields whose values repeat across records (skill names, headers, suggestion templates);
+    # interning stores each distinct value once however many records hold it
+    _INTERNED: frozenset = frozenset()
+    _header: struct.Struct
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._header = struct.Struct('<' + 'd' * len(cls._FLOATS) + 'I' * len(cls._LISTS) + 'I')
+
+    def __init__(self, **fields):
+        for name in self._FLOATS:
+            setattr(self, name, float(fields[name]))
+        for name in self._STRINGS:
+            setattr(self, name, fields[name])
+        for name in self._LISTS:
+            values = fields[name]
+            setattr(self, name, tuple(sys.intern(v) for v in values) if name in self._INTERNED else tuple(values))
+
+    def __eq__(self, other):
+        return type(other) is type(self) and all(getattr(self, name) == getattr(other, name)
+                                                 for name in self.__slots__)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({', '.join(f'{name}={getattr(self, name)!r}' for name in self.__slots__)})"
+
+    def to_bytes(self) -> bytes:
+        lists = [getattr(self, name) for name in self._LISTS]
+        strings = [getattr(self, name) for name in self._STRINGS]
+        for values in lists:
+            strings.extend(values)
+        lengths = array('I', map(len, strings))
+        if _SWAP:
+            lengths.byteswap()
+        blob = ''.join(strings).encode('utf-8')
+        header = self._header.pack(*(getattr(self, name) for name in self._FLOATS), *map(len, lists), len(blob))
+        return b''.join((header, lengths.tobytes(), blob))
+
+    @classmethod
+    def from_bytes(cls: Type[R], data) -> R:
+        data = memoryview(data)
+        values = cls._header.unpack_from(data)
+        n_floats, n_lists = len(cls._FLOATS), len(cls._LISTS)
+        counts = values[n_floats:n_floats + n_lists]
+        offset = cls._header.size
+        lengths = array('I')
+        lengths.frombytes(data[offset:offset + 4 * (len(cls._STRINGS) + sum(counts))])
+        if _SWAP:
+            lengths.byteswap()
+        offset += len(lengths) * 4
+        text = str(data[offset:offset + values[-1]], 'utf-8')
+
+        strings, position = [], 0
+        for length in lengths:
+            strings.append(text[position:position + length])
+            position += length
+
+        record = cls.__new__(cls)
+        for name, value in zip(cls._FLOATS, values):
+            setattr(record, name, value)
+        for name, value in zip(cls._STRINGS, strings):
+            setattr(record, name, value)
+        position = len(cls._STRINGS)
+        for name, count in zip(cls._LISTS, counts):
+            items = strings[position:position + count]
+            setattr(record, name, tuple(map(sys.intern, items)) if name in cls._INTERNED else tuple(items))
+            position += count
+        return record
+
+
+class ParsedResume(_Record):
+    """parse_resume output; entities and sections are flattened into parallel tuples"""
+    __slots__ = ('text', 'emails', 'phones', 'urls', 'skills', 'education', 'experience',
+                 'persons', 'organizations', 'locations', 'dates', 'section_names', 'section_texts')
+    _STRINGS = ('text',)
+    _LISTS = __slots__[1:]
+    _INTERNED = frozenset({'skills', 'section_names'})
+
+    @classmethod
+    def from_dict(cls, resume_data: Dict[str, Any]) -> 'ParsedResume':
+        if set(resume_data) != set(PARSED_RESUME_KEYS):
+            raise ValueError(f"Not a parse_resume dict: keys {sorted(resume_data)}")
+        entities = resume_data['entities']
+        if set(entities) != set(ENTITY_LABELS):
+            raise ValueError(f"Unexpected entity labels {sorted(entities)}")
+        sections = resume_data['sections']
+        return cls(text=resume_data['text'], emails=resume_data['emails'], phones=resume_data['phones'],
+                   urls=resume_data['urls'], skills=resume_data['skills'], education=resume_data['education'],
+                   experience=resume_data['experience'], **{label: entities[label] for label in ENTITY_LABELS},
+                   section_names=list(sections), section_texts=list(sections.values()))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The exact dict parse_resume returned"""
+        return {
+            'text': self.text,
+            'emails': list(self.emails),
+            'phones': list(self.phones),
+            'urls': list(self.urls),
+            'skills': list(self.skills),
+            'education': list(self.education),
+            'experience': list(self.experience),
+            'entities': {label: list(getattr(self, label)) for label in ENTITY_LABELS},
+            'sections': dict(zip(self.section_names, self.section_texts)),
+        }
+
+
+class ScoreResult(_Record):
+    """calculate_ats_score output"""
+    __slots__ = ('overall_score', 'keyword_match_score', 'semantic_similarity', 'skills_score',
+                 'experience_score', 'education_score', 'format_score',
+                 'issues', 'suggestions', 'missing_keywords', 'matched_skills', 'sections_found')
+    _FLOATS = __slots__[:7]
+    _LISTS = __slots__[7:]
+    _INTERNED = frozenset({'issues', 'suggestions', 'missing_keywords', 'matched_skills', 'sections_found'})
+
+    @classmethod
+    def from_dict(cls, result: Dict[str, Any]) -> 'ScoreResult':
+        if set(result) != set(cls.__slots__):
+            raise ValueError(f"Not a calculate_ats_score dict: keys {sorted(result)}")
+        return cls(**result)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The exact dict calculate_ats_score returned"""
+        return {name: list(getattr(self, name)) if name in self._LISTS else getattr(self, name)
+                for name in self.__slots__}
+
+
+def dumps_many(records: Iterable[_Record]) -> bytes:
+    """Length-prefixed concatenation of records, for files and queues"""
+    parts = []
+    for record in records:
+        data = record.to_bytes()
+        parts.append(_FRAME.pack(len(data)))
+        parts.append(data)
+    return b''.join(parts)
+
+
+def iter_loads(cls: Type[R], data) -> Iterator[R]:
+    data = memoryview(data)
+    offset = 0
+    while offset < len(data):
+        (size,) = _FRAME.unpack_from(data, offset)
+        offset += _FRAME.size
+        yield cls.from_bytes(data[offset:offset + size])
+        offset += size
+
+
+def loads_many(cls: Type[R], data) -> List[R]:
+    return list(iter_loads(cls, data))
@@ -0,0 +1,143 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    scorer_version TEXT NOT NULL,
+    result TEXT NOT NULL,
+    expires_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed_at);
+"""
+
+
+def _sha256(value: str) -> str:
+    return hashlib.sha256(value.encode('utf-8')).hexdigest()
+
+
+def _copy(result: Dict[str, Any]) -> Dict[str, Any]:
+    # Result values are numbers, strings and lists of strings, so copying the lists is enough
+    return {key: list(value) if isinstance(value, list) else value for key, value in result.items()}
+
+
+class ResultCache:
+    def __init__(self, max_entries: int = 2048, ttl_seconds: float = 24 * 3600,
+                 disk_path: Optional[str] = None, disk_max_entries: int = 200000):
+        # In-process LRU tier, optionally backed by a SQLite tier shared across processes and restarts
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.disk_path = disk_path
+        self.disk_max_entries = disk_max_entries
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._entries: 'OrderedDict[str, tuple]' = OrderedDict()  # key -> (expires_at, result)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._disk_writes = 0
+        if disk_path:
+            directory = os.path.dirname(disk_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._disk().executescript(_SCHEMA)
+
+    @staticmethod
+    def key(resume_text: str, job_description: str, resume_data: Dict[str, Any], scorer_fingerprint: str) -> str:
+        """Content hash of one analysis: resume, parsed resume, JD and the scorer configuration"""
+        parsed = json.dumps(resume_data, sort_keys=True, default=str)
+        return _sha256('\0'.join([_sha256(resume_text), _sha256(parsed), _sha256(job_description),
+                                  scorer_fingerprint]))
+
+    def _disk(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.disk_path, timeout=30.0, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Cached result for a key, or None if absent or expired"""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return _copy(entry[1])
+                del self._entries[key]
+
+        if self.disk_path:
+            row = self._disk().execute('SELECT result, expires_at FROM results WHERE key = ? AND expires_at > ?',
+                                       (key, now)).fetchone()
+            if row is not None:
+                self._disk().execute('UPDATE results SET accessed_at = ? WHERE key = ?', (now, key))
+                result = json.loads(row[0])
+                self._remember(key, row[1], result)
+                with self._lock:
+                    self.disk_hits += 1
+                return _copy(result)
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: str, result: Dict[str, Any], scorer_version: str = ''):
+        now = time.time()
+        expires_at = now + self.ttl_seconds
+        self._remember(key, expires_at, _copy(result))
+        if self.disk_path:
+            conn = self._disk()
+            payload = json.dumps(result, ensure_ascii=False, default=float)
+            conn.execute('INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?)',
+                         (key, scorer_version, payload, expires_at, now))
+            with self._lock:
+                self._disk_writes += 1
+                evict = self._disk_writes % 256 == 0
+            if evict:
+                self._evict_disk(conn, now)
+
+    def _remember(self, key: str, expires_at: float, result: Dict[str, Any]):
+        with self._lock:
+            self._entries[key] = (expires_at, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _evict_disk(self, conn: sqlite3.Connection, now: float):
+        """Drop expired rows, then the least recently used ones beyond disk_max_entries"""
+        conn.execute('DELETE FROM results WHERE expires_at <= ?', (now,))
+        conn.execute('DELETE FROM results WHERE key IN (SELECT key FROM results ORDER BY accessed_at DESC '
+                     'LIMIT -1 OFFSET ?)', (self.disk_max_entries,))
+
+    def retain_version(self, scorer_version: str):
+        """Delete disk entries written by any other scorer version"""
+        if self.disk_path:
+            self._disk().execute('DELETE FROM results WHERE scorer_version != ?', (scorer_version,))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+        if self.disk_path:
+            self._disk().execute('DELETE FROM results')
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'hit_rate': round((self.hits + self.disk_hits) / lookups, 3) if lookups else 0.0,
+            }
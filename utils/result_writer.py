@@ -0,0 +1,222 @@
+import argparse
+import atexit
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from utils.ats_scorer import RESULT_KEYS, SCORER_VERSION
+
+TIMING_KEYS = ('extract_ms', 'parse_ms', 'score_ms')
+
+# Fixed column layout of every exported file: (name, arrow type); changing it needs a new SCHEMA_VERSION
+SCHEMA_VERSION = 1
+COLUMNS = (
+    [('analysis_id', 'string'), ('analyzed_at', 'timestamp'), ('resume_id', 'string'), ('job_id', 'string'),
+     ('jd_hash', 'string'), ('scorer_version', 'string'), ('overall_score', 'float32')]
+    + [(key, 'float32') for key in RESULT_KEYS.values()]
+    + [('matched_skills', 'list'), ('missing_keywords', 'list'), ('sections_found', 'list'),
+       ('issues_count', 'int16')]
+    + [(key, 'float32') for key in TIMING_KEYS]
+)
+
+
+def jd_hash(job_description: str) -> Optional[str]:
+    """Short content hash identifying a job description across exports"""
+    return hashlib.sha256(job_description.encode('utf-8')).hexdigest()[:16] if job_description else None
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.ipc
+        import pyarrow.parquet
+    except ImportError as e:
+        raise ImportError("Exporting results needs pyarrow: pip install pyarrow") from e
+    return pyarrow
+
+
+def result_schema():
+    pa = _pyarrow()
+    types = {'string': pa.string(), 'timestamp': pa.timestamp('ms', tz='UTC'), 'float32': pa.float32(),
+             'int16': pa.int16(), 'list': pa.list_(pa.string())}
+    return pa.schema([pa.field(name, types[kind]) for name, kind in COLUMNS],
+                     metadata={'schema_version': str(SCHEMA_VERSION)})
+
+
+class ResultWriter:
+    def __init__(self, root: str, file_format: str = 'parquet', row_group_size: int = 65536,
+                 max_file_rows: Optional[int] = None, max_file_seconds: Optional[float] = None):
+        # Rows are buffered per date partition and written a full row group at a time;
+        # files are hive-partitioned (root/date=YYYY-MM-DD/) so DuckDB and pyarrow.dataset can prune by day.
+        # A long-running writer finalizes a file once it holds max_file_rows rows or is max_file_seconds old,
+        # so readers see recent rows and a crash loses at most one file's worth; the next rows start a new file
+        if file_format not in ('parquet', 'arrow'):
+            raise ValueError(f"Unknown format '{file_format}', expected 'parquet' or 'arrow'")
+        self.pa = _pyarrow()
+        self.root = root
+        self.file_format = file_format
+        self.row_group_size = row_group_size
+        self.max_file_rows = max_file_rows
+        self.max_file_seconds = max_file_seconds
+        self.schema = result_schema()
+        self.rows_written = 0
+        self.files_finalized = 0
+        self._buffers: Dict[str, Dict[str, list]] = {}
+        self._writers: Dict[str, tuple] = {}  # partition -> (writer, temporary path, final path)
+        self._file_rows: Dict[str, int] = {}  # partition -> rows in its current file, buffered or written
+        self._file_started: Dict[str, float] = {}  # partition -> monotonic time of its current file's first row
+        self._lock = threading.Lock()
+        self._roller = None
+        self._stop_roller = threading.Event()
+        os.makedirs(root, exist_ok=True)
+
+    def write(self, result: Dict[str, Any], resume_id: str = '', job_id: str = '', job_description: str = '',
+              timings: Optional[Dict[str, float]] = None, analyzed_at: Optional[datetime] = None,
+              job_hash: Optional[str] = None):
+        """Buffer one calculate_ats_score result; job_hash stands in for job_description when only its hash is kept"""
+        analyzed_at = analyzed_at or datetime.now(timezone.utc)
+        timings = timings or {}
+        row = {
+            'analysis_id': uuid.uuid4().hex,
+            'analyzed_at': analyzed_at,
+            'resume_id': resume_id,
+            'job_id': job_id,
+            'jd_hash': job_hash or jd_hash(job_description),
+            'scorer_version': SCORER_VERSION,
+            'overall_score': result.get('overall_score'),
+            **{key: result.get(key) for key in RESULT_KEYS.values()},
+            'matched_skills': list(result.get('matched_skills', [])),
+            'missing_keywords': list(result.get('missing_keywords', [])),
+            'sections_found': list(result.get('sections_found', [])),
+            'issues_count': len(result.get('issues', [])),
+            **{key: timings.get(key) for key in TIMING_KEYS},
+        }
+        partition = f"date={analyzed_at.astimezone(timezone.utc):%Y-%m-%d}"
+        with self._lock:
+            buffer = self._buffers.setdefault(partition, {name: [] for name, _ in COLUMNS})
+            for name, _ in COLUMNS:
+                buffer[name].append(row[name])
+            self._file_started.setdefault(partition, time.monotonic())
+            self._file_rows[partition] = self._file_rows.get(partition, 0) + 1
+            if self.max_file_rows and self._file_rows[partition] >= self.max_file_rows:
+                self._finalize_partition(partition)
+            elif len(buffer['analysis_id']) >= self.row_group_size:
+                self._flush_partition(partition)
+
+    def _flush_partition(self, partition: str):
+        buffer = self._buffers.pop(partition, None)
+        if not buffer or not buffer['analysis_id']:
+            return
+        table = self.pa.table(buffer, schema=self.schema)
+        if partition not in self._writers:
+            directory = os.path.join(self.root, partition)
+            os.makedirs(directory, exist_ok=True)
+            name = f"part-{os.getpid()}-{uuid.uuid4().hex[:8]}.{self.file_format}"
+            # Dot-prefixed until closed: dataset scanners skip it, so they never see a file without its footer
+            temporary_path = os.path.join(directory, '.' + name)
+            if self.file_format == 'parquet':
+                writer = self.pa.parquet.ParquetWriter(temporary_path, self.schema, compression='zstd')
+            else:
+                writer = self.pa.ipc.new_file(temporary_path, self.schema)
+            self._writers[partition] = (writer, temporary_path, os.path.join(directory, name))
+        writer = self._writers[partition][0]
+        if self.file_format == 'parquet':
+            writer.write_table(table, row_group_size=self.row_group_size)
+        else:
+            writer.write_table(table, max_chunksize=self.row_group_size)
+        self.rows_written += table.num_rows
+
+    def _finalize_partition(self, partition: str):
+        self._flush_partition(partition)
+        self._file_rows.pop(partition, None)
+        self._file_started.pop(partition, None)
+        entry = self._writers.pop(partition, None)
+        if entry is not None:
+            writer, temporary_path, path = entry
+            writer.close()
+            os.replace(temporary_path, path)
+            self.files_finalized += 1
+
+    def flush(self):
+        """Write out every partial row group; each call adds a (smaller) row group per partition"""
+        with self._lock:
+            for partition in list(self._buffers):
+                self._flush_partition(partition)
+
+    def roll(self, now: Optional[datetime] = None):
+        """Finalize files of past days and files older than max_file_seconds"""
+        today = f"date={(now or datetime.now(timezone.utc)).astimezone(timezone.utc):%Y-%m-%d}"
+        with self._lock:
+            for partition in list(self._file_started):
+                age = time.monotonic() - self._file_started[partition]
+                if partition < today or (self.max_file_seconds is not None and age >= self.max_file_seconds):
+                    self._finalize_partition(partition)
+
+    def start_background_roll(self, interval: float = 60.0) -> 'ResultWriter':
+        """Call roll() every interval seconds on a daemon thread, so files finalize while the app is idle"""
+        if self._roller is None:
+            self._stop_roller.clear()
+
+            def run():
+                while not self._stop_roller.wait(interval):
+                    self.roll()
+
+            self._roller = threading.Thread(target=run, name="result-writer-roll", daemon=True)
+            self._roller.start()
+        return self
+
+    def close(self):
+        """Flush and finalize all files; rows are only visible to readers once their file is finalized"""
+        if self._roller is not None:
+            self._stop_roller.set()
+            self._roller.join()
+            self._roller = None
+        with self._lock:
+            for partition in list(self._file_started):
+                self._finalize_partition(partition)
+
+    def close_at_exit(self) -> 'ResultWriter':
+        atexit.register(self.close)
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def export_jsonl(path: str, writer: ResultWriter) -> int:
+    """Export a bulk screening JSONL (one row per resume and job) through a writer; returns rows exported"""
+    exported = 0
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            row = json.loads(line)
+            if 'error' not in row:
+                # Bulk rows carry the JD hash and stage timings next to the result
+                writer.write(row, resume_id=row['resume'], job_id=row['job'], job_hash=row.get('jd_hash'),
+                             timings=row)
+                exported += 1
+    return exported
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Export bulk screening results to partitioned Parquet/Arrow")
+    arg_parser.add_argument('results', help="JSONL written by python -m utils.bulk_pipeline")
+    arg_parser.add_argument('output', help="Dataset directory")
+    arg_parser.add_argument('--format', choices=('parquet', 'arrow'), default='parquet')
+    arg_parser.add_argument('--row-group-size', type=int, default=65536)
+    args = arg_parser.parse_args()
+
+    with ResultWriter(args.output, args.format, args.row_group_size) as writer:
+        exported = export_jsonl(args.results, writer)
+    print(f"Exported {exported} results -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
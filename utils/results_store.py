@@ -0,0 +1,194 @@
+import atexit
+import hashlib
+import os
+import queue
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from utils.ats_scorer import RESULT_KEYS
+from utils.result_writer import jd_hash
+
+DEFAULT_RESULTS_PATH = os.path.join('data', 'results.db')
+
+# Lower bounds of the README's score ratings: poor, fair, good, excellent
+SCORE_BANDS = (0, 40, 60, 80)
+# Analyses rated good or better count as successful
+SUCCESS_BAND = 2
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS analyses (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    analyzed_at REAL NOT NULL,
+    day TEXT NOT NULL,
+    resume_hash TEXT NOT NULL,
+    jd_hash TEXT NOT NULL,
+    overall_score REAL NOT NULL,
+    score_band INTEGER NOT NULL,
+    keyword_match_score REAL,
+    semantic_similarity REAL,
+    skills_score REAL,
+    experience_score REAL,
+    education_score REAL,
+    format_score REAL,
+    duration_ms REAL
+);
+CREATE INDEX IF NOT EXISTS analyses_time ON analyses (analyzed_at);
+CREATE INDEX IF NOT EXISTS analyses_jd ON analyses (jd_hash, analyzed_at);
+CREATE INDEX IF NOT EXISTS analyses_band ON analyses (score_band, analyzed_at);
+CREATE TABLE IF NOT EXISTS daily_stats (
+    day TEXT PRIMARY KEY,
+    analyses INTEGER NOT NULL,
+    successes INTEGER NOT NULL,
+    score_sum REAL NOT NULL
+);
+"""
+
+_COLUMNS = ('analyzed_at', 'day', 'resume_hash', 'jd_hash', 'overall_score', 'score_band',
+            *RESULT_KEYS.values(), 'duration_ms')
+
+
+def _sha256(value: str) -> str:
+    return hashlib.sha256(value.encode('utf-8')).hexdigest()
+
+
+def score_band(score: float) -> int:
+    return sum(score >= bound for bound in SCORE_BANDS[1:])
+
+
+class ResultsStore:
+    def __init__(self, path: str = DEFAULT_RESULTS_PATH, batch_size: int = 256, max_pending: int = 10000):
+        # Inserts go through a queue to one writer thread, so recording never blocks a request on disk I/O
+        self.path = path
+        self.batch_size = batch_size
+        self.dropped = 0
+        self._pending: 'queue.Queue[Optional[tuple]]' = queue.Queue(maxsize=max_pending)
+        self._local = threading.local()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._connection().executescript(_SCHEMA)
+        self._writer = threading.Thread(target=self._write_loop, name='results-store-writer', daemon=True)
+        self._writer.start()
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=30.0, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    def record(self, result: Dict[str, Any], resume_text: str, job_description: str,
+               duration_ms: Optional[float] = None, analyzed_at: Optional[float] = None):
+        """Queue one analysis for storage; drops it (and counts the drop) if the writer is far behind"""
+        analyzed_at = analyzed_at or time.time()
+        score = result['overall_score']
+        row = (analyzed_at, datetime.fromtimestamp(analyzed_at, timezone.utc).date().isoformat(),
+               _sha256(resume_text), jd_hash(job_description) or '', score, score_band(score),
+               *(result.get(key) for key in RESULT_KEYS.values()), duration_ms)
+        try:
+            self._pending.put_nowait(row)
+        except queue.Full:
+            self.dropped += 1
+
+    def _write_loop(self):
+        while True:
+            rows = [self._pending.get()]
+            while len(rows) < self.batch_size:
+                try:
+                    rows.append(self._pending.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self._insert([row for row in rows if row is not None])
+            except sqlite3.Error:
+                # Metrics are best effort; a failed batch must not stop the writer
+                self.dropped += len(rows)
+            finally:
+                for _ in rows:
+                    self._pending.task_done()
+            if None in rows:
+                return
+
+    def _insert(self, rows: List[tuple]):
+        if not rows:
+            return
+        conn = self._connection()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.executemany(f"INSERT INTO analyses ({', '.join(_COLUMNS)}) "
+                             f"VALUES ({', '.join('?' * len(_COLUMNS))})", rows)
+            # The daily rollup is updated in the same transaction, so metrics never need to scan analyses
+            conn.executemany('INSERT INTO daily_stats VALUES (?, 1, ?, ?) ON CONFLICT (day) DO UPDATE SET '
+                             'analyses = analyses + 1, successes = successes + excluded.successes, '
+                             'score_sum = score_sum + excluded.score_sum',
+                             [(row[1], int(row[5] >= SUCCESS_BAND), row[4]) for row in rows])
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+
+    def flush(self):
+        """Block until every queued analysis is written"""
+        self._pending.join()
+
+    def close(self):
+        if self._writer.is_alive():
+            self._pending.put(None)
+            self._writer.join()
+
+    def close_at_exit(self) -> 'ResultsStore':
+        atexit.register(self.close)
+        return self
+
+    def summary(self, days: int = 7) -> Dict[str, Any]:
+        """All-time totals plus the last `days` days against the `days` before, from the daily rollup"""
+        today = datetime.now(timezone.utc).date()
+        recent_start = (today - timedelta(days=days - 1)).isoformat()
+        previous_start = (today - timedelta(days=2 * days - 1)).isoformat()
+        total, successes, score_sum, recent, recent_successes, previous, previous_successes = \
+            self._connection().execute(
+                'SELECT COALESCE(SUM(analyses), 0), COALESCE(SUM(successes), 0), COALESCE(SUM(score_sum), 0), '
+                'COALESCE(SUM(CASE WHEN day >= :recent THEN analyses END), 0), '
+                'COALESCE(SUM(CASE WHEN day >= :recent THEN successes END), 0), '
+                'COALESCE(SUM(CASE WHEN day >= :previous AND day < :recent THEN analyses END), 0), '
+                'COALESCE(SUM(CASE WHEN day >= :previous AND day < :recent THEN successes END), 0) '
+                'FROM daily_stats', {'recent': recent_start, 'previous': previous_start}).fetchone()
+
+        def rate(hits, count):
+            return hits / count * 100 if count else None
+
+        return {
+            'analyses': total,
+            'success_rate': rate(successes, total),
+            'average_score': score_sum / total if total else None,
+            'recent_analyses': recent,
+            'previous_analyses': previous,
+            'recent_success_rate': rate(recent_successes, recent),
+            'previous_success_rate': rate(previous_successes, previous),
+        }
+
+    def band_counts(self, since: Optional[float] = None, jd_hash: Optional[str] = None) -> Dict[int, int]:
+        """Number of analyses per score band, optionally since a timestamp or for one jd_hash()"""
+        clauses, params = [], []
+        if jd_hash is not None:
+            clauses.append('jd_hash = ?')
+            params.append(jd_hash)
+        if since is not None:
+            clauses.append('analyzed_at >= ?')
+            params.append(since)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ''
+        counts = dict(self._connection().execute(
+            f'SELECT score_band, COUNT(*) FROM analyses {where} GROUP BY score_band', params))
+        return {band: counts.get(band, 0) for band in range(len(SCORE_BANDS))}
+
+    def recent_for_job(self, job_description: str, limit: int = 20) -> List[Dict[str, Any]]:
+        """Latest analyses against one job description, newest first"""
+        conn = self._connection()
+        cursor = conn.execute(f"SELECT {', '.join(_COLUMNS)} FROM analyses WHERE jd_hash = ? "
+                              "ORDER BY analyzed_at DESC LIMIT ?", (jd_hash(job_description) or '', limit))
+        return [dict(zip(_COLUMNS, row)) for row in cursor]
@@ -3,8 +3,34 @@ import pdfplumber
 import docx
 import re
 import spacy
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Tuple
 import io
+import numpy as np
+
+# Common technical skills (expand this list based on your needs)
+SKILL_PATTERNS = [
+    'python', 'java', 'javascript', 'c\\+\\+', 'sql', 'html', 'css', 'react', 
+    'angular', 'vue', 'node', 'django', 'flask', 'spring', 'docker', 'kubernetes',
+    'aws', 'azure', 'gcp', 'machine learning', 'deep learning', 'data analysis',
+    'project management', 'agile', 'scrum', 'git', 'ci/cd', 'devops', 'api',
+    'rest', 'graphql', 'mongodb', 'postgresql', 'mysql', 'redis', 'elasticsearch'
+]
+_SKILL_REGEXES = [re.compile(r'\b' + skill + r'\b') for skill in SKILL_PATTERNS]
+
+SECTION_HEADERS = [
+    'summary', 'objective', 'experience', 'education', 'skills',
+    'projects', 'achievements', 'certifications', 'awards', 'publications'
+]
+
+def skill_presence_matrix(texts: List[str]) -> np.ndarray:
+    """Boolean (documents x SKILL_PATTERNS) matrix of which skills each text mentions"""
+    matrix = np.zeros((len(texts), len(SKILL_PATTERNS)), dtype=bool)
+    for i, text in enumerate(texts):
+        text_lower = text.lower()
+        for j, regex in enumerate(_SKILL_REGEXES):
+            if regex.search(text_lower):
+                matrix[i, j] = True
+    return matrix
 
 class ResumeParser:
     def __init__(self):
@@ -93,19 +119,10 @@ class ResumeParser:
     
     def extract_skills(self, text: str) -> List[str]:
         """Extract skills from resume"""
-        # Common technical skills (expand this list based on your needs)
-        skill_patterns = [
-            'python', 'java', 'javascript', 'c\\+\\+', 'sql', 'html', 'css', 'react', 
-            'angular', 'vue', 'node', 'django', 'flask', 'spring', 'docker', 'kubernetes',
-            'aws', 'azure', 'gcp', 'machine learning', 'deep learning', 'data analysis',
-            'project management', 'agile', 'scrum', 'git', 'ci/cd', 'devops', 'api',
-            'rest', 'graphql', 'mongodb', 'postgresql', 'mysql', 'redis', 'elasticsearch'
-        ]
-        
         text_lower = text.lower()
         found_skills = []
         
-        for skill in skill_patterns:
+        for skill in SKILL_PATTERNS:
             if re.search(r'\b' + skill + r'\b', text_lower):
                 found_skills.append(skill)
         
@@ -168,10 +185,7 @@ class ResumeParser:
     def identify_sections(self, text: str) -> Dict[str, str]:
         """Identify different sections in the resume"""
         sections = {}
-        section_headers = [
-            'summary', 'objective', 'experience', 'education', 'skills',
-            'projects', 'achievements', 'certifications', 'awards', 'publications'
-        ]
+        section_headers = SECTION_HEADERS
         
         lines = text.split('\n')
         current_section = None
@@ -196,4 +210,18 @@ class ResumeParser:
         if current_section:
             sections[current_section] = '\n'.join(section_content)
         
-        return sections
\ No newline at end of file
+        return sections
+
+    def split_blocks(self, text: str) -> List[Tuple[str, str]]:
+        """Split text into (section name, block text) at section header lines; text before the first is 'header'"""
+        blocks = []
+        name, lines = 'header', []
+        for line in text.split('\n'):
+            line_lower = line.lower().strip()
+            header = next((h for h in SECTION_HEADERS if h in line_lower and len(line_lower) < 50), None)
+            if header:
+                blocks.append((name, '\n'.join(lines)))
+                name, lines = header, []
+            lines.append(line)
+        blocks.append((name, '\n'.join(lines)))
+        return [(name, block) for name, block in blocks if block.strip()]
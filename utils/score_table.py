@@ -0,0 +1,143 @@
+import argparse
+import json
+import os
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from utils.ats_scorer import RESULT_KEYS, SCORE_WEIGHTS
+
+COMPONENTS = tuple(SCORE_WEIGHTS)
+
+# Named weightings recruiters can switch between; each covers every component and sums to 1
+WEIGHT_PROFILES = {
+    'default': dict(SCORE_WEIGHTS),
+    'skills_first': {'keyword': 0.20, 'semantic': 0.15, 'skills': 0.40, 'experience': 0.15,
+                     'education': 0.05, 'format': 0.05},
+    'experienced_hire': {'keyword': 0.15, 'semantic': 0.20, 'skills': 0.20, 'experience': 0.35,
+                         'education': 0.05, 'format': 0.05},
+    'graduate': {'keyword': 0.20, 'semantic': 0.20, 'skills': 0.20, 'experience': 0.05,
+                 'education': 0.30, 'format': 0.05},
+    'keyword_screen': {'keyword': 0.50, 'semantic': 0.10, 'skills': 0.25, 'experience': 0.05,
+                       'education': 0.05, 'format': 0.05},
+}
+
+
+def weight_vector(weights: Dict[str, float]) -> np.ndarray:
+    """Weights as a column-ordered vector; raises ValueError for unknown, missing or negative components"""
+    if set(weights) != set(COMPONENTS):
+        raise ValueError(f"Weights must cover exactly {list(COMPONENTS)}")
+    vector = np.array([weights[name] for name in COMPONENTS], dtype=np.float32)
+    if not np.all(np.isfinite(vector)) or (vector < 0).any():
+        raise ValueError(f"Weights must be finite and non-negative, got {weights}")
+    return vector
+
+
+class ScoreTable:
+    def __init__(self):
+        # One row per (resume, job) pair; component scores are one float32 column each
+        self.resume_ids = np.zeros(0, dtype=object)
+        self.job_ids = np.zeros(0, dtype=object)
+        self.components = np.zeros((0, len(COMPONENTS)), dtype=np.float32)
+        self._pending: List[tuple] = []
+
+    def __len__(self):
+        return len(self.resume_ids) + len(self._pending)
+
+    def append(self, resume_id: str, job_id: str, result: Dict[str, Any]):
+        """Add the component scores of one calculate_ats_score result"""
+        self._pending.append((resume_id, job_id, [result[RESULT_KEYS[name]] for name in COMPONENTS]))
+
+    def extend(self, rows: Iterable[Dict[str, Any]]):
+        """Add bulk output rows ({'resume', 'job', **result}); rows without scores are skipped"""
+        for row in rows:
+            if 'error' not in row:
+                self.append(row['resume'], row['job'], row)
+
+    def _consolidate(self):
+        if self._pending:
+            resume_ids, job_ids, components = zip(*self._pending)
+            self.resume_ids = np.concatenate([self.resume_ids, np.array(resume_ids, dtype=object)])
+            self.job_ids = np.concatenate([self.job_ids, np.array(job_ids, dtype=object)])
+            self.components = np.vstack([self.components, np.array(components, dtype=np.float32)])
+            self._pending = []
+
+    def overall(self, weights: Dict[str, float]) -> np.ndarray:
+        """Overall score of every row under a weighting: one matrix-vector product"""
+        self._consolidate()
+        return self.components @ weight_vector(weights)
+
+    def rerank(self, weights: Dict[str, float], top_k: Optional[int] = None,
+               job_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Rows ranked by overall score under the given weights, optionally for one job only"""
+        scores = self.overall(weights)
+        rows = np.flatnonzero(self.job_ids == job_id) if job_id is not None else np.arange(len(scores))
+        k = len(rows) if top_k is None else min(top_k, len(rows))
+        if k == 0:
+            return []
+        subset = scores[rows]
+        top = np.argpartition(-subset, k - 1)[:k] if k < len(rows) else np.arange(len(rows))
+        top = top[np.argsort(-subset[top], kind='stable')]
+        return [{'resume': self.resume_ids[rows[i]], 'job': self.job_ids[rows[i]],
+                 'overall_score': round(float(subset[i]), 2),
+                 **{name: float(self.components[rows[i], c]) for c, name in enumerate(COMPONENTS)}}
+                for i in top]
+
+    def save(self, path: str):
+        self._consolidate()
+        tmp_path = path + '.tmp.npz'
+        np.savez(tmp_path, resume_ids=self.resume_ids.astype(str), job_ids=self.job_ids.astype(str),
+                 components=self.components, columns=np.array(COMPONENTS))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'ScoreTable':
+        table = cls()
+        with np.load(path) as f:
+            if tuple(f['columns']) != COMPONENTS:
+                raise ValueError(f"{path} has columns {list(f['columns'])}, expected {list(COMPONENTS)}")
+            table.resume_ids = f['resume_ids'].astype(object)
+            table.job_ids = f['job_ids'].astype(object)
+            table.components = f['components']
+        return table
+
+
+def _parse_weights(value: str) -> Dict[str, float]:
+    weights = {}
+    for item in value.split(','):
+        name, weight = item.split('=')
+        weights[name.strip()] = float(weight)
+    return weights
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Re-rank stored component scores under a new weighting")
+    arg_parser.add_argument('table', help="Score table (.npz) written by the bulk CLI with --score-table")
+    arg_parser.add_argument('--profile', choices=sorted(WEIGHT_PROFILES), default='default')
+    arg_parser.add_argument('--weights', default=None, help="Override components, e.g. skills=0.4,keyword=0.1")
+    arg_parser.add_argument('--job', default=None, help="Rank candidates for this job only")
+    arg_parser.add_argument('--top-k', type=int, default=20)
+    arg_parser.add_argument('--json', action='store_true', help="Print the ranking as JSON")
+    args = arg_parser.parse_args()
+
+    table = ScoreTable.load(args.table)
+    weights = dict(WEIGHT_PROFILES[args.profile])
+    if args.weights:
+        weights.update(_parse_weights(args.weights))
+        if set(weights) != set(COMPONENTS):
+            arg_parser.error(f"--weights components must be among {list(COMPONENTS)}")
+
+    start = time.perf_counter()
+    ranking = table.rerank(weights, args.top_k, args.job)
+    elapsed = (time.perf_counter() - start) * 1000
+    if args.json:
+        print(json.dumps(ranking, indent=2))
+        return
+    print(f"Re-ranked {len(table)} rows in {elapsed:.1f} ms with {weights}")
+    for rank, row in enumerate(ranking, 1):
+        print(f"{rank:>4}. {row['resume']:<40} {row['job']:<30} {row['overall_score']:>6.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, NamedTuple, Optional
+
+from utils.result_cache import ResultCache
+
+# Kept apart from the result cache's own table, so retain_version and its LRU eviction never touch it
+_SPILL_SCHEMA = """
+CREATE TABLE IF NOT EXISTS session_spills (
+    id TEXT PRIMARY KEY,
+    payload TEXT NOT NULL,
+    expires_at REAL NOT NULL
+);
+"""
+
+
+class ResultHandle(NamedTuple):
+    """What a session keeps instead of its results: a store id plus the result cache key to rebuild from"""
+    id: str
+    cache_key: Optional[str] = None
+
+
+def _size(payload: Dict[str, Any]) -> int:
+    # Serialized size is a stable, cheap proxy for the memory a payload of strings and numbers holds
+    return len(json.dumps(payload, ensure_ascii=False, default=str).encode('utf-8'))
+
+
+class SessionResultStore:
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, max_entries: int = 2000, ttl_seconds: float = 3600,
+                 result_cache: Optional[ResultCache] = None):
+        # One store per server process shared by all sessions; least recently viewed payloads are evicted
+        # past max_bytes or max_entries. When result_cache has a disk tier, an evicted payload's JD, file
+        # name and recommendations are spilled to a table of that database and its results are rebuilt
+        # from the result cache key; otherwise an evicted payload is gone, like an expired one.
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.result_cache = result_cache if result_cache is not None and result_cache.disk_path else None
+        self.bytes = 0
+        self.hits = 0
+        self.rebuilds = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: 'OrderedDict[str, tuple]' = OrderedDict()  # id -> (expires_at, size, payload, cache key)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        if self.result_cache is not None:
+            self._spills().executescript(_SPILL_SCHEMA)
+
+    def _spills(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.result_cache.disk_path, timeout=30.0, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    def put(self, payload: Dict[str, Any], cache_key: Optional[str] = None) -> ResultHandle:
+        """Store one analysis payload and return the handle to keep in the session"""
+        handle = ResultHandle(uuid.uuid4().hex, cache_key)
+        self._insert(handle, payload, time.time() + self.ttl_seconds)
+        return handle
+
+    def _insert(self, handle: ResultHandle, payload: Dict[str, Any], expires_at: float):
+        size = _size(payload)
+        with self._lock:
+            self._remove(handle.id)
+            self._entries[handle.id] = (expires_at, size, payload, handle.cache_key)
+            self.bytes += size
+            evicted = self._evict(time.time())
+        for handle_id, entry in evicted:
+            self._spill(handle_id, entry)
+
+    def _remove(self, handle_id: str):
+        entry = self._entries.pop(handle_id, None)
+        if entry is not None:
+            self.bytes -= entry[1]
+
+    def _evict(self, now: float) -> list:
+        """Drop expired entries, then least recently viewed ones past the caps; returns those worth spilling"""
+        for handle_id in [key for key, entry in self._entries.items() if entry[0] <= now]:
+            self._remove(handle_id)
+            self.evictions += 1
+        evicted = []
+        # The newest entry is kept even if it alone exceeds max_bytes, so a fresh analysis always displays
+        while len(self._entries) > 1 and (self.bytes > self.max_bytes or len(self._entries) > self.max_entries):
+            handle_id = next(iter(self._entries))
+            evicted.append((handle_id, self._entries[handle_id]))
+            self._remove(handle_id)
+            self.evictions += 1
+        return evicted if self.result_cache is not None else []
+
+    def _spill(self, handle_id: str, entry: tuple):
+        expires_at, _, payload, cache_key = entry
+        # Results already sit in the result cache under their key; anything else has to be written out
+        if cache_key:
+            payload = {key: value for key, value in payload.items() if key != 'results'}
+        conn = self._spills()
+        conn.execute('INSERT OR REPLACE INTO session_spills VALUES (?, ?, ?)',
+                     (handle_id, json.dumps(payload, ensure_ascii=False, default=float), expires_at))
+        conn.execute('DELETE FROM session_spills WHERE expires_at <= ?', (time.time(),))
+
+    def get(self, handle: Optional[ResultHandle]) -> Optional[Dict[str, Any]]:
+        """The payload for a handle, rebuilt from the disk spill if it was evicted"""
+        if handle is None:
+            return None
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(handle.id)
+            if entry is not None and entry[0] > now:
+                # Viewing a result renews its lease
+                self._entries[handle.id] = (now + self.ttl_seconds,) + entry[1:]
+                self._entries.move_to_end(handle.id)
+                self.hits += 1
+                return entry[2]
+
+        payload = self._rebuild(handle, now)
+        with self._lock:
+            if payload is None:
+                self.misses += 1
+                return None
+            self.rebuilds += 1
+        self._insert(handle, payload, now + self.ttl_seconds)
+        return payload
+
+    def _rebuild(self, handle: ResultHandle, now: float) -> Optional[Dict[str, Any]]:
+        if self.result_cache is None:
+            return None
+        conn = self._spills()
+        row = conn.execute('SELECT payload FROM session_spills WHERE id = ? AND expires_at > ?',
+                           (handle.id, now)).fetchone()
+        if row is None:
+            return None
+        # Back in memory now; it is spilled again if evicted again
+        conn.execute('DELETE FROM session_spills WHERE id = ?', (handle.id,))
+        payload = json.loads(row[0])
+        if 'results' not in payload:
+            results = self.result_cache.get(handle.cache_key) if handle.cache_key else None
+            if results is None:
+                return None
+            payload['results'] = results
+        return payload
+
+    def discard(self, handle: Optional[ResultHandle]):
+        if handle is not None:
+            with self._lock:
+                self._remove(handle.id)
+            if self.result_cache is not None:
+                self._spills().execute('DELETE FROM session_spills WHERE id = ?', (handle.id,))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self.bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'rebuilds': self.rebuilds,
+                'misses': self.misses,
+                'evictions': self.evictions,
+            }
@@ -0,0 +1,257 @@
+import argparse
+import heapq
+import multiprocessing
+import os
+import shutil
+import threading
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing.connection import Client, Listener
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from scipy import sparse
+
+from utils.corpus_index import DENSE_KEYS, CorpusIndex, Segment
+from utils.embedding_store import EmbeddingCodec, load_codec
+from utils.keyword_engine import KeywordEngine
+from utils.matrix_scorer import MatrixScorer
+
+KEYWORD_MODEL_NAME = 'keyword_idf.joblib'
+DEFAULT_SHARD_HOST = '127.0.0.1'
+
+
+def shard_authkey(authkey: Optional[bytes] = None) -> bytes:
+    """The shared secret for shard connections: the argument, else ATS_SHARD_AUTHKEY; there is no default"""
+    # multiprocessing.connection unpickles what it receives, so the key is all that stands between
+    # a shard port and code execution on its host
+    authkey = authkey or os.environ.get('ATS_SHARD_AUTHKEY', '').encode('utf-8')
+    if not authkey:
+        raise ValueError("Shard connections need a secret: set ATS_SHARD_AUTHKEY or pass --authkey")
+    return authkey
+
+
+def shard_for(doc_id: str, num_shards: int) -> int:
+    """Stable shard assignment for a document id"""
+    return zlib.crc32(doc_id.encode('utf-8')) % num_shards
+
+
+def build_shards(index: CorpusIndex, keyword_engine: KeywordEngine, num_shards: int, output_dir: str) -> List[str]:
+    """Split the live documents of an index into self-contained shard directories"""
+    with index._lock:
+        segments = list(index.segments.values())
+        live = [(segment, np.flatnonzero(~segment.deleted)) for segment in segments]
+    if not segments:
+        raise ValueError("Cannot shard an empty index")
+
+    # Rows of every segment grouped by the shard their doc id hashes to
+    assignments = []
+    for segment, rows in live:
+        shards = np.array([shard_for(segment.doc_ids[row], num_shards) for row in rows], dtype=np.int64)
+        assignments.append((segment, rows, shards))
+
+    def gather(key: str, parts: List[Tuple[Segment, np.ndarray]]):
+        if not parts:
+            return segments[0].data[key][:0]
+        blocks = [segment.data[key][rows] for segment, rows in parts]
+        return sparse.vstack(blocks).tocsr() if key == 'keywords' else np.concatenate(blocks)
+
+    shard_dirs = []
+    for shard_id in range(num_shards):
+        parts = [(segment, rows[shards == shard_id]) for segment, rows, shards in assignments
+                 if (shards == shard_id).any()]
+        doc_ids = [segment.doc_ids[row] for segment, rows in parts for row in rows]
+        keys = [key for key in DENSE_KEYS if key in segments[0].data] + ['keywords']
+        segment = Segment(0, doc_ids, {key: gather(key, parts) for key in keys})
+
+        shard_dir = os.path.join(output_dir, f'shard_{shard_id:03d}')
+        if os.path.exists(shard_dir):
+            shutil.rmtree(shard_dir)
+        # Shards inherit the index's embedding codec so stored vectors and queries match
+        shard = CorpusIndex(MatrixScorer(None, keyword_engine), shard_dir, codec=index.codec)
+        shard.segments[0] = segment
+        shard.locations = {doc_id: (0, row) for row, doc_id in enumerate(doc_ids)}
+        shard.next_segment_id = 1
+        segment.save(shard_dir)
+        shard._save_manifest()
+        # Each shard carries its own copy of the keyword model so it can be served anywhere
+        keyword_engine.save(os.path.join(shard_dir, KEYWORD_MODEL_NAME))
+        shard_dirs.append(shard_dir)
+    return shard_dirs
+
+
+def open_shard(shard_dir: str) -> CorpusIndex:
+    """Open a shard for serving; no encoder is needed since queries arrive pre-embedded"""
+    keyword_engine = KeywordEngine.load(os.path.join(shard_dir, KEYWORD_MODEL_NAME))
+    return CorpusIndex(MatrixScorer(None, keyword_engine), shard_dir)
+
+
+class ShardWorker:
+    def __init__(self, shard_dir: str, address: Tuple[str, int], authkey: Optional[bytes] = None):
+        self.authkey = shard_authkey(authkey)
+        self.shard = open_shard(shard_dir)
+        self.address = address
+
+    def serve_forever(self):
+        """Answer search requests from coordinators until the process is stopped"""
+        with Listener(self.address, authkey=self.authkey) as listener:
+            while True:
+                connection = listener.accept()
+                threading.Thread(target=self._handle, args=(connection,), daemon=True).start()
+
+    def _handle(self, connection):
+        with connection:
+            while True:
+                try:
+                    request = connection.recv()
+                except EOFError:
+                    return
+                try:
+                    if request['op'] == 'search':
+                        response = {'ok': True, 'results': self.shard.search_prepared(request['query'], request['top_k'])}
+                    elif request['op'] == 'stats':
+                        response = {'ok': True, 'stats': self.shard.stats()}
+                    else:
+                        response = {'ok': False, 'error': f"Unknown op {request['op']}"}
+                except Exception as e:
+                    response = {'ok': False, 'error': str(e)}
+                connection.send(response)
+
+
+class ShardCoordinator:
+    def __init__(self, matrix_scorer: MatrixScorer, addresses: List[Tuple[str, int]],
+                 authkey: Optional[bytes] = None, timeout: float = 30.0, codec: Optional[EmbeddingCodec] = None):
+        # The coordinator only needs the encoder, keyword model and the shards' codec to build queries
+        self.query_builder = CorpusIndex(matrix_scorer, codec=codec)
+        self.addresses = addresses
+        self.authkey = shard_authkey(authkey)
+        self.timeout = timeout
+        self._pool = ThreadPoolExecutor(max_workers=max(1, len(addresses)))
+        self._local = threading.local()
+
+    def _connection(self, address: Tuple[str, int]):
+        connections = getattr(self._local, 'connections', None)
+        if connections is None:
+            connections = self._local.connections = {}
+        if address not in connections:
+            connections[address] = Client(address, authkey=self.authkey)
+        return connections[address]
+
+    def _call(self, address: Tuple[str, int], request: Dict[str, Any]) -> Dict[str, Any]:
+        connection = self._connection(address)
+        try:
+            connection.send(request)
+            if not connection.poll(self.timeout):
+                raise TimeoutError(f"Shard {address} did not answer within {self.timeout}s")
+            response = connection.recv()
+        except (OSError, EOFError, TimeoutError):
+            self._local.connections.pop(address, None)
+            connection.close()
+            raise
+        if not response['ok']:
+            raise RuntimeError(f"Shard {address}: {response['error']}")
+        return response
+
+    def search(self, job_description: str, top_k: int = 10) -> Dict[str, Any]:
+        """Fan a JD out to every shard and merge their partial top-k lists exactly"""
+        query = self.query_builder.prepare_query(job_description)
+        request = {'op': 'search', 'query': query, 'top_k': top_k}
+        futures = {address: self._pool.submit(self._call, address, request) for address in self.addresses}
+
+        partials, failed = [], []
+        for address, future in futures.items():
+            try:
+                partials.append(future.result()['results'])
+            except Exception as e:
+                failed.append({'shard': f'{address[0]}:{address[1]}', 'error': str(e)})
+
+        # The global top-k is contained in the union of each shard's own top-k
+        merged = heapq.nsmallest(top_k, (hit for partial in partials for hit in partial),
+                                 key=lambda hit: (-hit['overall'], hit['id']))
+        return {'results': merged, 'shards_answered': len(partials), 'failed_shards': failed}
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Per-shard document counts"""
+        return [self._call(address, {'op': 'stats'})['stats'] for address in self.addresses]
+
+
+def _serve_shard(shard_dir: str, address: Tuple[str, int], authkey: bytes):
+    ShardWorker(shard_dir, address, authkey).serve_forever()
+
+
+def start_local_workers(shard_dirs: List[str], base_port: int = 7100,
+                        authkey: Optional[bytes] = None) -> Tuple[List[multiprocessing.Process], List[Tuple[str, int]]]:
+    """Serve each shard from its own local process, standing in for separate hosts"""
+    authkey = shard_authkey(authkey)
+    processes, addresses = [], []
+    for offset, shard_dir in enumerate(shard_dirs):
+        address = (DEFAULT_SHARD_HOST, base_port + offset)
+        process = multiprocessing.Process(target=_serve_shard, args=(shard_dir, address, authkey), daemon=True)
+        process.start()
+        processes.append(process)
+        addresses.append(address)
+    return processes, addresses
+
+
+def _parse_address(value: str) -> Tuple[str, int]:
+    host, port = value.rsplit(':', 1)
+    return host, int(port)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Build, serve and query a sharded resume index")
+    commands = arg_parser.add_subparsers(dest='command', required=True)
+
+    build = commands.add_parser('build', help="Split an index into shard directories")
+    build.add_argument('--index', required=True)
+    build.add_argument('--keyword-model', required=True)
+    build.add_argument('--shards', type=int, required=True)
+    build.add_argument('--output', required=True)
+
+    serve = commands.add_parser('serve', help="Serve one shard")
+    serve.add_argument('--shard', required=True)
+    serve.add_argument('--address', default=f'{DEFAULT_SHARD_HOST}:7100',
+                       help="host:port to listen on; bind a routable address only on a trusted network")
+
+    query = commands.add_parser('query', help="Query all shards with a job description file")
+    query.add_argument('job_description')
+    query.add_argument('--shards', required=True, help="Comma-separated host:port list")
+    query.add_argument('--keyword-model', required=True)
+    query.add_argument('--top-k', type=int, default=10)
+    query.add_argument('--codec-dir', default=None, help="Any shard directory, to reuse its embedding codec")
+
+    for command in (serve, query):
+        command.add_argument('--authkey', default=None,
+                             help="Shared secret for shard connections (default: ATS_SHARD_AUTHKEY; required)")
+    args = arg_parser.parse_args()
+
+    authkey = None
+    if args.command != 'build':
+        try:
+            authkey = shard_authkey(args.authkey.encode('utf-8') if args.authkey else None)
+        except ValueError as e:
+            arg_parser.error(str(e))
+
+    if args.command == 'build':
+        engine = KeywordEngine.load(args.keyword_model)
+        index = CorpusIndex(MatrixScorer(None, engine), args.index)
+        for shard_dir in build_shards(index, engine, args.shards, args.output):
+            print(f"{shard_dir}: {open_shard(shard_dir).stats()['live_documents']} documents")
+    elif args.command == 'serve':
+        print(f"Serving {args.shard} on {args.address}")
+        ShardWorker(args.shard, _parse_address(args.address), authkey).serve_forever()
+    else:
+        from utils.ats_scorer import ATSScorer
+        scorer = ATSScorer(keyword_model_path=args.keyword_model)
+        coordinator = ShardCoordinator(MatrixScorer(scorer), [_parse_address(a) for a in args.shards.split(',')],
+                                       authkey=authkey, codec=load_codec(args.codec_dir))
+        with open(args.job_description, encoding='utf-8') as f:
+            response = coordinator.search(f.read(), args.top_k)
+        for rank, hit in enumerate(response['results'], 1):
+            print(f"{rank:>3}. {hit['id']:<40} {hit['overall']:>6.2f}")
+        for failure in response['failed_shards']:
+            print(f"Shard {failure['shard']} failed: {failure['error']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+import hashlib
+import json
+import mmap
+import os
+import threading
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+DATA_FILE_NAME = 'records.dat'
+INDEX_FILE_NAME = 'records.idx'
+
+# One fixed-size index entry per record: where it lives in the data file and a hash of its doc id
+INDEX_DTYPE = np.dtype([('offset', '<u8'), ('length', '<u4'), ('key', '<u8')])
+
+
+def _key(doc_id: str) -> int:
+    return int.from_bytes(hashlib.blake2b(doc_id.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+class ResumeTextStore:
+    def __init__(self, directory: str):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.data_path = os.path.join(directory, DATA_FILE_NAME)
+        self.index_path = os.path.join(directory, INDEX_FILE_NAME)
+        self._lock = threading.Lock()
+        self._recover()
+        self._data_file = open(self.data_path, 'ab')
+        self._index_file = open(self.index_path, 'ab')
+        self._index = np.fromfile(self.index_path, dtype=INDEX_DTYPE)
+        self._map = None
+        self._mapped_size = 0
+
+    def _recover(self):
+        """Drop a torn trailing index entry or record left by a crash mid-append"""
+        for path in (self.data_path, self.index_path):
+            if not os.path.exists(path):
+                open(path, 'wb').close()
+        index_size = os.path.getsize(self.index_path)
+        if index_size % INDEX_DTYPE.itemsize:
+            with open(self.index_path, 'r+b') as f:
+                f.truncate(index_size - index_size % INDEX_DTYPE.itemsize)
+        index = np.fromfile(self.index_path, dtype=INDEX_DTYPE)
+        data_end = int(index['offset'][-1] + index['length'][-1]) if len(index) else 0
+        if os.path.getsize(self.data_path) > data_end:
+            with open(self.data_path, 'r+b') as f:
+                f.truncate(data_end)
+
+    def __len__(self):
+        return len(self._index)
+
+    def append(self, doc_id: str, text: str, parsed: Optional[Dict[str, Any]] = None) -> int:
+        """Append one resume; returns its position. Re-appending an id supersedes the older record"""
+        return self.append_many([(doc_id, text, parsed)])[0]
+
+    def append_many(self, records: List[Tuple[str, str, Optional[Dict[str, Any]]]]) -> List[int]:
+        """Append (doc_id, text, parse_resume output) tuples in one write"""
+        payloads = []
+        for doc_id, text, parsed in records:
+            # parse_resume output repeats the full text; store it once
+            parsed = {k: v for k, v in (parsed or {}).items() if k != 'text'}
+            payloads.append((doc_id, json.dumps({'id': doc_id, 'text': text, 'parsed': parsed},
+                                                ensure_ascii=False).encode('utf-8')))
+
+        with self._lock:
+            offset = self._data_file.tell()
+            entries = np.zeros(len(payloads), dtype=INDEX_DTYPE)
+            for i, (doc_id, payload) in enumerate(payloads):
+                entries[i] = (offset, len(payload), _key(doc_id))
+                offset += len(payload)
+            # Data first, then the index entries that make the records visible
+            self._data_file.write(b''.join(payload for _, payload in payloads))
+            self._data_file.flush()
+            self._index_file.write(entries.tobytes())
+            self._index_file.flush()
+            start = len(self._index)
+            self._index = np.concatenate([self._index, entries])
+        return list(range(start, start + len(payloads)))
+
+    def sync(self):
+        """Force appended records to disk"""
+        with self._lock:
+            os.fsync(self._data_file.fileno())
+            os.fsync(self._index_file.fileno())
+
+    def _view(self, offset: int, length: int) -> memoryview:
+        if offset + length > self._mapped_size:
+            # The data file grew since it was mapped. The old mapping is dropped rather than closed,
+            # since callers may still hold views into it
+            with open(self.data_path, 'rb') as f:
+                size = os.fstat(f.fileno()).st_size
+                self._map = mmap.mmap(f.fileno(), size, access=mmap.ACCESS_READ)
+            self._mapped_size = size
+        return memoryview(self._map)[offset:offset + length]
+
+    def raw(self, position: int) -> memoryview:
+        """Zero-copy view of one encoded record"""
+        entry = self._index[position]
+        return self._view(int(entry['offset']), int(entry['length']))
+
+    def get(self, position: int) -> Dict[str, Any]:
+        """Decode one record back to {'id', 'text', 'parsed'}; 'parsed' matches parse_resume output"""
+        record = json.loads(bytes(self.raw(position)))
+        record['parsed']['text'] = record['text']
+        return record
+
+    def get_by_id(self, doc_id: str) -> Optional[Dict[str, Any]]:
+        """Latest record stored for a doc id"""
+        for position in np.flatnonzero(self._index['key'] == _key(doc_id))[::-1]:
+            record = self.get(int(position))
+            if record['id'] == doc_id:
+                return record
+        return None
+
+    def latest_positions(self) -> np.ndarray:
+        """Positions of the newest record for every doc id, in append order"""
+        keys = self._index['key'][::-1]
+        _, first = np.unique(keys, return_index=True)
+        return np.sort(len(keys) - 1 - first)
+
+    def iter_records(self, latest_only: bool = True, start: int = 0) -> Iterator[Dict[str, Any]]:
+        """Stream decoded records one at a time without loading the corpus into memory"""
+        positions = self.latest_positions() if latest_only else np.arange(len(self._index))
+        for position in positions[positions >= start]:
+            yield self.get(int(position))
+
+    def close(self):
+        self._data_file.close()
+        self._index_file.close()
+        self._map = None
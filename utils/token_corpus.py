@@ -0,0 +1,216 @@
+import argparse
+import json
+import os
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from nltk.tokenize import word_tokenize
+from scipy import sparse
+
+
+def tokenize(text: str) -> List[str]:
+    """Tokens exactly as ATSScorer's keyword functions see them"""
+    return word_tokenize(text.lower())
+
+
+class Vocabulary:
+    def __init__(self, stop_words: Iterable[str] = ()):
+        # Grows as documents are added; ids are stable, so stored token arrays stay valid
+        self.stop_words = frozenset(stop_words)
+        self.ids: Dict[str, int] = {}
+        self.tokens: List[str] = []
+
+    def __len__(self):
+        return len(self.tokens)
+
+    def is_keyword(self, token: str) -> bool:
+        return token.isalnum() and token not in self.stop_words
+
+    def encode(self, tokens: Iterable[str], grow: bool = True) -> np.ndarray:
+        """int32 id per token; unknown tokens are added, or mapped to -1 when grow is False"""
+        ids = self.ids
+        if not grow:
+            return np.fromiter((ids.get(token, -1) for token in tokens), dtype=np.int32)
+        encoded = []
+        for token in tokens:
+            token_id = ids.get(token)
+            if token_id is None:
+                token_id = ids[token] = len(self.tokens)
+                self.tokens.append(token)
+            encoded.append(token_id)
+        return np.array(encoded, dtype=np.int32)
+
+    def decode(self, ids: Iterable[int]) -> List[str]:
+        return [self.tokens[i] for i in ids]
+
+
+class TokenCorpus:
+    def __init__(self, vocabulary: Vocabulary):
+        # Documents are one flat int32 token array split by offsets, plus a CSR term-frequency matrix
+        self.vocabulary = vocabulary
+        self.doc_ids: List[str] = []
+        self.tokens = np.zeros(0, dtype=np.int32)
+        self.offsets = np.zeros(1, dtype=np.int64)
+        self._tf = sparse.csr_matrix((0, 0), dtype=np.int32)
+        self._pending: List[np.ndarray] = []
+
+    def __len__(self):
+        return len(self.doc_ids)
+
+    def add(self, doc_id: str, text: str) -> int:
+        """Tokenize and encode one document; returns its row"""
+        self._pending.append(self.vocabulary.encode(tokenize(text)))
+        self.doc_ids.append(doc_id)
+        return len(self.doc_ids) - 1
+
+    def add_many(self, documents: Iterable[Tuple[str, str]]) -> 'TokenCorpus':
+        for doc_id, text in documents:
+            self.add(doc_id, text)
+        return self
+
+    def _consolidate(self):
+        if not self._pending:
+            return
+        lengths = np.fromiter(map(len, self._pending), dtype=np.int64, count=len(self._pending))
+        rows = np.repeat(np.arange(len(self._pending)), lengths)
+        new_tokens = np.concatenate(self._pending)
+        # Duplicate (row, token) entries are summed into counts by the COO -> CSR conversion
+        new_tf = sparse.coo_matrix((np.ones(len(new_tokens), dtype=np.int32), (rows, new_tokens)),
+                                   shape=(len(self._pending), len(self.vocabulary))).tocsr()
+        self.tokens = np.concatenate([self.tokens, new_tokens])
+        self.offsets = np.concatenate([self.offsets, self.offsets[-1] + np.cumsum(lengths)])
+        self._tf = sparse.vstack([self._resized(self._tf), new_tf], format='csr')
+        self._pending = []
+
+    def _resized(self, matrix: sparse.csr_matrix) -> sparse.csr_matrix:
+        # Earlier rows cannot contain ids added since, so widening is just a shape change
+        return sparse.csr_matrix((matrix.data, matrix.indices, matrix.indptr),
+                                 shape=(matrix.shape[0], len(self.vocabulary)))
+
+    def document(self, row: int) -> np.ndarray:
+        """Token ids of one document, in order"""
+        self._consolidate()
+        return self.tokens[self.offsets[row]:self.offsets[row + 1]]
+
+    @property
+    def term_frequencies(self) -> sparse.csr_matrix:
+        """documents x vocabulary token counts"""
+        self._consolidate()
+        if self._tf.shape[1] != len(self.vocabulary):
+            self._tf = self._resized(self._tf)
+        return self._tf
+
+    def document_frequency(self) -> np.ndarray:
+        tf = self.term_frequencies
+        return np.bincount(tf.indices, minlength=tf.shape[1])
+
+    def idf(self) -> np.ndarray:
+        """Smoothed IDF of every vocabulary term, as in scikit-learn's TfidfTransformer"""
+        return (np.log((1 + len(self)) / (1 + self.document_frequency())) + 1).astype(np.float32)
+
+    def _presence(self, columns: Sequence[int], rows: Optional[np.ndarray]) -> np.ndarray:
+        tf = self.term_frequencies
+        if rows is not None:
+            tf = tf[rows]
+        return tf[:, np.asarray(columns, dtype=np.int64)].toarray() > 0
+
+    def keyword_match(self, job_description: str, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """ATSScorer.calculate_keyword_match (without a keyword model) for every document at once"""
+        jd_keywords = {token for token in tokenize(job_description) if self.vocabulary.is_keyword(token)}
+        count = len(self) if rows is None else len(rows)
+        if not jd_keywords:
+            return np.zeros(count)
+        # JD keywords no document contains still count towards the total
+        known = [self.vocabulary.ids[token] for token in jd_keywords if token in self.vocabulary.ids]
+        if not known:
+            return np.zeros(count)
+        matched = self._presence(known, rows).sum(axis=1)
+        return np.minimum(matched / len(jd_keywords) * 100, 100)
+
+    def missing_keywords(self, job_description: str, rows: Optional[np.ndarray] = None,
+                         top_n: int = 15) -> List[List[str]]:
+        """ATSScorer.find_missing_keywords (without a keyword model) for every document at once"""
+        # The JD side is one document, so it stays in Python; the per-document test is one presence lookup
+        candidates = [token for token, freq in Counter(tokenize(job_description)).most_common(50)
+                      if freq > 1 and len(token) > 3 and self.vocabulary.is_keyword(token)]
+        count = len(self) if rows is None else len(rows)
+        if not candidates:
+            return [[] for _ in range(count)]
+        ids = np.array([self.vocabulary.ids.get(token, -1) for token in candidates], dtype=np.int64)
+        known = ids >= 0
+        present = np.zeros((count, len(candidates)), dtype=bool)
+        if known.any():
+            present[:, known] = self._presence(ids[known], rows)
+        candidates = np.array(candidates, dtype=object)
+        return [candidates[~row][:top_n].tolist() for row in present]
+
+    def save(self, path: str):
+        self._consolidate()
+        tf = self.term_frequencies
+        tmp_path = path + '.tmp.npz'
+        np.savez(tmp_path, tokens=self.tokens, offsets=self.offsets, tf_data=tf.data, tf_indices=tf.indices,
+                 tf_indptr=tf.indptr, vocabulary=np.array(self.vocabulary.tokens, dtype=str),
+                 stop_words=np.array(sorted(self.vocabulary.stop_words), dtype=str),
+                 doc_ids=np.array(self.doc_ids, dtype=str))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'TokenCorpus':
+        with np.load(path) as f:
+            vocabulary = Vocabulary(f['stop_words'].tolist())
+            vocabulary.tokens = f['vocabulary'].tolist()
+            vocabulary.ids = {token: i for i, token in enumerate(vocabulary.tokens)}
+            corpus = cls(vocabulary)
+            corpus.doc_ids = f['doc_ids'].tolist()
+            corpus.tokens = f['tokens']
+            corpus.offsets = f['offsets']
+            corpus._tf = sparse.csr_matrix((f['tf_data'], f['tf_indices'], f['tf_indptr']),
+                                           shape=(len(corpus.doc_ids), len(vocabulary)))
+        return corpus
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Integer-encoded token corpus for corpus-wide keyword work")
+    commands = arg_parser.add_subparsers(dest='command', required=True)
+
+    build = commands.add_parser('build', help="Tokenize and encode a corpus")
+    build.add_argument('corpus', nargs='+', help=".txt files or directories of resumes")
+    build.add_argument('--output', default=os.path.join('models', 'token_corpus.npz'))
+
+    match = commands.add_parser('match', help="Keyword match and missing keywords of every document for a JD")
+    match.add_argument('corpus', help="Corpus .npz written by build")
+    match.add_argument('job_description', help="Job description .txt")
+    match.add_argument('--top-k', type=int, default=20)
+
+    args = arg_parser.parse_args()
+    if args.command == 'build':
+        from nltk.corpus import stopwords
+        corpus = TokenCorpus(Vocabulary(stopwords.words('english')))
+        for path in args.corpus:
+            names = sorted(n for n in os.listdir(path) if n.endswith('.txt')) if os.path.isdir(path) else ['']
+            for name in names:
+                file_path = os.path.join(path, name) if name else path
+                with open(file_path, encoding='utf-8', errors='ignore') as f:
+                    corpus.add(file_path, f.read())
+        directory = os.path.dirname(args.output)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        corpus.save(args.output)
+        print(f"Encoded {len(corpus)} documents, {len(corpus.tokens)} tokens, "
+              f"{len(corpus.vocabulary)} distinct -> {args.output}")
+        return
+
+    corpus = TokenCorpus.load(args.corpus)
+    with open(args.job_description, encoding='utf-8', errors='ignore') as f:
+        job_description = f.read()
+    scores = corpus.keyword_match(job_description)
+    order = np.argsort(-scores, kind='stable')[:args.top_k]
+    missing = corpus.missing_keywords(job_description, rows=order)
+    for row, row_missing in zip(order, missing):
+        print(json.dumps({'id': corpus.doc_ids[row], 'keyword_match_score': round(float(scores[row]), 2),
+                          'missing_keywords': row_missing}))
+
+
+if __name__ == "__main__":
+    main()